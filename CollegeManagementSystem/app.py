@@ -1,52 +1,159 @@
 # app.py
+# First, so the startup report can time every import below
+from src.Utils.StartupTimer import startup_timer
 from flask import Flask
 from datetime import timedelta
 import os
 from src.Controller.UserController import user_bp
 from src.Controller.EventController import event_bp
+from src.Controller.MetricsController import metrics_bp
 from src import db, User, UserRole
+from src.Auth.Admission import admission, RoutePolicy
+from src.Auth.UserCache import auth_user_cache
+from src.Commands.ImportCommands import import_cli
+from src.Commands.EventCommands import events_cli
+from src.Commands.DatabaseCommands import db_cli
+from src.Commands.BenchCommands import bench_cli
+from src.Migrations.MigrationRunner import MigrationRunner
+from src.Service.CollegeResolver import college_resolver
+from src.Service.EventBroadcaster import event_broadcaster
+from src.Service.EventCatalog import event_catalog
+from src.Service.LastLoginWriter import last_login_writer
+from src.Service.RegistrationPipeline import registration_pipeline
+from src.Serializers.FragmentCache import event_fragment_cache
+from src.Utils.Database import Database
+from src.Utils.Json import Json
+from src.Utils.Logger import Logger
+from src.Utils.Metrics import metrics
 
-def create_app():
+startup_timer.mark('imports')
+
+@startup_timer.timed('create_app')
+def create_app(config=None):
+    """Create the app. `config` overrides any setting, e.g. the database URI for tests."""
     app = Flask(__name__)
     app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET', 'cg54nuXohCe7lQubX1KqCXyJ-ck6V_ZI28pPQo7k033oB92l0O_xoSbV5OAJyDVn7ym3F_j4297ieesL3z0aSw==')
     app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(hours=24)
     app.config['JWT_REFRESH_TOKEN_EXPIRES'] = timedelta(days=30)
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///database.db'
+    # Database URI, pool sizing and SQLite PRAGMAs (see src/Utils/Database.py)
+    app.config.update(Database.config_from_env())
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
- 
+    # Cache of authenticated users for jwt_required (size 0 disables it)
+    app.config['AUTH_USER_CACHE_SIZE'] = int(os.getenv('AUTH_USER_CACHE_SIZE', 1024))
+    app.config['AUTH_USER_CACHE_TTL'] = int(os.getenv('AUTH_USER_CACHE_TTL', 60))
+    # Queue-based JSON logging; see src/Utils/Logger.py
+    app.config['LOG_DIR'] = os.getenv('LOG_DIR', 'logs')
+    app.config['LOG_LEVEL'] = os.getenv('LOG_LEVEL', 'INFO')
+    app.config['LOG_QUEUE_SIZE'] = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+    app.config['LOG_INFO_SAMPLE_RATE'] = float(os.getenv('LOG_INFO_SAMPLE_RATE', 1.0))
+    app.config['LOG_REQUESTS'] = os.getenv('LOG_REQUESTS', 'true').lower() in ('1', 'true', 'yes')
+    # Write-behind last_login updates (interval 0 writes each login immediately)
+    app.config['LAST_LOGIN_FLUSH_INTERVAL'] = float(os.getenv('LAST_LOGIN_FLUSH_INTERVAL', 5))
+    app.config['LAST_LOGIN_MAX_PENDING'] = int(os.getenv('LAST_LOGIN_MAX_PENDING', 5000))
+    # Group commit for event registrations (off: each registration commits on its own)
+    app.config['REGISTRATION_GROUP_COMMIT'] = os.getenv('REGISTRATION_GROUP_COMMIT', 'false').lower() in ('1', 'true', 'yes')
+    app.config['REGISTRATION_BATCH_SIZE'] = int(os.getenv('REGISTRATION_BATCH_SIZE', 64))
+    app.config['REGISTRATION_BATCH_WAIT_MS'] = float(os.getenv('REGISTRATION_BATCH_WAIT_MS', 2))
+    app.config['REGISTRATION_QUEUE_SIZE'] = int(os.getenv('REGISTRATION_QUEUE_SIZE', 1000))
+    # Encoded event JSON cached per (event_id, version) (size 0 disables it)
+    app.config['SERIALIZER_FRAGMENT_CACHE_SIZE'] = int(os.getenv('SERIALIZER_FRAGMENT_CACHE_SIZE', 10000))
+    # GET /events/stream: replayable changes, poll interval and heartbeat (seconds), open streams
+    # per process (each holds a request thread) and how long one stream lasts before the client reconnects.
+    # serve.py also keeps EVENT_STREAM_RESERVED_THREADS of each worker's threads (default: half) free of streams.
+    app.config['EVENT_STREAM_REPLAY'] = int(os.getenv('EVENT_STREAM_REPLAY', 1000))
+    app.config['EVENT_STREAM_POLL_INTERVAL'] = float(os.getenv('EVENT_STREAM_POLL_INTERVAL', 1.0))
+    app.config['EVENT_STREAM_HEARTBEAT'] = float(os.getenv('EVENT_STREAM_HEARTBEAT', 15))
+    app.config['EVENT_STREAM_MAX_CLIENTS'] = int(os.getenv('EVENT_STREAM_MAX_CLIENTS', 100))
+    app.config['EVENT_STREAM_MAX_SECONDS'] = float(os.getenv('EVENT_STREAM_MAX_SECONDS', 300))
+    reserved_threads = os.getenv('EVENT_STREAM_RESERVED_THREADS')
+    app.config['EVENT_STREAM_RESERVED_THREADS'] = int(reserved_threads) if reserved_threads else None
+    # In-memory read model serving GET /events and event details (see src/Service/EventCatalog.py):
+    # seconds between syncs with other processes' writes and between full reloads
+    app.config['EVENT_CATALOG'] = os.getenv('EVENT_CATALOG', 'false').lower() in ('1', 'true', 'yes')
+    app.config['EVENT_CATALOG_SYNC_INTERVAL'] = float(os.getenv('EVENT_CATALOG_SYNC_INTERVAL', 1.0))
+    app.config['EVENT_CATALOG_RELOAD_INTERVAL'] = float(os.getenv('EVENT_CATALOG_RELOAD_INTERVAL', 300))
+    # Events older than this are moved to the archive tables by `flask events archive`
+    app.config['ARCHIVE_AFTER_DAYS'] = int(os.getenv('ARCHIVE_AFTER_DAYS', 180))
+    # Admission control for login and registration bursts; override with ADMISSION_<ROUTE>_<FIELD>
+    # (see src/Auth/Admission.py). Rates are per second, and a limit of 0 is off.
+    app.config['ADMISSION_ENABLED'] = os.getenv('ADMISSION_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    app.config['ADMISSION_LIMITS'] = {
+        'login': RoutePolicy.from_env('login', concurrency=8, rate=100, burst=200, user_rate=0.5, user_burst=10),
+        'register': RoutePolicy.from_env('register', concurrency=8, rate=200, burst=400, user_rate=2, user_burst=10),
+    }
+    if config:
+        app.config.update(config)
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', Database.engine_options(app.config))
+
+    Logger.init_app(app)
+    Json.init_app(app)
 
     # Initialize the database with the app
     db.init_app(app)
+    Database.init_app(app)
+    metrics.init_app(app)
+    auth_user_cache.init_app(app)
+    college_resolver.init_app(app)
+    last_login_writer.init_app(app)
+    registration_pipeline.init_app(app)
+    event_broadcaster.init_app(app)
+    event_catalog.init_app(app)
+    event_fragment_cache.init_app(app)
+    admission.init_app(app)
 
     # Register the blueprints
     app.register_blueprint(user_bp)
     app.register_blueprint(event_bp)
+    app.register_blueprint(metrics_bp)
+
+    # Register the CLI commands (`flask --app app import ...`)
+    app.cli.add_command(import_cli)
+    app.cli.add_command(events_cli)
+    app.cli.add_command(db_cli)
+    app.cli.add_command(bench_cli)
     
     return app
 
+@startup_timer.timed('initialize_database')
 def initialize_database(app):
     with app.app_context():
-        db.create_all()
-        admin_user = User.query.filter_by(username='admin').first()
-        if not admin_user:
-            admin_user = User(
-                username='admin',
-                email='admin@example.com',
-                full_name='Administrator',
-                role=UserRole.ADMIN
-            )
-            admin_user.set_password('admin123')
-            
-            db.session.add(admin_user)
-            db.session.commit()
-            print("Default admin user created!")
+        if MigrationRunner.is_current():
+            # One query: no DDL, and the admin user was created along with the schema
+            print("Database schema is up to date.")
         else:
-            print("Admin user already exists!")
-        
-        
+            # Creates a fresh schema, or applies pending migrations to an existing one
+            MigrationRunner.upgrade()
+            admin_user = User.query.filter_by(username='admin').first()
+            if not admin_user:
+                admin_user = User(
+                    username='admin',
+                    email='admin@example.com',
+                    full_name='Administrator',
+                    role=UserRole.ADMIN
+                )
+                admin_user.set_password('admin123')
+
+                db.session.add(admin_user)
+                db.session.commit()
+                print("Default admin user created!")
+            else:
+                print("Admin user already exists!")
+
+        # Warm the college name -> id map so writes don't have to look colleges up
+        college_resolver.warm()
+        # Load the event catalog (when enabled) before any worker forks, so they share it
+        event_catalog.warm()
         print("Database initialized!")
 
+def report_startup():
+    """Log how long startup took; with STARTUP_PROFILE=1 also print the slowest imports."""
+    startup_timer.log()
+    if startup_timer.profiling:
+        startup_timer.stop_profiling()
+        print(startup_timer.format())
+
 if __name__ == '__main__':
     app = create_app()
     initialize_database(app)
+    report_startup()
     app.run(debug=True)
@@ -0,0 +1,41 @@
+# serve.py
+"""
+Production entry point: `python serve.py --workers 4 --threads 8`.
+
+The app is created and the database initialized once, in the master
+process; workers are forked from it. See src/Server/PreforkServer.py.
+
+In-memory state is per worker. A deleted or demoted user stays authenticated
+in the other workers until their auth cache entry expires
+(AUTH_USER_CACHE_TTL seconds), and /metrics reports whichever worker served
+the request.
+"""
+import argparse
+import os
+
+from app import create_app, initialize_database, report_startup
+from src.Server.PreforkServer import PreforkServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the app with pre-forked worker processes.')
+    parser.add_argument('--bind', default=os.getenv('SERVER_BIND', '127.0.0.1:8000'),
+                        help='HOST:PORT to listen on (default: %(default)s)')
+    parser.add_argument('--workers', type=int, default=int(os.getenv('SERVER_WORKERS', os.cpu_count() or 1)),
+                        help='worker processes (default: %(default)s)')
+    parser.add_argument('--threads', type=int, default=int(os.getenv('SERVER_THREADS', 4)),
+                        help='request threads per worker (default: %(default)s)')
+    parser.add_argument('--graceful-timeout', type=float, default=float(os.getenv('SERVER_GRACEFUL_TIMEOUT', 30)),
+                        help='seconds a stopping worker gets to finish its requests (default: %(default)s)')
+    args = parser.parse_args()
+
+    app = create_app()
+    initialize_database(app)
+    report_startup()
+    PreforkServer(
+        app, bind=args.bind, workers=args.workers, threads=args.threads, graceful_timeout=args.graceful_timeout
+    ).run()
+
+
+if __name__ == '__main__':
+    main()
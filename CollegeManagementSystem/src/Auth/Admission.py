@@ -0,0 +1,187 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import jsonify, request
+
+
+class TokenBucket:
+    """`rate` tokens per second, holding at most `burst`. Not locked; its limiter locks around it."""
+    __slots__ = ('rate', 'burst', 'tokens', 'updated')
+
+    def __init__(self, rate, burst, now):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def take(self, now):
+        """Take one token. Returns 0 on success, otherwise the seconds until one is available."""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+    def give_back(self):
+        self.tokens = min(self.burst, self.tokens + 1)
+
+
+class RoutePolicy:
+    """
+    Limits for one route: at most `concurrency` requests in its handler at
+    once, `rate` requests/second overall (bursts of up to `burst`) and
+    `user_rate` requests/second per key (bursts of up to `user_burst`).
+    A limit of 0 is off.
+    """
+
+    FIELDS = ('concurrency', 'rate', 'burst', 'user_rate', 'user_burst')
+
+    def __init__(self, concurrency=0, rate=0.0, burst=0, user_rate=0.0, user_burst=0):
+        self.concurrency = int(concurrency)
+        self.rate = float(rate)
+        self.burst = max(int(burst), 1)
+        self.user_rate = float(user_rate)
+        self.user_burst = max(int(user_burst), 1)
+
+    @classmethod
+    def from_env(cls, name, **defaults):
+        """Defaults overridden by ADMISSION_<NAME>_<FIELD> variables, e.g. ADMISSION_LOGIN_USER_RATE."""
+        values = {}
+        for field in cls.FIELDS:
+            value = os.getenv(f"ADMISSION_{name.upper()}_{field.upper()}")
+            values[field] = float(value) if value is not None else defaults.get(field, 0)
+        return cls(**values)
+
+
+class _RouteLimiter:
+    def __init__(self, policy, max_keys):
+        self.policy = policy
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._global = TokenBucket(policy.rate, policy.burst, time.monotonic()) if policy.rate > 0 else None
+        self._users = OrderedDict()
+        self._in_flight = 0
+        self.admitted = 0
+        self.rate_limited = 0
+        self.overloaded = 0
+
+    def acquire(self, key):
+        """
+        Admit one request or refuse it, without waiting. Returns None when
+        admitted (call release() afterwards), otherwise (status, retry_after).
+        """
+        policy = self.policy
+        now = time.monotonic()
+        with self._lock:
+            user_bucket = None
+            if key is not None and policy.user_rate > 0:
+                user_bucket = self._users.get(key)
+                if user_bucket is None:
+                    user_bucket = self._users[key] = TokenBucket(policy.user_rate, policy.user_burst, now)
+                    if len(self._users) > self.max_keys:
+                        self._users.popitem(last=False)
+                else:
+                    self._users.move_to_end(key)
+                wait = user_bucket.take(now)
+                if wait:
+                    self.rate_limited += 1
+                    return 429, wait
+            if self._global is not None:
+                wait = self._global.take(now)
+                if wait:
+                    # The server is busy, not this user; don't charge them for it
+                    if user_bucket is not None:
+                        user_bucket.give_back()
+                    self.overloaded += 1
+                    return 503, wait
+            if policy.concurrency and self._in_flight >= policy.concurrency:
+                # Refused without running, so neither rate limit is charged for it
+                if user_bucket is not None:
+                    user_bucket.give_back()
+                if self._global is not None:
+                    self._global.give_back()
+                self.overloaded += 1
+                return 503, 1
+            self._in_flight += 1
+            self.admitted += 1
+            return None
+
+    def release(self):
+        with self._lock:
+            self._in_flight -= 1
+
+    def stats(self):
+        return {
+            "in_flight": self._in_flight, "admitted": self.admitted,
+            "rate_limited": self.rate_limited, "overloaded": self.overloaded
+        }
+
+
+class AdmissionControl:
+    """
+    Admission control for routes that take write bursts (login, event
+    registration). Each limited route gets a concurrency cap and token
+    bucket rate limits, globally and per key (the user, or the client
+    address and username of a login). A request over a limit is refused at
+    once, before its handler touches the database: 429 when the caller is
+    over their own rate, 503 when the route as a whole is saturated, both
+    with Retry-After.
+
+    Policies come from ADMISSION_LIMITS (route name -> RoutePolicy). State
+    lives in this process and is shared by its request threads behind one
+    short lock per route; with several worker processes each enforces its own
+    limits. ADMISSION_ENABLED=false turns it all off.
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self.max_keys = 10000
+        self._limiters = {}
+
+    def init_app(self, app):
+        self.enabled = app.config.get('ADMISSION_ENABLED', True)
+        self.max_keys = app.config.get('ADMISSION_MAX_KEYS', self.max_keys)
+        self._limiters = {
+            name: _RouteLimiter(policy, self.max_keys)
+            for name, policy in app.config.get('ADMISSION_LIMITS', {}).items()
+        }
+
+    def limit(self, name, key=None):
+        """
+        Decorator applying the policy `name` to a view. `key` returns the
+        per-user key for the current request, or None to apply only the route
+        limits (default: the authenticated user's id, so put this below
+        jwt_required). Above jwt_required, pass a key that needs no database
+        lookup, such as token_user_id.
+        """
+        key = key or (lambda: request.current_user.id)
+
+        def decorator(f):
+            @wraps(f)
+            def decorated_function(*args, **kwargs):
+                limiter = self._limiters.get(name)
+                if not self.enabled or limiter is None:
+                    return f(*args, **kwargs)
+                refused = limiter.acquire(key())
+                if refused is not None:
+                    status, retry_after = refused
+                    error = "Too many requests" if status == 429 else "Server is busy"
+                    response = jsonify({"success": False, "error": f"{error}, please retry shortly."})
+                    return response, status, {"Retry-After": str(max(1, math.ceil(retry_after)))}
+                try:
+                    return f(*args, **kwargs)
+                finally:
+                    limiter.release()
+            return decorated_function
+        return decorator
+
+    def stats(self):
+        return {name: limiter.stats() for name, limiter in self._limiters.items()}
+
+
+admission = AdmissionControl()
@@ -4,7 +4,8 @@ from datetime import datetime, UTC
 from functools import wraps
 from flask import request, jsonify, current_app
 
-from src import UserService
+from src.Service.UserService import UserService
+from src.Auth.UserCache import auth_user_cache
 
 # --- Token Generation (Updated to use modern datetime) ---
 
@@ -30,6 +31,22 @@ def generate_refresh_token(user):
     }
     return jwt.encode(payload, current_app.config['JWT_SECRET_KEY'], algorithm='HS256')
 
+def token_user_id():
+    """
+    The user id in the request's access token cookie, or None when it is
+    missing, invalid or expired. Only the signature and expiry are checked,
+    with no database lookup, so rate limits can be keyed on it before
+    jwt_required runs.
+    """
+    token = request.cookies.get('access_token')
+    if not token:
+        return None
+    try:
+        payload = jwt.decode(token, current_app.config['JWT_SECRET_KEY'], algorithms=['HS256'])
+    except jwt.InvalidTokenError:
+        return None
+    return payload.get('user_id') if payload.get('type') == 'access' else None
+
 # --- Decorators (Updated to use cookies) ---
 
 def jwt_required(f):
@@ -51,12 +68,16 @@ def jwt_required(f):
             if payload.get('type') != 'access':
                 return jsonify({"success": False, "error": "Invalid token type"}), 401
             
-            # 3. Find the user based on the token payload
-            user = UserService.get_user_by_id(payload['user_id'])
+            # 3. Find the user based on the token payload, from the cache when possible
+            user = auth_user_cache.get(payload['user_id'])
+            if user is None:
+                db_user = UserService.get_user_by_id(payload['user_id'])
+                user = auth_user_cache.put(db_user) if db_user else None
             if not user or not user.is_active:
                 return jsonify({"success": False, "error": "User not found or inactive"}), 401
             
-            # 4. Attach the user object to the request context
+            # 4. Attach the user (a CachedUser with id, role, is_active and college_id)
+            #    to the request context
             request.current_user = user
             
         except jwt.ExpiredSignatureError:
@@ -0,0 +1,148 @@
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+from src.Entity.User import User, UserRole
+
+
+class CachedUser:
+    """The subset of a User that authentication and authorization need."""
+    __slots__ = ('id', 'role', 'is_active', 'college_id')
+
+    def __init__(self, id, role, is_active, college_id):
+        self.id = id
+        self.role = role
+        self.is_active = is_active
+        self.college_id = college_id
+
+    @classmethod
+    def from_user(cls, user):
+        return cls(user.id, user.role, user.is_active, user.college_id)
+
+    def is_admin(self):
+        return self.role == UserRole.ADMIN
+
+    def __repr__(self):
+        return f'<CachedUser {self.id} ({self.role.value})>'
+
+
+class AuthUserCache:
+    """
+    Bounded LRU cache with a TTL, mapping user id -> CachedUser, used by
+    jwt_required to skip the per-request user lookup.
+
+    Configured from AUTH_USER_CACHE_SIZE (0 disables caching) and
+    AUTH_USER_CACHE_TTL (seconds). Entries are evicted whenever a user is
+    deleted or their role / is_active flag is changed through the ORM.
+    """
+
+    def __init__(self, max_size=1024, ttl=60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def init_app(self, app):
+        self.max_size = app.config.get('AUTH_USER_CACHE_SIZE', self.max_size)
+        self.ttl = app.config.get('AUTH_USER_CACHE_TTL', self.ttl)
+        self.clear()
+
+    @property
+    def enabled(self):
+        return self.max_size > 0
+
+    def get(self, user_id):
+        """Return the cached user, or None on a miss or an expired entry."""
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, user):
+        """Cache a snapshot of `user` and return it."""
+        cached = CachedUser.from_user(user)
+        if not self.enabled:
+            return cached
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[cached.id] = (expires_at, cached)
+            self._entries.move_to_end(cached.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return cached
+
+    def evict(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+
+auth_user_cache = AuthUserCache()
+
+_PENDING_KEY = 'auth_user_cache_evict'
+
+
+def _schedule_eviction(target):
+    # Evict now, and again once the transaction commits, so a request that
+    # re-cached the old row between the flush and the commit is corrected.
+    auth_user_cache.evict(target.id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, set()).add(target.id)
+
+
+@event.listens_for(User, 'after_update')
+def _evict_on_update(mapper, connection, target):
+    state = inspect(target)
+    if state.attrs.role.history.has_changes() or state.attrs.is_active.history.has_changes():
+        _schedule_eviction(target)
+
+
+@event.listens_for(User, 'after_delete')
+def _evict_on_delete(mapper, connection, target):
+    _schedule_eviction(target)
+
+
+@event.listens_for(Session, 'after_commit')
+def _evict_after_commit(session):
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        auth_user_cache.evict(user_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending_evictions(session):
+    session.info.pop(_PENDING_KEY, None)
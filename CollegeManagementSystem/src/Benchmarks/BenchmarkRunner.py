@@ -0,0 +1,377 @@
+import json
+import platform
+import sqlite3
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta, UTC
+
+from sqlalchemy import delete, func, select
+
+from src.Auth.Admission import admission
+from src.Auth.AuthHandler import generate_access_token, generate_refresh_token
+from src.Entity.User import User, UserRole
+from src.extensions import db
+from src.Benchmarks.DataGenerator import BENCH_ADMIN, BENCH_PASSWORD
+from src.Entity.Colleges import College
+from src.Entity.Event import Event
+from src.Entity.Registeration import Registration
+from src.Service.EventService import EventService
+
+
+class BenchmarkRunner:
+    """
+    Drives the Flask test client through every EventController and
+    UserController endpoint against the app's current database (normally one
+    filled by DataGenerator) and reports latency percentiles, throughput and
+    peak memory per scenario.
+
+    Each scenario first runs a few warm-up requests under tracemalloc, which
+    gives the peak memory figure without slowing the timed requests down.
+    Write scenarios (register, check-in) work on two events the runner
+    creates for itself. Create, update, delete and import scenarios work on
+    users and events named after the run. Everything the run adds is deleted
+    afterwards, so the seeded data is left as it was and runs stay comparable.
+    """
+
+    WARMUP = 5
+    BULK_BATCH = 50
+    # Heavy scenarios run this fraction of the requested iterations
+    EXPORT_FRACTION = 10
+    # Rows per request in the import scenarios
+    IMPORT_ROWS = 20
+    # Scenarios that work on rows another scenario creates
+    DEPENDS_ON = {
+        'users.delete': 'users.create',
+        'events.check_in': 'events.register',
+        'events.update': 'events.create',
+        'events.delete': 'events.create',
+    }
+
+    def __init__(self, app, iterations=200, progress=None):
+        self.app = app
+        self.iterations = iterations
+        self.progress = progress or (lambda message: None)
+        self.client = app.test_client()
+
+    # --- Setup ---
+
+    def _token(self, user):
+        with self.app.app_context():
+            return generate_access_token(user)
+
+    def _use(self, token):
+        self.client.set_cookie('access_token', token)
+
+    def _prepare(self):
+        needed = self.WARMUP + self.iterations
+        admin = User.query.filter_by(username=BENCH_ADMIN).first()
+        if admin is None:
+            raise ValueError("No benchmark data found; run `flask --app app bench seed` first.")
+        self.admin_token = self._token(admin)
+
+        students = db.session.execute(
+            select(User).where(User.role == UserRole.USER).order_by(User.id).limit(needed * (1 + self.BULK_BATCH))
+        ).scalars().all()
+        if len(students) < needed * 2:
+            raise ValueError(f"Need at least {needed * 2} students for {self.iterations} iterations.")
+        self.student_names = [student.username for student in students[:needed]]
+        self.student_token = self._token(students[0])
+        with self.app.app_context():
+            self.refresh_token = generate_refresh_token(students[0])
+        self.register_tokens = [self._token(student) for student in students[:needed]]
+
+        self.event_ids = db.session.execute(
+            select(Event.event_id).order_by(Event.event_id).limit(needed)
+        ).scalars().all()
+        self.busiest_event_id, self.busiest_college_id = db.session.execute(
+            select(Event.event_id, Event.college_id).order_by(Event.registered_count.desc(), Event.event_id).limit(1)
+        ).one()
+        self.college_name = db.session.get(College, self.busiest_college_id).name
+
+        # Users and events created through the API are named after the run, so
+        # the teardown can find them
+        self.run_tag = uuid.uuid4().hex[:8]
+        self.user_prefix = f"bench_run_{self.run_tag}_"
+        self.event_prefix = f"Benchmark {self.run_tag} "
+        self.created_user_ids = []
+        self.created_event_ids = []
+
+        # Two throwaway events: one students register for through the API, one
+        # pre-filled with registrations for the bulk check-in scenario
+        created_by = admin.id
+        self.register_event_id, self.bulk_event_id = str(uuid.uuid4()), str(uuid.uuid4())
+        event_date = datetime.now(UTC) + timedelta(days=365)
+        for event_id, title in ((self.register_event_id, 'Benchmark Register'), (self.bulk_event_id, 'Benchmark Bulk Check-in')):
+            db.session.add(Event(
+                event_id=event_id, title=title, type=EventService.parse_event_type('Workshop'),
+                event_date=event_date, created_by=created_by, college_id=self.busiest_college_id
+            ))
+        db.session.commit()
+
+        bulk_students = students[:min(len(students), needed * self.BULK_BATCH)]
+        rows = [{
+            "registration_id": str(uuid.uuid4()), "event_id": self.bulk_event_id,
+            "student_id": student.id, "attended": False, "registered_at": event_date
+        } for student in bulk_students]
+        db.session.execute(Registration.__table__.insert(), rows)
+        db.session.execute(
+            Event.__table__.update().where(Event.event_id == self.bulk_event_id).values(registered_count=len(rows))
+        )
+        db.session.commit()
+        self.bulk_batch = max(1, len(rows) // needed)
+        self.bulk_ids = [row["registration_id"] for row in rows]
+        self.new_registration_ids = []
+
+    def _teardown(self):
+        db.session.rollback()
+        created_events = db.session.execute(
+            select(Event.event_id).where(Event.title.startswith(self.event_prefix, autoescape=True))
+        ).scalars().all()
+        for event_id in (self.register_event_id, self.bulk_event_id, *created_events):
+            try:
+                EventService.delete_event(event_id)
+            except ValueError:
+                pass
+        # Created and imported users never register for anything
+        db.session.execute(
+            delete(User).where(User.username.startswith(self.user_prefix, autoescape=True))
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+
+    # --- Scenarios ---
+
+    def _scenarios(self):
+        """(name, token, iterations, request(i)) in run order; `request` returns a response."""
+        get = self.client.get
+        post = self.client.post
+        put = self.client.put
+        n = self.iterations
+        export_n = max(1, n // self.EXPORT_FRACTION)
+        pages = {'users': None, 'events': None, 'events_counts': None, 'dashboard': None}
+
+        def paged(key, url):
+            def request(i):
+                cursor = pages[key]
+                response = get(url + (f"&cursor={cursor}" if cursor else ""))
+                pages[key] = (response.get_json() or {}).get('pagination', {}).get('next_cursor')
+                return response
+            return request
+
+        def register(i):
+            self._use(self.register_tokens[i])
+            response = post(f"/events/{self.register_event_id}/register")
+            self.new_registration_ids.append((response.get_json() or {}).get('data', {}).get('registration_id'))
+            return response
+
+        def check_in(i):
+            self._use(self.admin_token)
+            return post(f"/events/registrations/{self.new_registration_ids[i]}/check-in")
+
+        def bulk_check_in(i):
+            batch = self.bulk_ids[i * self.bulk_batch:(i + 1) * self.bulk_batch]
+            return post("/events/registrations/check-in", json={"registration_ids": batch})
+
+        def event_id(i):
+            return self.event_ids[i % len(self.event_ids)]
+
+        def create_user(i):
+            name = f"{self.user_prefix}{i}"
+            response = post("/users", json={
+                "username": name, "email": f"{name}@example.com", "password": BENCH_PASSWORD,
+                "full_name": f"Benchmark User {i}", "college_name": self.college_name
+            })
+            self.created_user_ids.append((response.get_json() or {}).get('data', {}).get('id'))
+            return response
+
+        def logout(i):
+            # Logging out clears the cookie, so send it again every time
+            self._use(self.student_token)
+            return post("/users/logout")
+
+        def create_event(i):
+            response = post("/events", json={
+                "title": f"{self.event_prefix}{i}", "type": "Workshop", "college_name": self.college_name,
+                "event_date": (datetime.now(UTC) + timedelta(days=400)).isoformat()
+            })
+            self.created_event_ids.append((response.get_json() or {}).get('data', {}).get('event_id'))
+            return response
+
+        def import_users(i):
+            rows = "".join(
+                f"{self.user_prefix}import_{i}_{j},{self.user_prefix}import_{i}_{j}@example.com,"
+                f"{BENCH_PASSWORD},Imported {j},{self.college_name}\n"
+                for j in range(self.IMPORT_ROWS)
+            )
+            return post("/users/import", data="username,email,password,full_name,college_name\n" + rows,
+                        content_type="text/csv")
+
+        def import_events(i):
+            event_date = (datetime.now(UTC) + timedelta(days=400)).date().isoformat()
+            rows = "".join(
+                f"{self.event_prefix}import {i} {j},Seminar,{event_date},{self.college_name}\n"
+                for j in range(self.IMPORT_ROWS)
+            )
+            return post("/events/import", data="title,type,event_date,college_name\n" + rows, content_type="text/csv")
+
+        def revalidate(url):
+            # Conditional GET with the ETag of the first response, as a polling client would send
+            etags = {}
+
+            def request(i):
+                if url not in etags:
+                    etags[url] = get(url).headers.get('ETag')
+                return get(url, headers={"If-None-Match": etags[url]})
+            return request
+
+        return [
+            ('users.login', None, n, lambda i: post(
+                "/users/login", json={"username": self.student_names[i], "password": BENCH_PASSWORD})),
+            ('users.profile', self.student_token, n, lambda i: get("/users/profile")),
+            ('users.list', self.admin_token, n, paged('users', "/users?limit=50")),
+            ('users.refresh', None, n, lambda i: post("/users/refresh", json={"refresh_token": self.refresh_token})),
+            ('users.logout', None, n, logout),
+            ('users.create', None, n, create_user),
+            # Deletes the users made by users.create
+            ('users.delete', self.admin_token, n, lambda i: self.client.delete(f"/users/{self.created_user_ids[i]}")),
+            ('events.list', self.student_token, n, paged('events', "/events?limit=50")),
+            ('events.list_counts', self.admin_token, n, paged('events_counts', "/events?limit=50&include_counts=true")),
+            ('events.detail', self.student_token, n, lambda i: get(f"/events/{event_id(i)}")),
+            ('events.detail_revalidate', self.student_token, n, revalidate(f"/events/{self.event_ids[0]}")),
+            ('events.list_revalidate', self.student_token, n, revalidate("/events?limit=50")),
+            ('events.stats', self.admin_token, n, lambda i: get(f"/events/{event_id(i)}/stats")),
+            ('events.search', self.student_token, n, lambda i: get(f"/events/search?q=bench+event+{i % 100}")),
+            ('events.dashboard', self.admin_token, n, paged('dashboard', "/events/dashboard?limit=20")),
+            ('events.register', None, n, register),
+            ('events.check_in', None, n, check_in),
+            ('events.bulk_check_in', self.admin_token, n, bulk_check_in),
+            ('events.create', self.admin_token, n, create_event),
+            # Update and delete the events made by events.create
+            ('events.update', self.admin_token, n, lambda i: put(
+                f"/events/{self.created_event_ids[i]}", json={"title": f"{self.event_prefix}{i} (updated)"})),
+            ('events.delete', self.admin_token, n, lambda i: self.client.delete(f"/events/{self.created_event_ids[i]}")),
+            ('events.export', self.admin_token, export_n,
+             lambda i: get(f"/events/{self.busiest_event_id}/registrations/export")),
+            ('events.college_export', self.admin_token, export_n,
+             lambda i: get(f"/events/colleges/{self.busiest_college_id}/registrations/export?format=ndjson")),
+            ('users.import', self.admin_token, export_n, import_users),
+            ('events.import', self.admin_token, export_n, import_events),
+        ]
+
+    @staticmethod
+    def _percentile(sorted_values, pct):
+        """Nearest-rank percentile of an already sorted list."""
+        if not sorted_values:
+            return 0.0
+        rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+        return sorted_values[rank]
+
+    def _measure(self, token, iterations, request):
+        errors = 0
+
+        def send(i):
+            nonlocal errors
+            response = request(i)
+            # Read the whole body so streamed responses are timed end to end
+            response.get_data()
+            if response.status_code >= 400:
+                errors += 1
+
+        if token:
+            self._use(token)
+        tracemalloc.start()
+        for i in range(self.WARMUP):
+            send(i)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        latencies = []
+        started = time.perf_counter()
+        for i in range(self.WARMUP, self.WARMUP + iterations):
+            request_started = time.perf_counter()
+            send(i)
+            latencies.append(time.perf_counter() - request_started)
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        return {
+            "iterations": iterations,
+            "errors": errors,
+            "p50_ms": round(self._percentile(latencies, 50) * 1000, 3),
+            "p95_ms": round(self._percentile(latencies, 95) * 1000, 3),
+            "p99_ms": round(self._percentile(latencies, 99) * 1000, 3),
+            "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+            "throughput_rps": round(iterations / elapsed, 1) if elapsed else None,
+            "peak_memory_kb": round(peak / 1024, 1)
+        }
+
+    # --- Running and reporting ---
+
+    def _meta(self):
+        counts = {
+            model.__tablename__: db.session.execute(select(func.count()).select_from(model)).scalar()
+            for model in (User, Event, Registration)
+        }
+        return {
+            "timestamp": datetime.now(UTC).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sqlite": sqlite3.sqlite_version,
+            "database": db.engine.dialect.name,
+            "iterations": self.iterations,
+            "rows": counts
+        }
+
+    def run(self, only=None):
+        """
+        Run every scenario (or those named in `only`, plus the scenarios they
+        depend on) and return the results dict.
+        """
+        if only:
+            only = set(only)
+            only.update(self.DEPENDS_ON[name] for name in list(only) if name in self.DEPENDS_ON)
+        # Measure the handlers themselves; admission limits would refuse most back-to-back requests
+        admission_enabled, admission.enabled = admission.enabled, False
+        try:
+            with self.app.app_context():
+                self._prepare()
+                results = {"meta": self._meta(), "scenarios": {}}
+                try:
+                    for name, token, iterations, request in self._scenarios():
+                        if only and name not in only:
+                            continue
+                        self.progress(name)
+                        results["scenarios"][name] = self._measure(token, iterations, request)
+                        db.session.remove()
+                finally:
+                    self._teardown()
+        finally:
+            admission.enabled = admission_enabled
+        return results
+
+    @staticmethod
+    def save(results, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    @staticmethod
+    def load(path):
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    @staticmethod
+    def compare(current, baseline, metric='p95_ms', threshold=0.2):
+        """
+        Compare `metric` of each scenario present in both result sets. Returns
+        a list of (scenario, baseline, current, ratio, regressed) rows; a
+        scenario regressed when it got slower by more than `threshold`.
+        """
+        rows = []
+        for name, result in current["scenarios"].items():
+            before = baseline.get("scenarios", {}).get(name)
+            if not before or not before.get(metric):
+                continue
+            ratio = result[metric] / before[metric]
+            rows.append((name, before[metric], result[metric], round(ratio, 3), ratio > 1 + threshold))
+        return rows
@@ -0,0 +1,128 @@
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, UTC
+
+from sqlalchemy import func, select
+
+from src.Entity.User import User, UserRole
+from src.extensions import db
+from src.Entity.Colleges import College
+from src.Entity.Event import Event, EventType
+from src.Entity.Registeration import Registration
+from src.Service.EventService import EventService
+
+# Named dataset sizes: (colleges, users, events, registrations)
+SCALES = {
+    'small': (10, 1000, 100, 10000),
+    'medium': (50, 20000, 2000, 200000),
+    'large': (100, 100000, 10000, 1000000),
+}
+
+BENCH_PASSWORD = 'password'
+BENCH_ADMIN = 'bench_admin'
+
+
+class DataGenerator:
+    """
+    Deterministic synthetic campus data for benchmarks.
+
+    The same seed and sizes always produce the same rows, including ids and
+    dates, so benchmark runs are comparable. Rows are written straight into
+    the tables with chunked executemany INSERTs, bypassing the services.
+    Every generated user (and the `bench_admin` admin) has the password
+    BENCH_PASSWORD. Event counters are filled in from the generated
+    registrations at the end.
+    """
+
+    CHUNK_SIZE = 5000
+    # Fixed reference date so generated event dates do not depend on when the data is built
+    BASE_DATE = datetime(2026, 9, 1, tzinfo=UTC)
+
+    def __init__(self, seed=42, progress=None):
+        self.rng = random.Random(seed)
+        self.progress = progress or (lambda message: None)
+
+    def _uuid(self):
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def _insert(self, model, rows):
+        for start in range(0, len(rows), DataGenerator.CHUNK_SIZE):
+            db.session.execute(model.__table__.insert(), rows[start:start + DataGenerator.CHUNK_SIZE])
+            db.session.commit()
+
+    def generate(self, colleges, users, events, registrations):
+        started = time.perf_counter()
+        password_hash = User.hash_password(BENCH_PASSWORD)
+        created_at = DataGenerator.BASE_DATE - timedelta(days=365)
+
+        college_rows = [{"college_id": self._uuid(), "name": f"Bench College {i}"} for i in range(colleges)]
+        self._insert(College, college_rows)
+        college_ids = [row["college_id"] for row in college_rows]
+        self.progress(f"{colleges} colleges")
+
+        first_id = (db.session.execute(select(func.max(User.id))).scalar() or 0) + 1
+        user_rows = [{
+            "id": first_id, "username": BENCH_ADMIN, "email": f"{BENCH_ADMIN}@example.com",
+            "password_hash": password_hash, "full_name": "Benchmark Admin", "role": UserRole.ADMIN,
+            "is_active": True, "college_id": None, "created_at": created_at
+        }]
+        for i in range(users):
+            user_rows.append({
+                "id": first_id + 1 + i, "username": f"student{i}", "email": f"student{i}@example.com",
+                "password_hash": password_hash, "full_name": f"Student {i}", "role": UserRole.USER,
+                "is_active": True, "college_id": self.rng.choice(college_ids) if college_ids else None,
+                "created_at": created_at
+            })
+        self._insert(User, user_rows)
+        admin_id = first_id
+        student_ids = [row["id"] for row in user_rows[1:]]
+        del user_rows
+        self.progress(f"{users} users")
+
+        # Spread registrations evenly over events, each with distinct students
+        event_types = list(EventType)
+        per_event, remainder = divmod(registrations, events) if events else (0, 0)
+        event_rows = []
+        for i in range(events):
+            count = min(per_event + (1 if i < remainder else 0), len(student_ids))
+            event_rows.append({
+                "event_id": self._uuid(), "title": f"Bench Event {i}", "type": self.rng.choice(event_types),
+                "event_date": DataGenerator.BASE_DATE + timedelta(days=self.rng.randint(-90, 270), hours=self.rng.randint(8, 20)),
+                "created_at": created_at, "registered_count": 0, "attended_count": 0,
+                # Leave headroom on half the events so capacity checks are exercised too
+                "capacity": count + self.rng.randint(10, 200) if self.rng.random() < 0.5 else None,
+                "college_id": self.rng.choice(college_ids), "created_by": admin_id,
+                "_registrations": count
+            })
+        self._insert(Event, [{k: v for k, v in row.items() if k != "_registrations"} for row in event_rows])
+        self.progress(f"{events} events")
+
+        # Registrations are streamed out a chunk at a time so 1M rows never sit in memory
+        buffer, total = [], 0
+        for row in event_rows:
+            is_past = row["event_date"] < DataGenerator.BASE_DATE
+            for student_id in self.rng.sample(student_ids, row["_registrations"]):
+                buffer.append({
+                    "registration_id": self._uuid(), "event_id": row["event_id"], "student_id": student_id,
+                    "attended": is_past and self.rng.random() < 0.6,
+                    "registered_at": row["event_date"] - timedelta(days=self.rng.randint(1, 60))
+                })
+            if len(buffer) >= DataGenerator.CHUNK_SIZE:
+                self._insert(Registration, buffer)
+                total += len(buffer)
+                buffer = []
+        if buffer:
+            self._insert(Registration, buffer)
+            total += len(buffer)
+        self.progress(f"{total} registrations")
+
+        EventService.repair_counters()
+
+        return {
+            "seed_colleges": colleges,
+            "seed_users": users,
+            "seed_events": events,
+            "seed_registrations": total,
+            "seconds": round(time.perf_counter() - started, 3)
+        }
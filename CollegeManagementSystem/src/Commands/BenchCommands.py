@@ -0,0 +1,68 @@
+import json
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from src.Benchmarks.BenchmarkRunner import BenchmarkRunner
+from src.Benchmarks.DataGenerator import DataGenerator, SCALES
+from src.Migrations.MigrationRunner import MigrationRunner
+
+bench_cli = AppGroup('bench', help='Synthetic benchmark data and endpoint benchmarks.')
+
+
+@bench_cli.command('seed')
+@click.option('--scale', type=click.Choice(list(SCALES)), default='small', show_default=True,
+              help='Named dataset size; explicit counts below override it.')
+@click.option('--colleges', type=int)
+@click.option('--users', type=int)
+@click.option('--events', type=int)
+@click.option('--registrations', type=int)
+@click.option('--seed', default=42, show_default=True, help='Random seed; the same seed builds the same rows.')
+def seed_command(scale, colleges, users, events, registrations, seed):
+    """Fill the database with deterministic synthetic campus data (use an empty database)."""
+    default_colleges, default_users, default_events, default_registrations = SCALES[scale]
+    MigrationRunner.upgrade()
+    summary = DataGenerator(seed=seed, progress=lambda message: click.echo(f"  {message}")).generate(
+        colleges if colleges is not None else default_colleges,
+        users if users is not None else default_users,
+        events if events is not None else default_events,
+        registrations if registrations is not None else default_registrations
+    )
+    click.echo(json.dumps(summary, indent=2))
+
+
+@bench_cli.command('run')
+@click.option('--iterations', default=200, show_default=True, help='Timed requests per scenario.')
+@click.option('--scenario', 'scenarios', multiple=True, help='Only run the named scenario (repeatable).')
+@click.option('--output', type=click.Path(dir_okay=False), help='Write the results as JSON to this file.')
+@click.option('--compare', 'baseline_path', type=click.Path(exists=True, dir_okay=False),
+              help='Previous results JSON to compare p95 latencies against.')
+@click.option('--threshold', default=0.2, show_default=True, help='Allowed p95 slowdown before a scenario counts as regressed.')
+@click.option('--fail-on-regression', is_flag=True, help='Exit non-zero if any scenario regressed.')
+def run_command(iterations, scenarios, output, baseline_path, threshold, fail_on_regression):
+    """Benchmark every endpoint against the current (seeded) database."""
+    runner = BenchmarkRunner(current_app, iterations=iterations, progress=lambda name: click.echo(f"  {name}", err=True))
+    try:
+        results = runner.run(only=set(scenarios) or None)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+
+    click.echo(f"{'scenario':<24}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}{'peak KB':>10}{'errors':>8}")
+    for name, result in results["scenarios"].items():
+        click.echo(
+            f"{name:<24}{result['p50_ms']:>10}{result['p95_ms']:>10}{result['p99_ms']:>10}"
+            f"{result['throughput_rps']:>10}{result['peak_memory_kb']:>10}{result['errors']:>8}"
+        )
+    if output:
+        BenchmarkRunner.save(results, output)
+        click.echo(f"Results written to {output}")
+
+    if baseline_path:
+        rows = BenchmarkRunner.compare(results, BenchmarkRunner.load(baseline_path), threshold=threshold)
+        click.echo(f"\nCompared with {baseline_path} (p95):")
+        for name, before, after, ratio, regressed in rows:
+            click.echo(f"{name:<24}{before:>10}{after:>10}{ratio:>8}x{'  REGRESSED' if regressed else ''}")
+        regressions = [row for row in rows if row[-1]]
+        if regressions and fail_on_regression:
+            raise click.ClickException(f"{len(regressions)} scenario(s) regressed by more than {threshold:.0%}.")
@@ -0,0 +1,39 @@
+import click
+from flask.cli import AppGroup
+
+from src.extensions import db
+from src.Migrations.MigrationRunner import MigrationRunner
+from src.Utils.QueryPlanCheck import QueryPlanCheck
+
+db_cli = AppGroup('db', help='Schema migrations and query-plan checks.')
+
+
+@db_cli.command('upgrade')
+def upgrade_command():
+    """Apply pending schema migrations."""
+    applied = MigrationRunner.upgrade()
+    if applied:
+        click.echo(f"Applied migrations: {', '.join(str(version) for version in applied)}")
+    else:
+        click.echo(f"Schema is up to date (version {MigrationRunner.latest_version()}).")
+
+
+@db_cli.command('current')
+def current_command():
+    """Show the applied and latest schema versions."""
+    with db.engine.connect() as conn:
+        current = MigrationRunner.current_version(conn)
+    click.echo(f"Current: {'none' if current is None else current}, latest: {MigrationRunner.latest_version()}")
+
+
+@db_cli.command('check-plans')
+def check_plans_command():
+    """Fail if any service query plans a full table scan (SQLite EXPLAIN QUERY PLAN)."""
+    check = QueryPlanCheck()
+    failures = check.run()
+    click.echo(f"Checked {len(check.statements)} statements.")
+    for label, statement, detail in failures:
+        click.echo(f"\n[{label}] {detail}\n    {' '.join(statement.split())}", err=True)
+    if failures:
+        raise click.ClickException(f"{len(failures)} full table scan(s) found.")
+    click.echo("No full table scans.")
@@ -0,0 +1,36 @@
+import click
+from flask.cli import AppGroup
+
+from flask import current_app
+
+from src.Service.EventService import EventService
+from src.Service.ArchiveService import ArchiveService
+from src.Service.SearchService import SearchService
+
+events_cli = AppGroup('events', help='Event maintenance commands.')
+
+
+@events_cli.command('repair-counters')
+def repair_counters_command():
+    """Recompute registered_count and attended_count for every event."""
+    fixed = EventService.repair_counters()
+    click.echo(f"Repaired counters for {fixed} event(s).")
+
+
+@events_cli.command('rebuild-search')
+def rebuild_search_command():
+    """Rebuild the event search index from the events table (SQLite only)."""
+    indexed = SearchService.rebuild_index()
+    click.echo(f"Indexed {indexed} event(s).")
+
+
+@events_cli.command('archive')
+@click.option('--days', type=int, help='Archive events older than this many days (default: ARCHIVE_AFTER_DAYS).')
+@click.option('--batch-size', default=ArchiveService.DEFAULT_BATCH_SIZE, show_default=True, help='Events moved per transaction.')
+@click.option('--pause', default=0.05, show_default=True, help='Seconds to sleep between batches.')
+def archive_command(days, batch_size, pause):
+    """Move past events and their registrations into the archive tables."""
+    days = days if days is not None else current_app.config.get('ARCHIVE_AFTER_DAYS', 180)
+    summary = ArchiveService.archive_events(ArchiveService.cutoff(days), batch_size=batch_size, pause=pause)
+    click.echo(f"Archived {summary['events']} event(s) and {summary['registrations']} registration(s) "
+               f"in {summary['batches']} batch(es).")
@@ -0,0 +1,42 @@
+import json
+
+import click
+from flask.cli import AppGroup
+
+from src.Service.ImportService import ImportService
+from src.Service.UserService import UserService
+
+import_cli = AppGroup('import', help='Bulk-import users or events from CSV/NDJSON files.')
+
+
+def _echo_report(report):
+    click.echo(json.dumps(report.to_dict(), indent=2))
+
+
+@import_cli.command('users')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'ndjson']), help='Defaults to the file extension.')
+@click.option('--batch-size', default=ImportService.USER_BATCH_SIZE, show_default=True)
+def import_users_command(path, fmt, batch_size):
+    """Import users from PATH."""
+    fmt = ImportService.detect_format(filename=path, explicit=fmt)
+    with open(path, 'rb') as stream:
+        report = ImportService.import_users(stream, fmt, batch_size=batch_size)
+    _echo_report(report)
+
+
+@import_cli.command('events')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--admin', 'admin_username', default='admin', show_default=True,
+              help='Username recorded as the creator of the imported events.')
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'ndjson']), help='Defaults to the file extension.')
+@click.option('--batch-size', default=ImportService.EVENT_BATCH_SIZE, show_default=True)
+def import_events_command(path, admin_username, fmt, batch_size):
+    """Import events from PATH."""
+    admin = UserService.get_user_by_username(admin_username)
+    if not admin or not admin.is_admin():
+        raise click.ClickException(f"'{admin_username}' is not an admin user.")
+    fmt = ImportService.detect_format(filename=path, explicit=fmt)
+    with open(path, 'rb') as stream:
+        report = ImportService.import_events(stream, fmt, admin.id, batch_size=batch_size)
+    _echo_report(report)
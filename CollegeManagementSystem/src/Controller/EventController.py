@@ -1,17 +1,58 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
-from src import EventService
-from src import EventSerializer
-from src import RegistrationSerializer
+from src.Auth.Admission import admission
+from src.Auth.AuthHandler import admin_required, jwt_required, token_user_id
+from src.Service.EventBroadcaster import event_broadcaster
+from src.Service.EventCatalog import event_catalog
+from src.Service.EventService import EventService
+from src.Service.RegistrationPipeline import registration_pipeline
+from src.Service.ImportService import ImportService
+from src.Serializers.EventSerializer import EventSerializer
+from src.Serializers.RegisterationSerializer import RegistrationSerializer
+from src.Serializers.RegistrationExportSerializer import RegistrationExportSerializer
+from src.Service.SearchService import SearchService
+from src.Utils.ConditionalGet import ConditionalGet
+from src.Utils.Json import Json
 from src.Utils.Logger import Logger
-from src import (
-    admin_required,
-    jwt_required
-)    
+from src.Utils.Pagination import Pagination
 
 event_bp = Blueprint('events', __name__, url_prefix='/events')
 
+EVENT_FILTER_ARGS = ('type', 'college_id', 'date_from', 'date_to')
+
+def _event_filters():
+    """Collect the supported event list filters from the query string."""
+    return {key: request.args.get(key) for key in EVENT_FILTER_ARGS}
+
+def _flag(name):
+    """Read a boolean query param such as ?include_counts=true."""
+    return request.args.get(name, '').lower() in ('1', 'true', 'yes')
+
+def _page_etag(rows, has_more):
+    """
+    ETag of a page of (event_id, version) rows. List pages send no
+    Last-Modified: deleting or archiving an event shifts older events onto
+    the page without moving its newest updated_at.
+    """
+    return ConditionalGet.etag('events', [(row[0], row[1]) for row in rows], has_more)
+
+def _event_validators(event_id, version, updated_at, include_registrations):
+    # Admins and students get different bodies for the same URL
+    etag = ConditionalGet.etag('event', event_id, version, include_registrations)
+    return etag, ConditionalGet.last_modified([updated_at])
+
+def _export_response(rows, filename):
+    """Stream export rows as CSV or NDJSON, chosen by the `format` query param."""
+    fmt = request.args.get('format', 'csv').lower()
+    if fmt not in RegistrationExportSerializer.CONTENT_TYPES:
+        return jsonify({"success": False, "error": "Invalid format. Must be csv or ndjson."}), 400
+    return Response(
+        stream_with_context(RegistrationExportSerializer.stream(rows, fmt)),
+        mimetype=RegistrationExportSerializer.CONTENT_TYPES[fmt],
+        headers={"Content-Disposition": f"attachment; filename={filename}.{fmt}"}
+    )
+
 @event_bp.route('', methods=['POST'])
 @admin_required
 def create_event_endpoint():
@@ -39,46 +80,182 @@ def create_event_endpoint():
 
 
 
+@event_bp.route('/import', methods=['POST'])
+@admin_required
+def import_events_endpoint():
+    """
+    Bulk-import events from a CSV or NDJSON upload (multipart field `file`)
+    or from the raw request body, created on behalf of the current admin.
+    """
+    try:
+        upload = request.files.get('file')
+        fmt = ImportService.detect_format(
+            filename=upload.filename if upload else None,
+            content_type=upload.content_type if upload else request.content_type,
+            explicit=request.args.get('format')
+        )
+        report = ImportService.import_events(upload.stream if upload else request.stream, fmt, request.current_user.id)
+        return jsonify({"success": True, "data": report.to_dict()}), 200
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except Exception as e:
+        Logger.error("Failed to import events", e)
+        return jsonify({"success": False, "error": "An unexpected error occurred."}), 500
+
+
 @event_bp.route('', methods=['GET'])
 @jwt_required
 def get_all_events():
-    """Get a list of all upcoming events."""
+    """
+    Get a page of events ordered by date.
+    Query params: limit, cursor, type, college_id, date_from, date_to,
+    include_counts (adds registered_count and attended_count),
+    include_archived (also lists archived past events).
+    Conditional requests are answered with 304 from a version probe of the page.
+    With EVENT_CATALOG on, live events are served from the in-memory catalog.
+    """
     try:
-        events = EventService.get_all_events()
-        return jsonify({
-            "success": True,
-            "data": EventSerializer.serialize_list(events)
-        }), 200
+        limit = Pagination.parse_limit(request.args.get('limit'))
+        filters = _event_filters()
+        cursor = request.args.get('cursor')
+        include_archived = _flag('include_archived')
+        page = None if include_archived else event_catalog.page(filters, limit, cursor)
+        if page is not None:
+            entries, next_cursor = page
+            etag = _page_etag([(entry.event_id, entry.version) for entry in entries], next_cursor is not None)
+            if ConditionalGet.is_conditional(last_modified=False) and ConditionalGet.is_fresh(etag):
+                return ConditionalGet.not_modified(etag)
+            body = Json.envelope(
+                Json.array([entry.encoded(_flag('include_counts')) for entry in entries]),
+                pagination=Pagination.to_dict(next_cursor, limit)
+            )
+            return Json.response(body), 200, ConditionalGet.headers(etag)
+
+        if ConditionalGet.is_conditional(last_modified=False):
+            rows, has_more = EventService.get_events_page_versions(filters, limit, cursor, include_archived)
+            etag = _page_etag(rows, has_more)
+            if ConditionalGet.is_fresh(etag):
+                return ConditionalGet.not_modified(etag)
+
+        events, next_cursor = EventService.get_events_page(filters, limit, cursor, include_archived=include_archived)
+        etag = _page_etag([(event.event_id, event.version) for event in events], next_cursor is not None)
+        # Assembled from per-event fragments cached by (event_id, version)
+        body = Json.envelope(
+            EventSerializer.encode_list(events, include_counts=_flag('include_counts')),
+            pagination=Pagination.to_dict(next_cursor, limit)
+        )
+        return Json.response(body), 200, ConditionalGet.headers(etag)
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
     except Exception as e:
         Logger.error("Failed to retrieve events", e)
         return jsonify({"success": False, "error": "An unexpected error occurred."}), 500
 
+@event_bp.route('/search', methods=['GET'])
+@jwt_required
+def search_events():
+    """
+    Search events by title, type and college name, best match first.
+    Query params: q (words, each also matched as a prefix), limit, cursor.
+    """
+    try:
+        limit = Pagination.parse_limit(request.args.get('limit'))
+        events, next_cursor = SearchService.search_events(request.args.get('q'), limit, request.args.get('cursor'))
+        body = Json.envelope(EventSerializer.encode_list(events), pagination=Pagination.to_dict(next_cursor, limit))
+        return Json.response(body), 200
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except Exception as e:
+        Logger.error("Failed to search events", e)
+        return jsonify({"success": False, "error": "An unexpected error occurred."}), 500
+
+@event_bp.route('/stream', methods=['GET'])
+@jwt_required
+def stream_events():
+    """
+    Server-Sent Events stream of event changes: `created`, `updated` and
+    `deleted` messages with the event id, version and (unless deleted) the
+    event itself. Resumes after the Last-Event-ID header (or ?last_event_id=);
+    a `reset` message means changes were missed and the client should reload.
+    """
+    try:
+        stream = event_broadcaster.open(request.headers.get('Last-Event-ID') or request.args.get('last_event_id'))
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except Exception as e:
+        Logger.error("Failed to open the event stream", e)
+        return jsonify({"success": False, "error": "An unexpected error occurred."}), 500
+    if stream is None:
+        return jsonify({"success": False, "error": "Too many open streams, please retry shortly."}), 503, {"Retry-After": "5"}
+    return Response(stream_with_context(stream), mimetype='text/event-stream', headers={
+        "Cache-Control": "no-cache",
+        # Stop reverse proxies from buffering the stream
+        "X-Accel-Buffering": "no",
+    })
+
+
 @event_bp.route('/<event_id>', methods=['GET'])
 @jwt_required
 def get_event_details(event_id):
-    """Get detailed information about a single event."""
+    """Get detailed information about a single event (304 if the client's copy is current)."""
     try:
         include_registrations = request.current_user.is_admin()
-        event = EventService.get_event_by_id(event_id)
+        include_archived = _flag('include_archived')
+        # Students' view of a live event, from the in-memory catalog when it is on
+        entry = None if include_registrations or include_archived else event_catalog.get(event_id)
+        if entry is not None:
+            etag, last_modified = _event_validators(event_id, entry.version, entry.updated_at, False)
+            if ConditionalGet.is_conditional() and ConditionalGet.is_fresh(etag, last_modified):
+                return ConditionalGet.not_modified(etag, last_modified)
+            return Json.response(Json.envelope(entry.encoded())), 200, ConditionalGet.headers(etag, last_modified)
+
+        if ConditionalGet.is_conditional():
+            current = EventService.get_event_version(event_id, include_archived)
+            if current:
+                etag, last_modified = _event_validators(event_id, current.version, current.updated_at, include_registrations)
+                if ConditionalGet.is_fresh(etag, last_modified):
+                    return ConditionalGet.not_modified(etag, last_modified)
+
+        event = EventService.get_event_by_id(event_id, include_registrations, include_archived)
         if not event:
             return jsonify({"success": False, "error": "Event not found"}), 404
         
+        etag, last_modified = _event_validators(event_id, event.version, event.updated_at, include_registrations)
+        headers = ConditionalGet.headers(etag, last_modified)
+        if not include_registrations:
+            return Json.response(Json.envelope(EventSerializer.encode(event))), 200, headers
         return jsonify({
             "success": True,
-            "data": EventSerializer.serialize(event, include_registrations=include_registrations)
-        }), 200
+            "data": EventSerializer.serialize(event, include_registrations=True)
+        }), 200, headers
     except Exception as e:
         Logger.error(f"Failed to retrieve details for event {event_id}", e)
         return jsonify({"success": False, "error": "An unexpected error occurred."}), 500
     
 
+@event_bp.route('/<event_id>/stats', methods=['GET'])
+@jwt_required
+def get_event_stats(event_id):
+    """Get registration and attendance counts for an event without loading registrations."""
+    try:
+        stats = EventService.get_event_stats(event_id, _flag('include_archived'))
+        if not stats:
+            return jsonify({"success": False, "error": "Event not found"}), 404
+        return jsonify({"success": True, "data": stats}), 200
+    except Exception as e:
+        Logger.error(f"Failed to retrieve stats for event {event_id}", e)
+        return jsonify({"success": False, "error": "An unexpected error occurred."}), 500
+
+
 @event_bp.route('/<event_id>/register', methods=['POST'])
+# Ahead of jwt_required, so a burst is refused before the user lookup
+@admission.limit('register', key=token_user_id)
 @jwt_required
 def register_for_event(event_id):
     """Register the current user for an event."""
     student_id = request.current_user.id
     try:
-        registration = EventService.register_for_event(event_id, student_id)
+        registration = registration_pipeline.register(event_id, student_id)
         return jsonify({
             "success": True,
             "message": "Successfully registered for the event.",
@@ -100,7 +277,7 @@ def update_event(event_id):
     """Update an event's details (admin only)."""
     data = request.get_json()
     try:
-        updated_event = EventService.update_event(event_id, data)
+        updated_event = EventService.update_event(event_id, data, include_registrations=True)
         return jsonify({
             "success": True,
             "message": "Event updated successfully.",
@@ -132,14 +309,25 @@ def delete_event(event_id):
 @event_bp.route('/dashboard', methods=['GET'])
 @admin_required
 def get_admin_event_dashboard():
-    """Get all events with full registration details for admins."""
+    """
+    Get a page of events with full registration details for admins.
+    Accepts the same query params as GET /events.
+    """
     try:
-        events = EventService.get_all_events()
-        # The serializer needs to be passed the flag to include registrations
+        limit = Pagination.parse_limit(request.args.get('limit'))
+        filters = _event_filters()
+        # Registrations, students and colleges are batch-loaded for the whole page
+        events, next_cursor = EventService.get_events_page(
+            filters, limit, request.args.get('cursor'), include_registrations=True,
+            include_archived=_flag('include_archived')
+        )
         return jsonify({
             "success": True,
-            "data": EventSerializer.serialize_list(events, include_registrations=True)
+            "data": EventSerializer.serialize_list(events, include_registrations=True, include_counts=True),
+            "pagination": Pagination.to_dict(next_cursor, limit)
         }), 200
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
     except Exception as e:
         Logger.error("Failed to retrieve admin event dashboard", e)
         return jsonify({"success": False, "error": "An unexpected error occurred."}), 500
@@ -162,3 +350,49 @@ def mark_attendance(registration_id):
         return jsonify({"success": False, "error": "An unexpected error occurred."}), 500
 
 
+@event_bp.route('/registrations/check-in', methods=['POST'])
+@admin_required
+def mark_attendance_bulk():
+    """
+    Check in many registrations at once (admin scanners uploading buffered scans).
+    Body: {"registration_ids": [...]} or {"pairs": [{"event_id": ..., "student_id": ...}]}
+    """
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({"success": False, "error": "No data provided"}), 400
+    try:
+        results = EventService.mark_attendance_bulk(
+            registration_ids=data.get('registration_ids'),
+            pairs=data.get('pairs')
+        )
+        summary = {"ok": 0, "not_found": 0, "already_attended": 0}
+        for result in results:
+            summary[result["status"]] += 1
+        return jsonify({
+            "success": True,
+            "data": {"results": results, "summary": summary}
+        }), 200
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except Exception as e:
+        Logger.error("Failed to mark bulk attendance", e)
+        return jsonify({"success": False, "error": "An unexpected error occurred."}), 500
+
+
+@event_bp.route('/<event_id>/registrations/export', methods=['GET'])
+@admin_required
+def export_event_registrations(event_id):
+    """Stream the registrations and attendance of one event as CSV or NDJSON."""
+    include_archived = _flag('include_archived')
+    if not EventService.get_event_version(event_id, include_archived):
+        return jsonify({"success": False, "error": "Event not found"}), 404
+    rows = EventService.iter_registration_export_rows(event_id=event_id, include_archived=include_archived)
+    return _export_response(rows, f"registrations_{event_id}")
+
+
+@event_bp.route('/colleges/<college_id>/registrations/export', methods=['GET'])
+@admin_required
+def export_college_registrations(college_id):
+    """Stream the registrations and attendance of every event a college hosts."""
+    rows = EventService.iter_registration_export_rows(college_id=college_id, include_archived=_flag('include_archived'))
+    return _export_response(rows, f"registrations_college_{college_id}")
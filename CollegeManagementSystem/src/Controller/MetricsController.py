@@ -0,0 +1,57 @@
+from flask import Blueprint, Response
+
+from src.Auth.Admission import admission
+from src.Auth.AuthHandler import admin_required
+from src.Auth.UserCache import auth_user_cache
+from src.Serializers.FragmentCache import event_fragment_cache
+from src.Service.EventBroadcaster import event_broadcaster
+from src.Service.EventCatalog import event_catalog
+from src.Service.LastLoginWriter import last_login_writer
+from src.Service.RegistrationPipeline import registration_pipeline
+from src.Utils.Logger import Logger
+from src.Utils.Metrics import metrics
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+@metrics_bp.route('/metrics', methods=['GET'])
+@admin_required
+def metrics_endpoint():
+    """Prometheus metrics: request latency, SQL counts per endpoint, cache and log stats (admin only)."""
+    cache = auth_user_cache.stats()
+    log = Logger.stats()
+    fragments = event_fragment_cache.stats()
+    extra = [
+        ("cms_auth_cache_hits_total", "counter", "Auth user cache hits.", cache["hits"]),
+        ("cms_auth_cache_misses_total", "counter", "Auth user cache misses.", cache["misses"]),
+        ("cms_auth_cache_evictions_total", "counter", "Auth user cache LRU evictions.", cache["evictions"]),
+        ("cms_auth_cache_size", "gauge", "Users currently in the auth cache.", cache["size"]),
+        ("cms_event_fragment_cache_hits_total", "counter", "Event JSON fragments served from cache.", fragments["hits"]),
+        ("cms_event_fragment_cache_misses_total", "counter", "Event JSON fragments encoded on a cache miss.", fragments["misses"]),
+        ("cms_event_fragment_cache_size", "gauge", "Event JSON fragments currently cached.", fragments["size"]),
+        ("cms_log_queue_size", "gauge", "Log records waiting to be written.", log["queued"]),
+        ("cms_log_dropped_total", "counter", "Log records dropped because the queue was full.", log["dropped"]),
+        ("cms_log_sampled_out_total", "counter", "INFO log records skipped by sampling.", log["sampled_out"]),
+        ("cms_last_login_pending", "gauge", "Logins whose last_login is waiting to be written.", last_login_writer.pending()),
+        ("cms_last_login_flushed_total", "counter", "last_login values written in batches.", last_login_writer.flushed),
+        ("cms_last_login_failed_flushes_total", "counter", "last_login batch writes that failed and were retried.", last_login_writer.failed_flushes),
+        ("cms_event_stream_clients", "gauge", "Open GET /events/stream connections.", event_broadcaster.clients()),
+        ("cms_event_stream_messages_total", "counter", "Event change messages written to streams.", event_broadcaster.sent),
+        ("cms_event_catalog_size", "gauge", "Events in the in-memory event catalog.", event_catalog.size()),
+        ("cms_event_catalog_reads_total", "counter", "Event reads served from the event catalog.", event_catalog.reads),
+        ("cms_event_catalog_misses_total", "counter", "Event reads the event catalog passed to the database.", event_catalog.misses),
+        ("cms_event_catalog_updates_total", "counter", "Incremental event catalog snapshot swaps.", event_catalog.updates),
+        ("cms_event_catalog_reloads_total", "counter", "Full event catalog reloads.", event_catalog.reloads),
+        ("cms_registration_queue_size", "gauge", "Registrations waiting for the group-commit writer.", registration_pipeline.pending()),
+        ("cms_registration_batches_total", "counter", "Registration batches committed.", registration_pipeline.batches),
+        ("cms_registration_batched_total", "counter", "Registrations committed in batches.", registration_pipeline.batched),
+        ("cms_registration_failed_batches_total", "counter", "Registration batches that failed and were retried one at a time.", registration_pipeline.failed_batches),
+    ]
+    for route, stats in admission.stats().items():
+        extra += [
+            (f"cms_admission_{route}_in_flight", "gauge", f"{route} requests currently admitted.", stats["in_flight"]),
+            (f"cms_admission_{route}_admitted_total", "counter", f"{route} requests admitted.", stats["admitted"]),
+            (f"cms_admission_{route}_rate_limited_total", "counter", f"{route} requests refused with 429 (per-user rate).", stats["rate_limited"]),
+            (f"cms_admission_{route}_overloaded_total", "counter", f"{route} requests refused with 503 (global rate or concurrency).", stats["overloaded"]),
+        ]
+    return Response(metrics.render(extra), mimetype='text/plain; version=0.0.4')
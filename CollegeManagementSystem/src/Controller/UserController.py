@@ -5,16 +5,19 @@ from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 import jwt
 
 # Import services and serializers
-from src import (
-    UserService,
-    UserSerializer,
-    UserRole,
+from src.Auth.Admission import admission
+from src.Auth.AuthHandler import (
     generate_access_token,
     generate_refresh_token,
     jwt_required,
     admin_required
 )
+from src.Entity.User import UserRole
+from src.Service.UserService import UserService
+from src.Service.ImportService import ImportService
+from src.Serializers.UserSerializer import UserSerializer
 from src.Utils.Logger import Logger
+from src.Utils.Pagination import Pagination
 
 user_bp = Blueprint('users', __name__, url_prefix='/users')
 
@@ -22,7 +25,18 @@ user_bp = Blueprint('users', __name__, url_prefix='/users')
 from flask import Blueprint, request, jsonify, make_response
 
 
+def _login_key():
+    """
+    Login attempts are limited per client address and username, so failing
+    logins in someone's name from one address cannot lock them out elsewhere.
+    """
+    data = request.get_json(silent=True)
+    username = data.get('username') if isinstance(data, dict) else None
+    return request.remote_addr, str(username).lower() if username else None
+
+
 @user_bp.route('/login', methods=['POST'])
+@admission.limit('login', key=_login_key)
 def login_endpoint():
     data = request.get_json()
     if not data or not data.get('username') or not data.get('password'):
@@ -31,7 +45,7 @@ def login_endpoint():
     username = data.get('username')
     password = data.get('password')
 
-    user = UserService.get_user_by_username(username) or UserService.get_user_by_email(username)
+    user = UserService.get_user_by_login(username)
 
     if not user or not user.check_password(password):
         return jsonify({"success": False, "error": "Invalid credentials"}), 401
@@ -119,7 +133,10 @@ def logout_endpoint():
 @user_bp.route('/profile', methods=['GET'])
 @jwt_required
 def get_profile_endpoint():
-    user = request.current_user
+    # request.current_user only carries the auth fields; load the full profile
+    user = UserService.get_user_by_id(request.current_user.id)
+    if not user:
+        return jsonify({"success": False, "error": "User not found"}), 404
     return jsonify({
         "success": True,
         "data": UserSerializer.serialize(user)
@@ -130,11 +147,25 @@ def get_profile_endpoint():
 @user_bp.route('', methods=['GET'])
 @admin_required
 def get_all_users_endpoint():
-    users = UserService.get_all_users()
+    """
+    Get a page of users ordered by id.
+    Query params: limit, cursor, role, college_id.
+    """
+    try:
+        limit = Pagination.parse_limit(request.args.get('limit'))
+        filters = {
+            'role': request.args.get('role'),
+            'college_id': request.args.get('college_id')
+        }
+        users, next_cursor = UserService.get_users_page(filters, limit, request.args.get('cursor'))
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
     return jsonify({
         "success": True,
         "data": UserSerializer.serialize_list(users),
-        "count": len(users)
+        "count": len(users),
+        "pagination": Pagination.to_dict(next_cursor, limit)
     }), 200
     
 
@@ -150,6 +181,30 @@ def delete_user_endpoint(user_id):
         
     return jsonify({"success": True, "message": "User deleted successfully"}), 200
 
+@user_bp.route('/import', methods=['POST'])
+@admin_required
+def import_users_endpoint():
+    """
+    Bulk-import users from a CSV or NDJSON upload (multipart field `file`)
+    or from the raw request body. The format comes from the `format` query
+    param, the file name or the content type.
+    """
+    try:
+        upload = request.files.get('file')
+        fmt = ImportService.detect_format(
+            filename=upload.filename if upload else None,
+            content_type=upload.content_type if upload else request.content_type,
+            explicit=request.args.get('format')
+        )
+        report = ImportService.import_users(upload.stream if upload else request.stream, fmt)
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except Exception as e:
+        Logger.error("Failed to import users", e)
+        return jsonify({"success": False, "error": "Internal server error"}), 500
+
+    return jsonify({"success": True, "data": report.to_dict()}), 200
+
 # --- ADMIN-PROTECTED ROUTES Ends---
 
 @user_bp.route('', methods=['POST'])
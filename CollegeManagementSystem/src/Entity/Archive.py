@@ -0,0 +1,64 @@
+from datetime import datetime, UTC
+
+from src.extensions import db
+from src.Entity.Event import EventType
+
+
+class ArchivedEvent(db.Model):
+    """
+    A past event moved out of `events` by ArchiveService. Same columns as
+    Event plus `archived_at`; read-only history, never written by requests.
+    """
+    __tablename__ = 'events_archive'
+    event_id = db.Column(db.String(36), primary_key=True)
+    title = db.Column(db.String(150), nullable=False)
+    type = db.Column(db.Enum(EventType), nullable=False)
+    event_date = db.Column(db.DateTime(timezone=True), nullable=False)
+    created_at = db.Column(db.DateTime(timezone=True))
+    capacity = db.Column(db.Integer, nullable=True)
+    registered_count = db.Column(db.Integer, nullable=False, default=0)
+    attended_count = db.Column(db.Integer, nullable=False, default=0)
+    version = db.Column(db.Integer, nullable=False, default=1)
+    updated_at = db.Column(db.DateTime(timezone=True), nullable=False)
+    # No foreign keys: the college or creator may be deleted after archiving
+    college_id = db.Column(db.String(36), nullable=False)
+    created_by = db.Column(db.Integer, nullable=False)
+    archived_at = db.Column(db.DateTime(timezone=True), nullable=False, default=lambda: datetime.now(UTC))
+
+    registrations = db.relationship(
+        'ArchivedRegistration',
+        primaryjoin='foreign(ArchivedRegistration.event_id) == ArchivedEvent.event_id',
+        viewonly=True, lazy=True
+    )
+
+    # Same listing indexes as the live table, for include_archived reads
+    __table_args__ = (
+        db.Index('ix_events_archive_event_date_event_id', 'event_date', 'event_id'),
+        db.Index('ix_events_archive_college_id_event_date', 'college_id', 'event_date', 'event_id'),
+        db.Index('ix_events_archive_type_event_date', 'type', 'event_date', 'event_id'),
+    )
+
+    def __repr__(self):
+        return f'<ArchivedEvent {self.title} ({self.type.value})>'
+
+
+class ArchivedRegistration(db.Model):
+    """A registration of an archived event, moved together with it."""
+    __tablename__ = 'registrations_archive'
+    registration_id = db.Column(db.String(36), primary_key=True)
+    event_id = db.Column(db.String(36), nullable=False)
+    student_id = db.Column(db.Integer, nullable=False)
+    attended = db.Column(db.Boolean, default=False, nullable=False)
+    registered_at = db.Column(db.DateTime(timezone=True))
+
+    student = db.relationship(
+        'User', primaryjoin='foreign(ArchivedRegistration.student_id) == User.id', viewonly=True, lazy=True
+    )
+
+    __table_args__ = (
+        db.Index('ix_registrations_archive_event_id', 'event_id'),
+        db.Index('ix_registrations_archive_student_id', 'student_id'),
+    )
+
+    def __repr__(self):
+        return f'<ArchivedRegistration {self.registration_id}>'
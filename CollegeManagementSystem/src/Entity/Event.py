@@ -20,6 +20,18 @@ class Event(db.Model):
     type = db.Column(db.Enum(EventType), nullable=False)
     event_date = db.Column(db.DateTime(timezone=True), nullable=False)
     created_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(UTC)) # Added for consistency
+    capacity = db.Column(db.Integer, nullable=True) # Maximum number of registrations; NULL means unlimited
+    # Denormalized counters kept in sync by EventService, so list views and stats
+    # never have to load registration rows. `flask events repair-counters` recomputes them.
+    registered_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    attended_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Bumped by EventService on every change to the event, its counters or its
+    # registrations; the controllers derive ETag / Last-Modified from them
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    updated_at = db.Column(db.DateTime(timezone=True), nullable=False, default=lambda: datetime.now(UTC))
+    # Key of the event's row in the SQLite search index (events_fts), assigned by
+    # its insert trigger. Unlike the rowid it survives a VACUUM. NULL elsewhere.
+    search_key = db.Column(db.Integer, nullable=True)
     
     # Foreign Keys
     college_id = db.Column(db.String(36), db.ForeignKey('colleges.college_id'), nullable=False)
@@ -35,5 +47,17 @@ class Event(db.Model):
     registrations = db.relationship('Registration', back_populates='event', lazy=True, cascade="all, delete-orphan")
     # --- END: Missing Relationship ---
 
+    # Indexes for the keyset-paginated listing, alone and filtered by college or type
+    __table_args__ = (
+        db.Index('ix_events_event_date_event_id', 'event_date', 'event_id'),
+        db.Index('ix_events_college_id_event_date', 'college_id', 'event_date', 'event_id'),
+        db.Index('ix_events_type_event_date', 'type', 'event_date', 'event_id'),
+        # Used when a user is deleted and their created_events are looked up
+        db.Index('ix_events_created_by', 'created_by'),
+        # Lets the event catalog find the events other processes changed since its last sync
+        db.Index('ix_events_updated_at', 'updated_at'),
+        db.Index('ix_events_search_key', 'search_key', unique=True),
+    )
+
     def __repr__(self):
         return f'<Event {self.title} ({self.type.value})>'
\ No newline at end of file
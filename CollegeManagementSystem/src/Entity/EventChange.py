@@ -0,0 +1,20 @@
+from datetime import datetime, UTC
+from src.extensions import db
+
+
+class EventChange(db.Model):
+    """
+    One create, update or delete of an event, written in the same transaction
+    as the change, for GET /events/stream. `id` orders the changes (rows
+    commit in id order, see EventBroadcaster.record_many) and is the stream's
+    event id. Only the newest EVENT_STREAM_REPLAY rows are kept.
+    """
+    __tablename__ = 'event_changes'
+    id = db.Column(db.Integer, primary_key=True)
+    event_id = db.Column(db.String(36), nullable=False)
+    kind = db.Column(db.String(10), nullable=False)  # created, updated or deleted
+    version = db.Column(db.Integer, nullable=False)
+    changed_at = db.Column(db.DateTime(timezone=True), nullable=False, default=lambda: datetime.now(UTC))
+
+    def __repr__(self):
+        return f'<EventChange {self.id} {self.kind} {self.event_id}>'
@@ -12,10 +12,15 @@ class Registration(db.Model):
     attended = db.Column(db.Boolean, default=False, nullable=False)
     registered_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(UTC))
 
-    __table_args__ = (UniqueConstraint('event_id', 'student_id', name='_event_student_uc'),)
+    # The unique constraint also serves lookups by event; student_id needs its own index
+    __table_args__ = (
+        UniqueConstraint('event_id', 'student_id', name='_event_student_uc'),
+        db.Index('ix_registrations_student_id', 'student_id'),
+    )
     
     
     event = db.relationship('Event', back_populates='registrations')
+    student = db.relationship('User', lazy=True)
 
     
     
@@ -19,12 +19,22 @@ class User(db.Model):
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
     last_login = db.Column(db.DateTime(timezone=True))
+
+    # Indexes for the id-ordered user listing filtered by role or college
+    __table_args__ = (
+        db.Index('ix_user_role_id', 'role', 'id'),
+        db.Index('ix_user_college_id_id', 'college_id', 'id'),
+    )
     
+    @staticmethod
+    def hash_password(password):
+        return hashlib.sha256(password.encode()).hexdigest()
+
     def set_password(self, password):
-        self.password_hash = hashlib.sha256(password.encode()).hexdigest()
+        self.password_hash = User.hash_password(password)
     
     def check_password(self, password):
-        return self.password_hash == hashlib.sha256(password.encode()).hexdigest()
+        return self.password_hash == User.hash_password(password)
     def is_admin(self):
         return self.role == UserRole.ADMIN
     
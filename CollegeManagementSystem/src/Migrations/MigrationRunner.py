@@ -0,0 +1,93 @@
+from datetime import datetime, UTC
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, inspect, select
+from sqlalchemy.exc import DBAPIError
+
+from src.extensions import db
+from src.Migrations.Versions import MIGRATIONS
+from src.Utils.Logger import Logger
+
+_metadata = MetaData()
+
+schema_version = Table(
+    'schema_version', _metadata,
+    Column('version', Integer, primary_key=True),
+    Column('description', String(200), nullable=False),
+    Column('applied_at', DateTime(timezone=True), nullable=False)
+)
+
+
+class MigrationRunner:
+    """
+    Versioned schema migrations for live databases.
+
+    A fresh database is created from the models with create_all(), runs every
+    (idempotent) migration and is stamped with the latest version. A database created before migrations existed
+    (tables present, no schema_version table) starts at version 0 and gets
+    every migration applied. Each migration runs in its own transaction and
+    is recorded in schema_version. A database already at the latest version
+    costs one query on startup; nothing is inspected or created.
+    """
+
+    @staticmethod
+    def latest_version():
+        return MIGRATIONS[-1][0] if MIGRATIONS else 0
+
+    @staticmethod
+    def current_version(conn):
+        """The applied schema version, or None when the schema has not been created."""
+        inspector = inspect(conn)
+        if not inspector.has_table('schema_version'):
+            return 0 if inspector.has_table('events') else None
+        return conn.execute(select(func.coalesce(func.max(schema_version.c.version), 0))).scalar_one()
+
+    @staticmethod
+    def is_current():
+        """Whether the schema exists at the latest version, from a single query."""
+        try:
+            with db.engine.connect() as conn:
+                version = conn.execute(select(func.max(schema_version.c.version))).scalar()
+        except DBAPIError:
+            # No schema_version table yet
+            return False
+        return version == MigrationRunner.latest_version()
+
+    @staticmethod
+    def upgrade():
+        """Bring the schema up to the latest version. Returns the versions applied."""
+        if MigrationRunner.is_current():
+            return []
+        engine = db.engine
+        with engine.begin() as conn:
+            current = MigrationRunner.current_version(conn)
+            if current is None:
+                db.metadata.create_all(conn)
+                _metadata.create_all(conn)
+                # Migrations are idempotent; on a fresh schema they only add what
+                # create_all() cannot, such as the search index and its triggers
+                for _, _, upgrade in MIGRATIONS:
+                    upgrade(conn)
+                MigrationRunner._stamp(conn, MIGRATIONS)
+                Logger.info(f"Created schema at version {MigrationRunner.latest_version()}")
+                return []
+            _metadata.create_all(conn)
+
+        applied = []
+        for version, description, upgrade in MIGRATIONS:
+            if version <= current:
+                continue
+            with engine.begin() as conn:
+                upgrade(conn)
+                MigrationRunner._stamp(conn, [(version, description, upgrade)])
+            Logger.info(f"Applied migration {version}: {description}")
+            applied.append(version)
+        return applied
+
+    @staticmethod
+    def _stamp(conn, migrations):
+        if migrations:
+            now = datetime.now(UTC)
+            conn.execute(schema_version.insert(), [
+                {"version": version, "description": description, "applied_at": now}
+                for version, description, _ in migrations
+            ])
@@ -0,0 +1,110 @@
+"""
+Schema migrations, applied in order by MigrationRunner.
+
+Each migration is a function taking a SQLAlchemy Connection. Migrations must
+be safe to re-run (check before adding a column or index), because SQLite
+does not always roll DDL back on failure and because a fresh schema runs every
+migration after create_all() to pick up DDL the models do not declare. Append new migrations to the end of
+MIGRATIONS with the next version number; never edit or reorder applied ones.
+"""
+from sqlalchemy import inspect, text
+
+from src.Entity.Archive import ArchivedEvent, ArchivedRegistration
+from src.Entity.EventChange import EventChange
+from src.Entity.Event import Event
+from src.Entity.Registeration import Registration
+from src.Entity.User import User
+
+
+def _add_column(conn, table, name, ddl):
+    """ALTER TABLE ... ADD COLUMN unless the column already exists."""
+    columns = {column['name'] for column in inspect(conn).get_columns(table)}
+    if name in columns:
+        return False
+    quote = conn.dialect.identifier_preparer.quote
+    conn.execute(text(f"ALTER TABLE {quote(table)} ADD COLUMN {quote(name)} {ddl}"))
+    return True
+
+
+def _create_indexes(conn, model, names):
+    """Create the named indexes declared on `model` if they do not exist yet."""
+    indexes = {index.name: index for index in model.__table__.indexes}
+    for name in names:
+        indexes[name].create(conn, checkfirst=True)
+
+
+def add_event_capacity(conn):
+    _add_column(conn, 'events', 'capacity', 'INTEGER')
+
+
+def add_event_counters(conn):
+    added = _add_column(conn, 'events', 'registered_count', 'INTEGER NOT NULL DEFAULT 0')
+    added = _add_column(conn, 'events', 'attended_count', 'INTEGER NOT NULL DEFAULT 0') or added
+    if added:
+        # Backfill the new counters from the existing registrations
+        conn.execute(text(
+            "UPDATE events SET "
+            "registered_count = (SELECT COUNT(*) FROM registrations r WHERE r.event_id = events.event_id), "
+            "attended_count = (SELECT COUNT(*) FROM registrations r "
+            "WHERE r.event_id = events.event_id AND r.attended = :attended)"
+        ), {"attended": True})
+
+
+def add_lookup_indexes(conn):
+    _create_indexes(conn, Event, [
+        'ix_events_event_date_event_id',
+        'ix_events_college_id_event_date',
+        'ix_events_type_event_date',
+        'ix_events_created_by',
+    ])
+    _create_indexes(conn, Registration, ['ix_registrations_student_id'])
+    _create_indexes(conn, User, ['ix_user_role_id', 'ix_user_college_id_id'])
+
+
+def add_event_version(conn):
+    _add_column(conn, 'events', 'version', 'INTEGER NOT NULL DEFAULT 1')
+    updated_at_type = Event.__table__.c.updated_at.type.compile(dialect=conn.dialect)
+    if _add_column(conn, 'events', 'updated_at', updated_at_type):
+        conn.execute(text("UPDATE events SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP)"))
+
+
+def add_event_search_index(conn):
+    # SQLite only; other engines search with LIKE
+    from src.Service.SearchService import SearchService
+    SearchService.create_index(conn)
+
+
+def add_archive_tables(conn):
+    # checkfirst also creates each table's indexes along with it
+    ArchivedEvent.__table__.create(conn, checkfirst=True)
+    ArchivedRegistration.__table__.create(conn, checkfirst=True)
+
+
+def add_event_changes(conn):
+    EventChange.__table__.create(conn, checkfirst=True)
+
+
+def add_event_updated_at_index(conn):
+    _create_indexes(conn, Event, ['ix_events_updated_at'])
+
+
+def add_event_search_key(conn):
+    _add_column(conn, 'events', 'search_key', 'INTEGER')
+    _create_indexes(conn, Event, ['ix_events_search_key'])
+    # SQLite only: key the search index on search_key instead of the events rowid
+    from src.Service.SearchService import SearchService
+    SearchService.recreate_index(conn)
+
+
+# (version, description, upgrade function)
+MIGRATIONS = [
+    (1, "Add capacity to events", add_event_capacity),
+    (2, "Add registration counters to events", add_event_counters),
+    (3, "Add indexes for event listing and user/registration lookups", add_lookup_indexes),
+    (4, "Add version and updated_at to events", add_event_version),
+    (5, "Add the SQLite FTS5 event search index", add_event_search_index),
+    (6, "Add archive tables for past events and registrations", add_archive_tables),
+    (7, "Add the event_changes feed for the event stream", add_event_changes),
+    (8, "Add an updated_at index for the event catalog sync", add_event_updated_at_index),
+    (9, "Key the event search index on a stable search_key", add_event_search_key),
+]
@@ -1,33 +1,68 @@
+from src.Serializers.FragmentCache import event_fragment_cache
+from src.Serializers.RegisterationSerializer import RegistrationSerializer
+from src.Serializers.SerializerCompiler import SerializerCompiler
+from src.Utils.Json import Json
+
+_EVENT_FIELDS = [
+    ("event_id", "event_id", None),
+    ("title", "title", None),
+    ("type", "type", SerializerCompiler.enum_name),
+    ("event_date", "event_date", SerializerCompiler.iso),
+    ("college_id", "college_id", None),
+    ("created_by", "created_by", None),
+    ("capacity", "capacity", None),
+    ("version", "version", None),
+    ("updated_at", "updated_at", SerializerCompiler.iso),
+]
+_COUNT_FIELDS = [
+    ("registered_count", "registered_count", None),
+    ("attended_count", "attended_count", None),
+]
+
+
 class EventSerializer:
+    _serialize = staticmethod(SerializerCompiler.compile('serialize_event', _EVENT_FIELDS))
+    _serialize_with_counts = staticmethod(SerializerCompiler.compile('serialize_event_with_counts', _EVENT_FIELDS + _COUNT_FIELDS))
+
     @staticmethod
-    def serialize(event, include_registrations=False):
+    def serialize(event, include_registrations=False, include_counts=False):
         """Serialize a single event object to a dictionary."""
         if not event:
             return None
-        
-        event_data = {
-            "event_id": event.event_id,
-            "title": event.title,
-            "type": event.type.name,
-            "event_date": event.event_date.isoformat(),
-            "college_id": event.college_id,
-            "created_by": event.created_by
-        }
-        
+
+        if include_counts:
+            event_data = EventSerializer._serialize_with_counts(event)
+        else:
+            event_data = EventSerializer._serialize(event)
+
         if include_registrations:
-            event_data["registrations"] = [
-                {
-                    "registration_id": reg.registration_id,
-                    "student_id": reg.student_id,
-                    "registration_date": reg.registration_date.isoformat()
-                }
-                for reg in event.registrations
-            ]
+            event_data["registrations"] = RegistrationSerializer.serialize_list(event.registrations)
             
         return event_data
 
     @staticmethod
-    def serialize_list(events, include_registrations=False):
+    def serialize_list(events, include_registrations=False, include_counts=False):
       
-        return [EventSerializer.serialize(event, include_registrations=include_registrations) for event in events]
+        return [
+            EventSerializer.serialize(event, include_registrations=include_registrations, include_counts=include_counts)
+            for event in events
+        ]
+
+    @staticmethod
+    def encode(event, include_counts=False):
+        """
+        The event as encoded JSON bytes, cached per (event_id, version). Every
+        change to an event bumps its version, so a cached fragment is reused
+        until the event changes. Registrations are not included: they embed
+        student details that do not bump the event's version.
+        """
+        key = (event.event_id, event.version, include_counts)
+        fragment = event_fragment_cache.get(key)
+        if fragment is None:
+            fragment = event_fragment_cache.put(key, Json.dumps(EventSerializer.serialize(event, include_counts=include_counts)))
+        return fragment
 
+    @staticmethod
+    def encode_list(events, include_counts=False):
+        """A list of events as an encoded JSON array, built from cached per-event fragments."""
+        return Json.array([EventSerializer.encode(event, include_counts) for event in events])
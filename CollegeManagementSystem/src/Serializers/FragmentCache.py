@@ -0,0 +1,52 @@
+import threading
+from collections import OrderedDict
+
+
+class FragmentCache:
+    """
+    Bounded LRU cache of encoded JSON fragments, keyed by (object id,
+    version, variant). A new version is simply a new key, so entries never go
+    stale; old versions age out of the LRU. Configured from
+    SERIALIZER_FRAGMENT_CACHE_SIZE (0 disables caching).
+    """
+
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def init_app(self, app):
+        self.max_size = app.config.get('SERIALIZER_FRAGMENT_CACHE_SIZE', self.max_size)
+        self.clear()
+
+    def get(self, key):
+        with self._lock:
+            fragment = self._entries.get(key)
+            if fragment is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return fragment
+
+    def put(self, key, fragment):
+        if self.max_size <= 0:
+            return fragment
+        with self._lock:
+            self._entries[key] = fragment
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return fragment
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+event_fragment_cache = FragmentCache()
@@ -1,17 +1,23 @@
-from src import UserSerializer
+from src.Serializers.UserSerializer import UserSerializer
+from src.Serializers.SerializerCompiler import SerializerCompiler
 
 __all__ = ['RegistrationSerializer']
 
 class RegistrationSerializer:
+    # `student` is the Registration.student relationship; EventService batch-loads
+    # it (with the student's college) wherever registrations are listed
+    _serialize = staticmethod(SerializerCompiler.compile('serialize_registration', [
+        ("registration_id", "registration_id", None),
+        ("attended", "attended", None),
+        ("registered_at", "registered_at", SerializerCompiler.iso),
+        ("student", "student", UserSerializer.serialize),  # Show who registered
+    ]))
+
     @staticmethod
     def serialize(registration):
-        return {
-            "registration_id": registration.registration_id,
-            "attended": registration.attended,
-            "registered_at": registration.registered_at.isoformat(),
-            "student": UserSerializer.serialize(registration.student) # Show who registered
-        }
+        return RegistrationSerializer._serialize(registration)
     
     @staticmethod
     def serialize_list(registrations):
-        return [RegistrationSerializer.serialize(reg) for reg in registrations]
\ No newline at end of file
+        serialize = RegistrationSerializer._serialize
+        return [serialize(reg) for reg in registrations]
@@ -0,0 +1,73 @@
+import csv
+import io
+import json
+
+__all__ = ['RegistrationExportSerializer']
+
+class RegistrationExportSerializer:
+    """
+    Turns registration export rows into CSV or NDJSON text chunks for a
+    streamed response. Rows are consumed lazily, so memory stays flat no
+    matter how many registrations are exported.
+    """
+
+    FIELDS = [
+        "event_id",
+        "event_title",
+        "registration_id",
+        "student_id",
+        "student_name",
+        "email",
+        "college",
+        "registered_at",
+        "attended"
+    ]
+    CONTENT_TYPES = {
+        "csv": "text/csv",
+        "ndjson": "application/x-ndjson"
+    }
+    ROWS_PER_CHUNK = 500
+
+    @staticmethod
+    def to_dict(row):
+        data = dict(zip(RegistrationExportSerializer.FIELDS, row))
+        data["registered_at"] = data["registered_at"].isoformat() if data["registered_at"] else None
+        return data
+
+    @staticmethod
+    def stream(rows, fmt):
+        if fmt == 'csv':
+            return RegistrationExportSerializer.stream_csv(rows)
+        return RegistrationExportSerializer.stream_ndjson(rows)
+
+    @staticmethod
+    def stream_csv(rows):
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=RegistrationExportSerializer.FIELDS)
+        writer.writeheader()
+        # Send the header straight away so the client gets its first byte immediately
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+        count = 0
+        for row in rows:
+            writer.writerow(RegistrationExportSerializer.to_dict(row))
+            count += 1
+            if count % RegistrationExportSerializer.ROWS_PER_CHUNK == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    @staticmethod
+    def stream_ndjson(rows):
+        chunk = []
+        for row in rows:
+            chunk.append(json.dumps(RegistrationExportSerializer.to_dict(row)) + "\n")
+            if len(chunk) >= RegistrationExportSerializer.ROWS_PER_CHUNK:
+                yield "".join(chunk)
+                chunk = []
+        if chunk:
+            yield "".join(chunk)
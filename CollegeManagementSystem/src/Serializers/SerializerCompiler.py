@@ -0,0 +1,42 @@
+from operator import attrgetter
+
+
+class SerializerCompiler:
+    """
+    Builds serializer functions from field specs once, at import time.
+
+    A spec is a list of (key, attribute, converter) tuples. compile() turns it
+    into a closure that reads every attribute with one `attrgetter` call and
+    pairs the values with their keys and converters, so nothing about the spec
+    is looked up again per row.
+    """
+
+    @staticmethod
+    def iso(value):
+        return value.isoformat() if value is not None else None
+
+    @staticmethod
+    def enum_name(value):
+        return value.name if value is not None else None
+
+    @staticmethod
+    def enum_value(value):
+        return value.value if value is not None else None
+
+    @staticmethod
+    def compile(name, fields):
+        keys = tuple(key for key, _, _ in fields)
+        converters = tuple(converter for _, _, converter in fields)
+        getter = attrgetter(*(attribute for _, attribute, _ in fields))
+        if len(fields) == 1:
+            single = getter
+            getter = lambda obj: (single(obj),)
+
+        def serialize(obj):
+            return {
+                key: value if converter is None else converter(value)
+                for key, converter, value in zip(keys, converters, getter(obj))
+            }
+
+        serialize.__name__ = serialize.__qualname__ = name
+        return serialize
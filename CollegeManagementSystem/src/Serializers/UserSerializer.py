@@ -1,27 +1,33 @@
+from src.Serializers.SerializerCompiler import SerializerCompiler
+
+
+def _college(college):
+    return {"id": college.college_id, "name": college.name} if college else None
+
+
 class UserSerializer:
+    # Reads the 'college' relationship of the User model
+    _serialize = staticmethod(SerializerCompiler.compile('serialize_user', [
+        ("id", "id", None),
+        ("username", "username", None),
+        ("email", "email", None),
+        ("full_name", "full_name", None),
+        ("role", "role", SerializerCompiler.enum_value),
+        ("is_active", "is_active", None),
+        ("college", "college", _college),
+        ("created_at", "created_at", SerializerCompiler.iso),
+        ("last_login", "last_login", SerializerCompiler.iso),
+    ]))
+
     @staticmethod
     def serialize(user):
         """Serialize a single user object to a dictionary."""
         if not user:
             return None
-        
-        # This serializer relies on the 'college' relationship in the User model
-        return {
-            "id": user.id,
-            "username": user.username,
-            "email": user.email,
-            "full_name": user.full_name,
-            "role": user.role.value,
-            "is_active": user.is_active,
-            "college": {
-                "id": user.college.college_id,
-                "name": user.college.name
-            } if user.college else None,
-            "created_at": user.created_at.isoformat() if user.created_at else None,
-            "last_login": user.last_login.isoformat() if user.last_login else None
-        }
+        return UserSerializer._serialize(user)
 
     @staticmethod
     def serialize_list(users):
         """Serialize a list of user objects."""
-        return [UserSerializer.serialize(user) for user in users]
+        serialize = UserSerializer._serialize
+        return [serialize(user) for user in users]
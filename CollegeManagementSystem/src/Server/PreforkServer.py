@@ -0,0 +1,289 @@
+import os
+import signal
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+from src.extensions import db
+from src.Service.EventBroadcaster import event_broadcaster
+from src.Service.LastLoginWriter import last_login_writer
+from src.Service.RegistrationPipeline import registration_pipeline
+from src.Utils.Logger import Logger
+
+
+class _RequestHandler(WSGIRequestHandler):
+    # One request per connection: an idle keep-alive client would otherwise hold a request thread
+    protocol_version = "HTTP/1.0"
+
+    def log_request(self, code="-", size="-"):
+        # Logger already logs every request, with its latency
+        pass
+
+
+class _PooledWSGIServer(BaseWSGIServer):
+    """
+    WSGI server running requests on a fixed pool of threads, on a listening
+    socket shared with the other workers. A connection is only accepted when
+    a thread is free, so a busy worker leaves new connections to its siblings.
+    """
+
+    multithread = True
+    multiprocess = True
+
+    def __init__(self, host, port, app, fd, threads):
+        super().__init__(host, port, app, handler=_RequestHandler, fd=fd)
+        # Every worker wakes up for a new connection; the ones losing the accept() race must not block
+        self.socket.setblocking(False)
+        self._slots = threading.BoundedSemaphore(threads)
+        self._pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='request')
+
+    def get_request(self):
+        # Time out so a worker with every thread busy still notices shutdown
+        if not self._slots.acquire(timeout=0.5):
+            raise OSError("No free request thread")
+        try:
+            request, client_address = super().get_request()
+        except BaseException:
+            self._slots.release()
+            raise
+        request.setblocking(True)
+        return request, client_address
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def drain(self):
+        """Wait for the requests in progress to finish."""
+        self._pool.shutdown(wait=True)
+
+
+class PreforkServer:
+    """
+    Multi-process HTTP server for production.
+
+    The master process loads the app once, binds the listening socket and
+    forks `workers` processes, each serving requests on `threads` threads.
+    Database connections are never shared across the fork: the master
+    disposes its pool before forking and each worker starts with an empty one.
+    Workers that die are replaced. A worker that keeps dying within
+    MIN_UPTIME of starting is restarted after a growing delay, and after
+    MAX_FAST_FAILURES such exits in a row the server stops.
+
+    Everything a worker keeps in memory is its own: the auth user cache,
+    metrics, admission limits and the event catalog are per process.
+
+    Signals to the master:
+      TERM, INT  graceful stop: workers finish their requests in progress,
+                 flush buffered writes and exit (killed after graceful_timeout)
+      HUP        graceful reload: a new set of workers is started, then the
+                 old ones are stopped as above
+    """
+
+    # A worker exiting sooner than this after it started counts as failing at startup
+    MIN_UPTIME = 5.0
+    # Restart delay after consecutive fast failures: doubles from BACKOFF_START up to BACKOFF_MAX
+    BACKOFF_START = 0.5
+    BACKOFF_MAX = 30.0
+    MAX_FAST_FAILURES = 10
+
+    def __init__(self, app, bind='127.0.0.1:8000', workers=2, threads=4, graceful_timeout=30.0, backlog=2048):
+        if workers < 1 or threads < 1:
+            raise ValueError("workers and threads must be at least 1.")
+        self.app = app
+        self.host, self.port = PreforkServer.parse_bind(bind)
+        self.workers = workers
+        self.threads = threads
+        self.graceful_timeout = graceful_timeout
+        self.backlog = backlog
+        self._socket = None
+        self._workers = {}   # pid -> worker slot
+        self._started = {}   # pid -> start time
+        self._retiring = {}  # pid -> kill deadline
+        self._restarts = {}  # slot -> time its replacement is due
+        self._failures = {}  # slot -> fast failures in a row
+        self._stopping = False
+        self._reload = False
+        self._failed = False
+
+    @staticmethod
+    def parse_bind(bind):
+        host, _, port = bind.rpartition(':')
+        if not port.isdigit():
+            raise ValueError(f"Invalid bind address {bind!r}; expected HOST:PORT.")
+        return host.strip('[]') or '0.0.0.0', int(port)
+
+    # --- Master ---
+
+    def run(self):
+        family = socket.AF_INET6 if ':' in self.host else socket.AF_INET
+        self._socket = socket.create_server((self.host, self.port), family=family, backlog=self.backlog)
+        self.port = self._socket.getsockname()[1]
+
+        # Workers open their own connections; none may inherit one from the master
+        with self.app.app_context():
+            db.engine.dispose()
+
+        signal.signal(signal.SIGTERM, self._on_stop)
+        signal.signal(signal.SIGINT, self._on_stop)
+        signal.signal(signal.SIGHUP, self._on_reload)
+
+        Logger.info(f"Serving on {self.host}:{self.port} with {self.workers} workers x {self.threads} threads")
+        for slot in range(self.workers):
+            self._spawn(slot)
+        try:
+            while self._workers or self._retiring or self._restarts:
+                if self._stopping:
+                    self._restarts.clear()
+                    self._retire(list(self._workers))
+                elif self._reload:
+                    self._reload = False
+                    Logger.info("Reloading workers")
+                    old = list(self._workers)
+                    for slot in range(self.workers):
+                        self._spawn(slot)
+                    self._retire(old)
+                self._reap()
+                self._restart_due()
+                self._kill_overdue()
+                time.sleep(0.1)
+        finally:
+            self._socket.close()
+        if self._failed:
+            raise RuntimeError("Workers keep failing at startup; see the worker logs.")
+        Logger.info("Server stopped")
+
+    def _on_stop(self, signum, frame):
+        self._stopping = True
+
+    def _on_reload(self, signum, frame):
+        self._reload = True
+
+    def _spawn(self, slot):
+        pid = os.fork()
+        if pid == 0:
+            self._worker(slot)
+        self._workers[pid] = slot
+        self._started[pid] = time.monotonic()
+        self._restarts.pop(slot, None)
+
+    def _retire(self, pids):
+        deadline = time.monotonic() + self.graceful_timeout
+        for pid in pids:
+            self._workers.pop(pid, None)
+            self._started.pop(pid, None)
+            self._retiring[pid] = deadline
+            self._signal(pid, signal.SIGTERM)
+
+    def _reap(self):
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            if self._retiring.pop(pid, None) is not None:
+                continue
+            slot = self._workers.pop(pid, None)
+            started = self._started.pop(pid, None)
+            if slot is None or self._stopping:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            if time.monotonic() - started < self.MIN_UPTIME:
+                failures = self._failures[slot] = self._failures.get(slot, 0) + 1
+            else:
+                failures = self._failures[slot] = 0
+            if failures >= self.MAX_FAST_FAILURES:
+                Logger.error(f"Worker {pid} exited with status {code}, the {failures}th failure in a row "
+                             f"within {self.MIN_UPTIME}s of starting; stopping the server")
+                self._failed = self._stopping = True
+                continue
+            delay = min(self.BACKOFF_MAX, self.BACKOFF_START * 2 ** (failures - 1)) if failures else 0.0
+            Logger.error(f"Worker {pid} exited with status {code}; restarting it in {delay:g}s")
+            self._restarts[slot] = time.monotonic() + delay
+
+    def _restart_due(self):
+        now = time.monotonic()
+        for slot, due in list(self._restarts.items()):
+            if due <= now and not self._stopping:
+                self._spawn(slot)
+
+    def _kill_overdue(self):
+        now = time.monotonic()
+        for pid, deadline in list(self._retiring.items()):
+            if deadline < now:
+                Logger.error(f"Worker {pid} did not stop within {self.graceful_timeout}s; killing it")
+                self._signal(pid, signal.SIGKILL)
+                self._retiring[pid] = float('inf')
+
+    @staticmethod
+    def _signal(pid, signum):
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+    # --- Worker ---
+
+    def _worker(self, slot):
+        """Serve requests until told to stop. Never returns into the master's code."""
+        status = 0
+        try:
+            self._serve(slot)
+        except BaseException as e:
+            Logger.error(f"Worker {os.getpid()} failed", e)
+            status = 1
+        finally:
+            Logger.shutdown()
+            os._exit(status)
+
+    def _serve(self, slot):
+        master = os.getppid()
+        # The master decides when workers stop or reload, even on a terminal's Ctrl-C
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        Logger.after_fork(f"cms.worker{slot}.log")
+        with self.app.app_context():
+            # Forget the master's pool without closing its connections (see SQLAlchemy's pooling docs)
+            db.engine.dispose(close=False)
+
+        server = _PooledWSGIServer(self.host, self.port, self.app, self._socket.fileno(), self.threads)
+        # Each open event stream holds a pool thread, so idle streams must not take them all
+        streams = event_broadcaster.reserve_threads(self.threads)
+        Logger.info(f"Worker {os.getpid()} allows {streams} event streams on {self.threads} threads")
+        stopping = threading.Event()
+
+        def stop(*_):
+            # shutdown() waits for serve_forever(), so it cannot run on this (the serving) thread
+            if not stopping.is_set():
+                stopping.set()
+                threading.Thread(target=server.shutdown, daemon=True).start()
+
+        def watch_master():
+            # Stop if the master is gone, rather than serve on unsupervised
+            while not stopping.wait(1.0):
+                if os.getppid() != master:
+                    stop()
+
+        signal.signal(signal.SIGTERM, stop)
+        threading.Thread(target=watch_master, name='master-watch', daemon=True).start()
+
+        server.serve_forever(poll_interval=0.5)
+        # Open event streams would otherwise keep their threads busy until they time out
+        event_broadcaster.close_streams()
+        server.drain()
+        server.server_close()
+        registration_pipeline.shutdown()
+        last_login_writer.shutdown()
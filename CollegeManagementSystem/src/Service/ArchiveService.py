@@ -0,0 +1,97 @@
+import time
+from datetime import datetime, timedelta, UTC
+
+from sqlalchemy import delete, literal, select
+
+from src.extensions import db
+from src.Entity.Archive import ArchivedEvent, ArchivedRegistration
+from src.Entity.Event import Event
+from src.Entity.Registeration import Registration
+from src.Service.EventBroadcaster import event_broadcaster
+from src.Service.EventCatalog import event_catalog
+from src.Utils.Logger import Logger
+
+_EVENT_COLUMNS = [
+    'event_id', 'title', 'type', 'event_date', 'created_at', 'capacity', 'registered_count',
+    'attended_count', 'version', 'updated_at', 'college_id', 'created_by'
+]
+_REGISTRATION_COLUMNS = ['registration_id', 'event_id', 'student_id', 'attended', 'registered_at']
+
+
+class ArchiveService:
+    """
+    Moves past events, with their registrations, from the live tables into
+    events_archive / registrations_archive, so the live tables and their
+    indexes only hold the current term.
+
+    Work is done a batch of events at a time, each batch in its own short
+    transaction (copy, then delete), with an optional pause in between so
+    request writes are never blocked for long.
+    """
+
+    DEFAULT_BATCH_SIZE = 200
+
+    @staticmethod
+    def cutoff(days):
+        return datetime.now(UTC) - timedelta(days=days)
+
+    @staticmethod
+    def archive_events(before, batch_size=DEFAULT_BATCH_SIZE, pause=0.0, max_batches=None):
+        """
+        Archive every event dated before `before`. Returns a summary with the
+        number of events and registrations moved and batches run.
+        """
+        summary = {"events": 0, "registrations": 0, "batches": 0}
+        while max_batches is None or summary["batches"] < max_batches:
+            event_ids = db.session.execute(
+                select(Event.event_id)
+                .where(Event.event_date < before)
+                .order_by(Event.event_date, Event.event_id)
+                .limit(batch_size)
+            ).scalars().all()
+            if not event_ids:
+                break
+            moved = ArchiveService._archive_batch(event_ids)
+            summary["events"] += len(event_ids)
+            summary["registrations"] += moved
+            summary["batches"] += 1
+            if pause:
+                time.sleep(pause)
+        Logger.info(f"Archived {summary['events']} events and {summary['registrations']} registrations")
+        return summary
+
+    @staticmethod
+    def _archive_batch(event_ids):
+        """Copy one batch of events and their registrations to the archive and delete them, in one transaction."""
+        archived_at = datetime.now(UTC)
+        try:
+            versions = db.session.execute(
+                select(Event.event_id, Event.version).where(Event.event_id.in_(event_ids))
+            ).all()
+            db.session.execute(ArchivedEvent.__table__.insert().from_select(
+                _EVENT_COLUMNS + ['archived_at'],
+                select(*[Event.__table__.c[name] for name in _EVENT_COLUMNS], literal(archived_at, ArchivedEvent.archived_at.type))
+                .where(Event.event_id.in_(event_ids))
+            ))
+            moved = db.session.execute(ArchivedRegistration.__table__.insert().from_select(
+                _REGISTRATION_COLUMNS,
+                select(*[Registration.__table__.c[name] for name in _REGISTRATION_COLUMNS])
+                .where(Registration.event_id.in_(event_ids))
+            )).rowcount
+            db.session.execute(
+                delete(Registration).where(Registration.event_id.in_(event_ids)).execution_options(synchronize_session=False)
+            )
+            db.session.execute(
+                delete(Event).where(Event.event_id.in_(event_ids)).execution_options(synchronize_session=False)
+            )
+            # Archived events leave the event stream and every process's catalog as deletions
+            event_broadcaster.record_many('deleted', [tuple(row) for row in versions])
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            Logger.error(f"Failed to archive a batch of {len(event_ids)} events", e)
+            raise
+        event_broadcaster.notify()
+        # Archived events leave the live catalog
+        event_catalog.refresh(event_ids)
+        return moved
@@ -0,0 +1,124 @@
+import importlib
+import threading
+import uuid
+
+from sqlalchemy import event, inspect, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.extensions import db
+from src.Entity.Colleges import College
+from src.Utils.Logger import Logger
+
+
+class CollegeResolver:
+    """
+    Shared find-or-create for colleges by name, backed by an in-memory
+    name -> college_id map.
+
+    The map is warmed once at startup. A miss runs an insert-or-get inside the
+    caller's session, so two requests creating the same new college both end
+    up with the same id instead of one failing on the unique `name`, and a
+    request that later fails rolls the new college back with everything else.
+    New ids are held on the session until it commits and only then added to
+    the map. Renamed or deleted colleges are evicted through ORM events.
+    """
+
+    _PENDING = 'college_resolver.pending'
+
+    def __init__(self):
+        self._ids = {}
+        self._lock = threading.Lock()
+        self._warmed = False
+
+    def init_app(self, app):
+        self.clear()
+
+    def warm(self):
+        """Load every college into the map (a few hundred rows at most)."""
+        ids = dict(db.session.execute(select(College.name, College.college_id)).all())
+        with self._lock:
+            self._ids = ids
+            self._warmed = True
+
+    def get_id(self, name):
+        """
+        Return the college_id for `name`, creating the college in the current
+        session if needed. The caller commits (or rolls back) the new row.
+        """
+        if not self._warmed:
+            self.warm()
+        college_id = self._ids.get(name)
+        if college_id is None:
+            pending = db.session.info.setdefault(self._PENDING, {})
+            college_id = pending.get(name)
+            if college_id is None:
+                college_id = pending[name] = self._insert_or_get(name)
+        return college_id
+
+    def get_ids(self, names):
+        """Resolve many names at once. Returns a name -> college_id dict."""
+        return {name: self.get_id(name) for name in set(names) if name}
+
+    def evict(self, name):
+        with self._lock:
+            self._ids.pop(name, None)
+
+    def clear(self):
+        with self._lock:
+            self._ids = {}
+            self._warmed = False
+
+    def publish(self, ids):
+        with self._lock:
+            self._ids.update(ids)
+
+    def _insert_or_get(self, name):
+        table = College.__table__
+        values = {"college_id": str(uuid.uuid4()), "name": name}
+        session = db.session
+        dialect = session.get_bind().dialect.name
+        if dialect in ('sqlite', 'postgresql'):
+            # Imported here: loading the postgresql dialect at startup costs ~50ms for nothing on SQLite
+            dialect_insert = importlib.import_module(f'sqlalchemy.dialects.{dialect}').insert
+            result = session.execute(dialect_insert(table).values(**values).on_conflict_do_nothing(index_elements=['name']))
+            created = result.rowcount == 1
+        else:
+            try:
+                with session.begin_nested():
+                    session.execute(insert(table).values(**values))
+                created = True
+            except IntegrityError:
+                created = False
+        college_id = session.execute(select(table.c.college_id).where(table.c.name == name)).scalar_one()
+
+        if created:
+            Logger.info(f"Created new college '{name}' with ID {college_id}")
+        return college_id
+
+
+college_resolver = CollegeResolver()
+
+
+@event.listens_for(College, 'after_update')
+def _evict_on_rename(mapper, connection, target):
+    history = inspect(target).attrs.name.history
+    for name in list(history.deleted or ()) + list(history.added or ()):
+        college_resolver.evict(name)
+
+
+@event.listens_for(College, 'after_delete')
+def _evict_on_delete(mapper, connection, target):
+    college_resolver.evict(target.name)
+
+
+@event.listens_for(Session, 'after_commit')
+def _publish_on_commit(session):
+    pending = session.info.pop(CollegeResolver._PENDING, None)
+    if pending:
+        college_resolver.publish(pending)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _drop_on_rollback(session):
+    session.info.pop(CollegeResolver._PENDING, None)
@@ -0,0 +1,263 @@
+import atexit
+import threading
+import time
+from bisect import bisect_right
+
+from sqlalchemy import delete, func, insert, select
+
+from src.extensions import db
+from src.Entity.Event import Event
+from src.Entity.EventChange import EventChange
+from src.Serializers.EventSerializer import EventSerializer
+from src.Utils.BackgroundThread import BackgroundThread
+from src.Utils.Json import Json
+from src.Utils.Logger import Logger
+
+_RESET = b"event: reset\ndata: {}\n\n"
+_KEEP_ALIVE = b": keep-alive\n\n"
+# PostgreSQL advisory lock serializing writers of event_changes (see record_many())
+_CHANGES_LOCK = 0x45564348
+
+
+class EventBroadcaster:
+    """
+    Fan-out of event create/update/delete notifications to GET /events/stream.
+
+    EventService, ImportService and ArchiveService record each change as an
+    event_changes row in the change's own transaction (record()). Change rows
+    become visible in id order: SQLite has one writer at a time, and on
+    PostgreSQL record() holds an advisory lock until the commit. So a reader
+    that has seen id N has seen every change before it, in every worker
+    process. In each process one thread polls for new rows, but only while
+    some stream is open, and is woken at once by local commits (notify()).
+    It encodes each change once into a bounded in-memory buffer. Every open
+    stream waits on one Condition and writes out whatever is new, so an idle
+    stream costs a parked thread and no queries.
+
+    A stream resuming with Last-Event-ID is replayed from the buffer, or from
+    the table, which keeps the newest EVENT_STREAM_REPLAY changes. A client
+    further behind than that gets a `reset` event telling it to reload.
+
+    Each open stream still holds its request thread until it ends. On a
+    server with a fixed thread pool, reserve_threads() caps streams so some
+    threads always remain for other requests.
+    """
+
+    def __init__(self, replay_size=1000, poll_interval=1.0, heartbeat=15.0, max_clients=100, max_seconds=300.0):
+        self.replay_size = replay_size
+        self.poll_interval = poll_interval
+        self.heartbeat = heartbeat
+        self.max_clients = max_clients
+        self.max_seconds = max_seconds
+        self.reserved_threads = None
+        self._cond = threading.Condition()
+        self._wake = threading.Event()
+        self._ids = []
+        self._messages = []
+        self._floor = 0      # the buffer holds every change after this id
+        self._last_id = 0
+        self._clients = 0
+        self._closing = False
+        self._poller = BackgroundThread(self._run, 'event-broadcaster')
+        self._app = None
+        self.sent = 0
+
+    def init_app(self, app):
+        self.shutdown()
+        self.replay_size = app.config.get('EVENT_STREAM_REPLAY', self.replay_size)
+        self.poll_interval = app.config.get('EVENT_STREAM_POLL_INTERVAL', self.poll_interval)
+        self.heartbeat = app.config.get('EVENT_STREAM_HEARTBEAT', self.heartbeat)
+        self.max_clients = app.config.get('EVENT_STREAM_MAX_CLIENTS', self.max_clients)
+        self.max_seconds = app.config.get('EVENT_STREAM_MAX_SECONDS', self.max_seconds)
+        self.reserved_threads = app.config.get('EVENT_STREAM_RESERVED_THREADS', self.reserved_threads)
+        self._closing = False
+        self._app = app
+
+    # --- Writers (EventService) ---
+
+    def record(self, kind, event):
+        """Add a change row for `event` to the current transaction and prune old ones. Does not commit."""
+        self.record_many(kind, [(event.event_id, event.version)])
+
+    def record_many(self, kind, changes):
+        """
+        Add a change row per (event_id, version) pair to the current
+        transaction, e.g. after a bulk insert. Does not commit.
+
+        On PostgreSQL ids come from a sequence when the row is inserted, not
+        when it commits, so a later id could become visible first and a
+        reader would move past the earlier one for good. An advisory lock held
+        from here to the commit makes change rows commit in id order. Call
+        this after the transaction's other writes, so the lock is held only
+        for the commit and is never taken before a row lock.
+        """
+        if not changes:
+            return
+        if db.session.get_bind().dialect.name == 'postgresql':
+            db.session.execute(select(func.pg_advisory_xact_lock(_CHANGES_LOCK)))
+        db.session.execute(insert(EventChange), [
+            {"event_id": event_id, "kind": kind, "version": version} for event_id, version in changes
+        ])
+        db.session.execute(
+            delete(EventChange)
+            .where(EventChange.id <= select(func.max(EventChange.id)).scalar_subquery() - self.replay_size)
+            .execution_options(synchronize_session=False)
+        )
+
+    def notify(self):
+        """Wake the poller after a commit that recorded changes."""
+        self._wake.set()
+
+    def reserve_threads(self, threads):
+        """
+        Cap open streams for a process serving requests on `threads` threads,
+        leaving EVENT_STREAM_RESERVED_THREADS of them (default: half, rounded
+        up) for everything else. Returns the new cap.
+        """
+        reserved = self.reserved_threads if self.reserved_threads is not None else (threads + 1) // 2
+        self.max_clients = max(0, min(self.max_clients, threads - reserved))
+        return self.max_clients
+
+    # --- Streams ---
+
+    def open(self, last_event_id=None):
+        """
+        A generator of SSE bytes for one client, starting after
+        `last_event_id` (or from now), or None when EVENT_STREAM_MAX_CLIENTS
+        streams are already open. Releases the request's database connection,
+        so waiting streams hold none.
+        """
+        if last_event_id is not None:
+            try:
+                last_event_id = int(last_event_id)
+            except (TypeError, ValueError):
+                raise ValueError("Invalid Last-Event-ID.")
+        with self._cond:
+            if self._clients >= self.max_clients:
+                return None
+            if self._clients == 0:
+                # Nobody was listening, so the buffer is stale; restart it from the newest change
+                self._last_id = self._floor = db.session.execute(select(func.max(EventChange.id))).scalar() or 0
+                self._ids, self._messages = [], []
+            self._clients += 1
+            cursor = self._last_id if last_event_id is None else last_event_id
+        db.session.close()
+        self._poller.ensure()
+        return self._stream(cursor)
+
+    def _stream(self, cursor):
+        try:
+            # Sends the response headers now, so the client sees the stream open
+            yield _KEEP_ALIVE
+            deadline = time.monotonic() + self.max_seconds
+            while not self._closing:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    # Ends the response; the client reconnects with Last-Event-ID (and fresh credentials)
+                    break
+                with self._cond:
+                    self._cond.wait_for(
+                        lambda: self._last_id > cursor or self._closing, timeout=min(self.heartbeat, remaining)
+                    )
+                    if cursor < self._floor:
+                        messages = None
+                    else:
+                        start = bisect_right(self._ids, cursor)
+                        messages = list(zip(self._ids[start:], self._messages[start:]))
+                if messages is None:
+                    messages = self._replay(cursor)
+                    if messages is None:
+                        yield _RESET
+                        with self._cond:
+                            cursor = self._last_id
+                        continue
+                if messages:
+                    cursor = messages[-1][0]
+                    self.sent += len(messages)
+                    yield b"".join(message for _, message in messages)
+                else:
+                    yield _KEEP_ALIVE
+        finally:
+            with self._cond:
+                self._clients -= 1
+
+    def _replay(self, cursor):
+        """Changes after `cursor` from the table, or None if they have been pruned."""
+        try:
+            newest = db.session.execute(select(func.max(EventChange.id))).scalar() or 0
+            if cursor < newest - self.replay_size:
+                return None
+            return self._fetch(cursor, self.replay_size)
+        finally:
+            db.session.close()
+
+    def _fetch(self, after_id, limit):
+        changes = db.session.execute(
+            select(EventChange.id, EventChange.event_id, EventChange.kind, EventChange.version)
+            .where(EventChange.id > after_id)
+            .order_by(EventChange.id)
+            .limit(limit)
+        ).all()
+        live_ids = [change.event_id for change in changes if change.kind != 'deleted']
+        events = {event.event_id: event for event in Event.query.filter(Event.event_id.in_(live_ids))} if live_ids else {}
+        return [(change.id, EventBroadcaster._encode(change, events.get(change.event_id))) for change in changes]
+
+    @staticmethod
+    def _encode(change, event):
+        data = Json.dumps({"event_id": change.event_id, "version": change.version})
+        if event is not None:
+            # The event as it is now, from the shared fragment cache
+            data = data[:-1] + b',"event":' + EventSerializer.encode(event, include_counts=True) + b"}"
+        return b"id: %d\nevent: %s\ndata: %s\n\n" % (change.id, change.kind.encode(), data)
+
+    # --- Poller ---
+
+    def _run(self):
+        with self._app.app_context():
+            while not self._closing:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+                if not self._clients:
+                    continue
+                try:
+                    messages = self._fetch(self._last_id, self.replay_size)
+                except Exception as e:
+                    Logger.error("Failed to read event changes for the event stream", e)
+                    messages = []
+                finally:
+                    db.session.remove()
+                if messages:
+                    self._publish(messages)
+
+    def _publish(self, messages):
+        with self._cond:
+            for change_id, message in messages:
+                if change_id <= self._last_id:
+                    continue
+                self._ids.append(change_id)
+                self._messages.append(message)
+                self._last_id = change_id
+            overflow = len(self._ids) - self.replay_size
+            if overflow > self.replay_size:
+                # Trimmed in bulk so appends stay amortized O(1)
+                self._floor = self._ids[overflow - 1]
+                del self._ids[:overflow], self._messages[:overflow]
+            self._cond.notify_all()
+
+    def clients(self):
+        return self._clients
+
+    def close_streams(self):
+        """End every open stream (e.g. before a graceful shutdown)."""
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._wake.set()
+
+    def shutdown(self):
+        self.close_streams()
+        self._poller.join()
+
+
+event_broadcaster = EventBroadcaster()
+atexit.register(event_broadcaster.shutdown)
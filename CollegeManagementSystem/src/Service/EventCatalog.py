@@ -0,0 +1,432 @@
+import atexit
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import datetime, timedelta, UTC
+
+from sqlalchemy import select
+
+from src.extensions import db
+from src.Entity.Event import Event
+from src.Entity.EventChange import EventChange
+from src.Serializers.EventSerializer import EventSerializer
+from src.Utils.BackgroundThread import BackgroundThread
+from src.Utils.Json import Json
+from src.Utils.Logger import Logger
+from src.Utils.Pagination import Pagination
+
+# Every column the event serializers read
+_COLUMNS = [
+    Event.event_id, Event.title, Event.type, Event.event_date, Event.college_id, Event.created_by,
+    Event.capacity, Event.version, Event.updated_at, Event.registered_count, Event.attended_count,
+]
+_IN_CHUNK = 500
+# Rows changed this long before the previous sync are read again, in case
+# their transaction committed after that sync ran
+_SYNC_OVERLAP = timedelta(seconds=5)
+_MAX_TOMBSTONES = 10000
+
+
+class CatalogEntry:
+    """One live event: its listing key, filter fields, validators and pre-encoded JSON."""
+    __slots__ = ('event_id', 'event_date', 'college_id', 'type', 'version', 'updated_at', 'key', 'fragment', 'counted_fragment')
+
+    def __init__(self, row):
+        self.event_id = row.event_id
+        self.event_date = row.event_date
+        self.college_id = row.college_id
+        self.type = row.type
+        self.version = row.version
+        self.updated_at = row.updated_at
+        self.key = (row.event_date, row.event_id)
+        self.fragment = Json.dumps(EventSerializer.serialize(row))
+        self.counted_fragment = Json.dumps(EventSerializer.serialize(row, include_counts=True))
+
+    def encoded(self, include_counts=False):
+        return self.counted_fragment if include_counts else self.fragment
+
+
+class _Run:
+    """Entries in listing order with their keys alongside for bisect. Never modified once published."""
+    __slots__ = ('keys', 'entries')
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.keys = [entry.key for entry in entries]
+
+    def replace(self, removed, added):
+        """A copy without the `removed` entries and with the `added` ones, still in order."""
+        run = _Run.__new__(_Run)
+        keys, entries = list(self.keys), list(self.entries)
+        for entry in removed:
+            i = bisect_left(keys, entry.key)
+            del keys[i], entries[i]
+        for entry in added:
+            i = bisect_left(keys, entry.key)
+            keys.insert(i, entry.key)
+            entries.insert(i, entry)
+        run.keys, run.entries = keys, entries
+        return run
+
+
+_EMPTY_RUN = _Run([])
+
+
+class CatalogSnapshot:
+    """
+    An immutable view of the live events: every event in listing order,
+    the same per college and per type, and a map by id. Changes build a new
+    snapshot that shares whatever they did not touch.
+    """
+    __slots__ = ('all', 'by_id', 'by_college', 'by_type', 'naive')
+
+    def __init__(self, entries):
+        entries = sorted(entries, key=lambda entry: entry.key)
+        self.all = _Run(entries)
+        self.by_id = {entry.event_id: entry for entry in entries}
+        self.by_college = CatalogSnapshot._index(entries, 'college_id')
+        self.by_type = CatalogSnapshot._index(entries, 'type')
+        # SQLite hands back naive datetimes; filters and cursors are compared the same way
+        self.naive = not entries or entries[0].event_date.tzinfo is None
+
+    @staticmethod
+    def _index(entries, field):
+        groups = {}
+        for entry in entries:
+            groups.setdefault(getattr(entry, field), []).append(entry)
+        return {value: _Run(group) for value, group in groups.items()}
+
+    def replace(self, removed, added):
+        snapshot = CatalogSnapshot.__new__(CatalogSnapshot)
+        snapshot.by_id = dict(self.by_id)
+        for entry in removed:
+            del snapshot.by_id[entry.event_id]
+        for entry in added:
+            snapshot.by_id[entry.event_id] = entry
+        snapshot.all = self.all.replace(removed, added)
+        snapshot.by_college = CatalogSnapshot._replace_in_index(self.by_college, 'college_id', removed, added)
+        snapshot.by_type = CatalogSnapshot._replace_in_index(self.by_type, 'type', removed, added)
+        if self.by_id:
+            snapshot.naive = self.naive
+        else:
+            snapshot.naive = not added or added[0].event_date.tzinfo is None
+        return snapshot
+
+    @staticmethod
+    def _replace_in_index(index, field, removed, added):
+        changes = {}
+        for position, entries in enumerate((removed, added)):
+            for entry in entries:
+                changes.setdefault(getattr(entry, field), ([], []))[position].append(entry)
+        index = dict(index)
+        for value, (group_removed, group_added) in changes.items():
+            run = index.get(value, _EMPTY_RUN).replace(group_removed, group_added)
+            if run.entries:
+                index[value] = run
+            else:
+                del index[value]
+        return index
+
+    def align(self, value):
+        """`value` made comparable with the stored event dates, the way the database compares them."""
+        if self.naive and value.tzinfo is not None:
+            return value.replace(tzinfo=None)
+        if not self.naive and value.tzinfo is None:
+            return value.replace(tzinfo=UTC)
+        return value
+
+
+class EventCatalog:
+    """
+    In-memory read model of the live event catalog (EVENT_CATALOG=true).
+
+    GET /events (without include_archived) and the student view of
+    GET /events/<id> are answered from an immutable CatalogSnapshot: one
+    attribute read, then bisects and slices over sorted lists, with no lock
+    and no query. Each event is encoded to JSON once, when it enters the
+    snapshot.
+
+    A writer never changes a published snapshot; it builds a new one sharing
+    the untouched parts and swaps it in with one assignment. EventService
+    calls refresh() with the ids it changed right after each commit, so a
+    process always reads its own writes. Changes committed by other
+    processes (prefork workers, CLI imports) are picked up by a sync thread
+    every EVENT_CATALOG_SYNC_INTERVAL seconds: rows whose updated_at moved,
+    plus the `deleted` rows of the event_changes feed (deleted and archived
+    events), which commit in id order. Anything neither path sees is caught
+    by a full reload every EVENT_CATALOG_RELOAD_INTERVAL seconds. A change is only applied
+    over an older version of the event, so writers racing each other never
+    move an event back.
+
+    verify() compares the snapshot with the database, for tests.
+    """
+
+    def __init__(self, sync_interval=1.0, reload_interval=300.0):
+        self.enabled = False
+        self.sync_interval = sync_interval
+        self.reload_interval = reload_interval
+        self._snapshot = None
+        self._write_lock = threading.Lock()
+        self._tombstones = OrderedDict()  # ids of deleted events, never re-added by a late writer
+        self._synced_at = None
+        self._change_id = 0
+        self._next_reload = 0.0
+        self._stale = False
+        self._wake = threading.Event()
+        self._closing = False
+        self._syncer = BackgroundThread(self._run, 'event-catalog')
+        self._app = None
+        self.reads = 0
+        self.misses = 0
+        self.updates = 0
+        self.reloads = 0
+
+    def init_app(self, app):
+        self.shutdown()
+        self.enabled = app.config.get('EVENT_CATALOG', False)
+        self.sync_interval = app.config.get('EVENT_CATALOG_SYNC_INTERVAL', self.sync_interval)
+        self.reload_interval = app.config.get('EVENT_CATALOG_RELOAD_INTERVAL', self.reload_interval)
+        self._snapshot = None
+        self._tombstones.clear()
+        self._stale = False
+        self._closing = False
+        self._app = app
+
+    def warm(self):
+        """Load the snapshot up front (before workers fork, so they share it)."""
+        if self.enabled:
+            self.reload()
+
+    # --- Reads ---
+
+    def page(self, filters, limit, cursor):
+        """
+        The same page as EventService.get_events_page (live events only), as
+        (entries, next cursor), or None when there is no snapshot to read yet.
+        """
+        if not self.enabled:
+            return None
+        snapshot = self._read()
+        if snapshot is None:
+            self.misses += 1
+            return None
+        self.reads += 1
+        # Imported here: EventService imports this module to call refresh()
+        from src.Service.EventService import EventService
+        filters = filters or {}
+        event_type = EventService.parse_event_type(filters['type']) if filters.get('type') else None
+        date_from = date_to = None
+        if filters.get('date_from'):
+            date_from = snapshot.align(EventService.parse_datetime(filters['date_from'], 'date_from'))
+        if filters.get('date_to'):
+            date_to = snapshot.align(EventService.parse_datetime(filters['date_to'], 'date_to'))
+        after = Pagination.decode_cursor(cursor)
+        if after:
+            try:
+                after = (snapshot.align(datetime.fromisoformat(after[0])), str(after[1]))
+            except (IndexError, TypeError, ValueError):
+                raise ValueError("Invalid cursor.")
+
+        # The narrowest index for the filters; a remaining type filter is checked per entry
+        if filters.get('college_id'):
+            run = snapshot.by_college.get(filters['college_id'], _EMPTY_RUN)
+        elif event_type is not None:
+            run, event_type = snapshot.by_type.get(event_type, _EMPTY_RUN), None
+        else:
+            run = snapshot.all
+        start = bisect_left(run.keys, (date_from,)) if date_from is not None else 0
+        if after:
+            start = max(start, bisect_right(run.keys, after))
+
+        entries, candidates = [], run.entries
+        for i in range(start, len(candidates)):
+            entry = candidates[i]
+            if date_to is not None and entry.event_date > date_to:
+                break
+            if event_type is not None and entry.type is not event_type:
+                continue
+            entries.append(entry)
+            if len(entries) > limit:
+                break
+
+        next_cursor = None
+        if len(entries) > limit:
+            entries = entries[:limit]
+            last = entries[-1]
+            next_cursor = Pagination.encode_cursor([last.event_date.isoformat(), last.event_id])
+        return entries, next_cursor
+
+    def get(self, event_id):
+        """The live event's entry, or None if it is not in the snapshot (or there is none)."""
+        if not self.enabled:
+            return None
+        snapshot = self._read()
+        entry = snapshot.by_id.get(event_id) if snapshot is not None else None
+        if entry is None:
+            # Possibly created by another process since the last sync; the caller asks the database
+            self.misses += 1
+        else:
+            self.reads += 1
+        return entry
+
+    def _read(self):
+        if not self.enabled:
+            return None
+        self._syncer.ensure()
+        return self._snapshot
+
+    def size(self):
+        snapshot = self._snapshot
+        return len(snapshot.by_id) if snapshot is not None else 0
+
+    # --- Writes ---
+
+    def refresh(self, event_ids):
+        """
+        Re-read the given events after a commit that changed them and swap in
+        a snapshot with their new state; ids no longer in the table are
+        removed. Never raises: on failure the next sync reloads everything.
+        """
+        if not self.enabled or self._snapshot is None:
+            return
+        event_ids = list(dict.fromkeys(event_ids))
+        if not event_ids:
+            return
+        try:
+            rows = self._load_rows(event_ids)
+            found = {row.event_id for row in rows}
+            self._apply(rows, [event_id for event_id in event_ids if event_id not in found])
+        except Exception as e:
+            Logger.error(f"Failed to refresh {len(event_ids)} event(s) in the event catalog", e)
+            self._stale = True
+            self._wake.set()
+        self._syncer.ensure()
+
+    def reload(self):
+        """Rebuild the snapshot from the events table."""
+        started = datetime.now(UTC)
+        change_id = db.session.execute(select(EventChange.id).order_by(EventChange.id.desc()).limit(1)).scalar() or 0
+        entries = [CatalogEntry(row) for row in self._load_rows()]
+        with self._write_lock:
+            current = self._snapshot
+            if current is not None:
+                # Keep anything a writer applied after the load read its row
+                entries = [
+                    current.by_id[entry.event_id]
+                    if entry.event_id in current.by_id and current.by_id[entry.event_id].version > entry.version
+                    else entry
+                    for entry in entries
+                ]
+            self._snapshot = CatalogSnapshot(entry for entry in entries if entry.event_id not in self._tombstones)
+            self._synced_at = started
+            self._change_id = max(self._change_id, change_id)
+            self._next_reload = time.monotonic() + self.reload_interval
+            self._stale = False
+            self.reloads += 1
+
+    def _apply(self, rows, removed_ids):
+        """Swap in a snapshot with `rows` upserted and `removed_ids` removed. Returns whether anything changed."""
+        with self._write_lock:
+            snapshot = self._snapshot
+            if snapshot is None:
+                return False
+            removed, added = [], []
+            for event_id in removed_ids:
+                self._tombstones[event_id] = True
+                if len(self._tombstones) > _MAX_TOMBSTONES:
+                    self._tombstones.popitem(last=False)
+                current = snapshot.by_id.get(event_id)
+                if current is not None:
+                    removed.append(current)
+            for row in rows:
+                current = snapshot.by_id.get(row.event_id)
+                if row.event_id in self._tombstones or (current is not None and current.version >= row.version):
+                    continue
+                if current is not None:
+                    removed.append(current)
+                added.append(CatalogEntry(row))
+            if not removed and not added:
+                return False
+            self._snapshot = snapshot.replace(removed, added)
+            self.updates += 1
+            return True
+
+    def _load_rows(self, event_ids=None):
+        if event_ids is None:
+            return db.session.execute(select(*_COLUMNS)).all()
+        rows = []
+        for start in range(0, len(event_ids), _IN_CHUNK):
+            rows += db.session.execute(
+                select(*_COLUMNS).where(Event.event_id.in_(event_ids[start:start + _IN_CHUNK]))
+            ).all()
+        return rows
+
+    # --- Sync with other processes ---
+
+    def _sync(self):
+        started = datetime.now(UTC)
+        rows = db.session.execute(select(*_COLUMNS).where(Event.updated_at >= self._synced_at - _SYNC_OVERLAP)).all()
+        deleted = db.session.execute(
+            select(EventChange.id, EventChange.event_id)
+            .where(EventChange.id > self._change_id, EventChange.kind == 'deleted')
+            .order_by(EventChange.id)
+        ).all()
+        self._apply(rows, [change.event_id for change in deleted])
+        self._synced_at = started
+        if deleted:
+            self._change_id = deleted[-1].id
+
+    def _run(self):
+        with self._app.app_context():
+            while not self._closing:
+                try:
+                    if self._snapshot is None or self._stale or time.monotonic() >= self._next_reload:
+                        self.reload()
+                    else:
+                        self._sync()
+                except Exception as e:
+                    Logger.error("Failed to sync the event catalog", e)
+                finally:
+                    db.session.remove()
+                self._wake.wait(self.sync_interval)
+                self._wake.clear()
+
+    def shutdown(self):
+        self._closing = True
+        self._wake.set()
+        self._syncer.join()
+
+    # --- Consistency check ---
+
+    def verify(self):
+        """
+        Compare the snapshot with the events table and check its indexes.
+        Returns a list of differences, empty when the snapshot is consistent.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return ["No snapshot is loaded."]
+        expected = {row.event_id: CatalogEntry(row) for row in self._load_rows()}
+        problems = [f"Event {event_id} is missing." for event_id in expected.keys() - snapshot.by_id.keys()]
+        problems += [f"Event {event_id} no longer exists." for event_id in snapshot.by_id.keys() - expected.keys()]
+        for event_id, entry in snapshot.by_id.items():
+            want = expected.get(event_id)
+            if want is not None and (entry.fragment, entry.counted_fragment) != (want.fragment, want.counted_fragment):
+                problems.append(f"Event {event_id} is stale (version {entry.version}, database has {want.version}).")
+
+        if snapshot.all.entries != sorted(snapshot.by_id.values(), key=lambda entry: entry.key):
+            problems.append("The listing is out of order or does not match the id map.")
+        for name, index, field in (("college", snapshot.by_college, 'college_id'), ("type", snapshot.by_type, 'type')):
+            want = CatalogSnapshot._index(snapshot.all.entries, field)
+            if set(index) != set(want) or any(index[value].entries != run.entries for value, run in want.items()):
+                problems.append(f"The {name} index does not match the listing.")
+            if any(run.keys != [entry.key for entry in run.entries] for run in index.values()):
+                problems.append(f"The {name} index keys do not match its entries.")
+        if snapshot.all.keys != [entry.key for entry in snapshot.all.entries]:
+            problems.append("The listing keys do not match its entries.")
+        return problems
+
+
+event_catalog = EventCatalog()
+atexit.register(event_catalog.shutdown)
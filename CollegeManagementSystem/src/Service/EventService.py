@@ -1,10 +1,19 @@
 from src.Entity.Event import Event, EventType
-from src.Entity.Colleges import College
 from src.Entity.Registeration import Registration
-from src import User, UserRole
+from src.Entity.Archive import ArchivedEvent, ArchivedRegistration
+from src.Entity.Colleges import College
+from src.Entity.User import User, UserRole
 from src.extensions import db
-from datetime import datetime
-from src.Utils.Logger import Logger # Added for logging new college creation
+from datetime import datetime, UTC
+import uuid
+from sqlalchemy import and_, bindparam, case, delete, exists, false, func, literal, or_, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+from src.Utils.Logger import Logger
+from src.Utils.Pagination import Pagination
+from src.Service.CollegeResolver import college_resolver
+from src.Service.EventBroadcaster import event_broadcaster
+from src.Service.EventCatalog import event_catalog
 
 class EventService:
     @staticmethod
@@ -18,72 +27,326 @@ class EventService:
             if field not in data:
                 raise ValueError(f"Missing required field: {field}")
 
-        # --- START: Updated "Find or Create" College Logic ---
-        college_name = data['college_name']
-        college = College.query.filter_by(name=college_name).first()
-
-        if not college:
-            college = College(name=college_name)
-            db.session.add(college)
-            db.session.flush()
-            Logger.info(f"Created new college '{college.name}' with ID {college.college_id}")
-
-        try:
-            event_type = EventType[data['type'].upper().replace(" ", "_")]
-        except KeyError:
-            valid_types = [t.name for t in EventType]
-            raise ValueError(f"Invalid event type. Must be one of: {valid_types}")
+        event_type = EventService.parse_event_type(data['type'])
         
         # Validate and parse date
-        try:
-            event_date = datetime.fromisoformat(data['event_date'].replace('Z', '+00:00'))
-        except (ValueError, TypeError):
-            raise ValueError("Invalid event_date format. Please use ISO 8601 format.")
+        event_date = EventService.parse_datetime(data['event_date'], 'event_date')
+        capacity = EventService.parse_capacity(data.get('capacity'))
+
+        # Find or create the college last, in this transaction, so a rejected request leaves no new college behind
+        college_name = data['college_name']
+        college_id = college_resolver.get_id(college_name)
 
         # Create the event using the found or newly created college's ID
         new_event = Event(
             title=data['title'],
             type=event_type,
             event_date=event_date,
-            college_id=college.college_id, # This now works for both existing and new colleges
+            college_id=college_id, # This now works for both existing and new colleges
+            capacity=capacity,
             created_by=admin_id
         )
         
         db.session.add(new_event)
+        db.session.flush()
+        event_broadcaster.record('created', new_event)
         db.session.commit()
-        Logger.info(f"Created new event '{new_event.title}' for college '{college.name}'")
+        event_broadcaster.notify()
+        event_catalog.refresh([new_event.event_id])
+        Logger.info(f"Created new event '{new_event.title}' for college '{college_name}'")
         return new_event
 
     @staticmethod
-    def get_all_events():
-        return Event.query.order_by(Event.event_date.asc()).all()
+    def _registrations_loader(model=Event):
+        """
+        Eager-load option for event.registrations plus the student and college
+        rows the serializers read. Each level is fetched with one
+        `SELECT ... WHERE id IN (...)`, so loading N events costs a constant
+        number of queries instead of one per event.
+        """
+        registration_model = ArchivedRegistration if model is ArchivedEvent else Registration
+        return (
+            selectinload(model.registrations)
+            .selectinload(registration_model.student)
+            .selectinload(User.college)
+        )
+
+    @staticmethod
+    def _event_query(include_registrations=False, model=Event):
+        query = model.query
+        if include_registrations:
+            query = query.options(EventService._registrations_loader(model))
+        return query
 
     @staticmethod
-    def get_event_by_id(event_id):
-        return Event.query.get(event_id)
+    def _page_rows(make_query, filters, limit, cursor, include_archived):
+        """
+        The first limit + 1 rows after `cursor` in listing order. With
+        include_archived the live and archive tables are paged separately and
+        the two sorted runs merged, so each side still reads one index range.
+        """
+        models = (Event, ArchivedEvent) if include_archived else (Event,)
+        rows = []
+        for model in models:
+            rows += EventService._page_query(make_query(model), filters, cursor, model).limit(limit + 1).all()
+        if include_archived:
+            rows.sort(key=lambda row: (row.event_date, row.event_id))
+        return rows[:limit + 1]
+
+    @staticmethod
+    def get_events_page(filters=None, limit=Pagination.DEFAULT_LIMIT, cursor=None, include_registrations=False,
+                        include_archived=False):
+        """
+        Returns one page of events ordered by (event_date, event_id) and the
+        cursor for the next page (None on the last page). Filters are applied
+        in SQL so the cost depends on the page size, not the table size.
+        Only live events are listed unless `include_archived` is set.
+        """
+        events = EventService._page_rows(
+            lambda model: EventService._event_query(include_registrations, model),
+            filters, limit, cursor, include_archived
+        )
+        next_cursor = None
+        if len(events) > limit:
+            events = events[:limit]
+            last = events[-1]
+            next_cursor = Pagination.encode_cursor([last.event_date.isoformat(), last.event_id])
+        return events, next_cursor
+
+    @staticmethod
+    def get_events_page_versions(filters=None, limit=Pagination.DEFAULT_LIMIT, cursor=None, include_archived=False):
+        """
+        Cheap validator probe for get_events_page: returns the (event_id,
+        version) rows of the same page plus whether another page exists,
+        reading only those columns.
+        """
+        rows = EventService._page_rows(
+            lambda model: db.session.query(model.event_id, model.version, model.event_date),
+            filters, limit, cursor, include_archived
+        )
+        return rows[:limit], len(rows) > limit
+
+    @staticmethod
+    def _page_query(query, filters, cursor, model=Event):
+        """Apply the listing filters, the keyset cursor and the listing order to `query` over `model`."""
+        filters = filters or {}
+        if filters.get('type'):
+            query = query.filter(model.type == EventService.parse_event_type(filters['type']))
+        if filters.get('college_id'):
+            query = query.filter(model.college_id == filters['college_id'])
+        if filters.get('date_from'):
+            query = query.filter(model.event_date >= EventService.parse_datetime(filters['date_from'], 'date_from'))
+        if filters.get('date_to'):
+            query = query.filter(model.event_date <= EventService.parse_datetime(filters['date_to'], 'date_to'))
+
+        after = Pagination.decode_cursor(cursor)
+        if after:
+            try:
+                last_date, last_id = datetime.fromisoformat(after[0]), str(after[1])
+            except (IndexError, TypeError, ValueError):
+                raise ValueError("Invalid cursor.")
+            query = query.filter(or_(
+                model.event_date > last_date,
+                and_(model.event_date == last_date, model.event_id > last_id)
+            ))
+        return query.order_by(model.event_date.asc(), model.event_id.asc())
+
+    @staticmethod
+    def parse_event_type(value):
+        try:
+            return EventType[value.upper().replace(" ", "_")]
+        except (KeyError, AttributeError):
+            valid_types = [t.name for t in EventType]
+            raise ValueError(f"Invalid event type. Must be one of: {valid_types}")
+
+    @staticmethod
+    def parse_capacity(value):
+        """Parse an optional seat limit. Empty or missing means unlimited."""
+        if value is None or value == '':
+            return None
+        try:
+            capacity = int(value)
+        except (TypeError, ValueError):
+            raise ValueError("Invalid capacity. Must be a positive integer.")
+        if capacity < 1 or isinstance(value, bool):
+            raise ValueError("Invalid capacity. Must be a positive integer.")
+        return capacity
+
+    @staticmethod
+    def parse_datetime(value, field):
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except (ValueError, TypeError, AttributeError):
+            raise ValueError(f"Invalid {field} format. Please use ISO 8601 format.")
+
+    @staticmethod
+    def get_event_version(event_id, include_archived=False):
+        """(version, updated_at) of an event by primary key, or None if it does not exist."""
+        for model in EventService._models(include_archived):
+            row = db.session.execute(select(model.version, model.updated_at).where(model.event_id == event_id)).first()
+            if row:
+                return row
+        return None
+
+    @staticmethod
+    def _models(include_archived):
+        """The event models to read from: live only, or live then archive."""
+        return (Event, ArchivedEvent) if include_archived else (Event,)
+
+    @staticmethod
+    def _bump_version(model=Event):
+        """Column values that mark an event as changed, for UPDATE ... VALUES."""
+        return {"version": model.version + 1, "updated_at": datetime.now(UTC)}
+
+    @staticmethod
+    def get_event_by_id(event_id, include_registrations=False, include_archived=False):
+        """A live event by id; with include_archived, an archived one when no live event matches."""
+        for model in EventService._models(include_archived):
+            if include_registrations:
+                event = EventService._event_query(True, model).filter(model.event_id == event_id).first()
+            else:
+                event = db.session.get(model, event_id)
+            if event:
+                return event
+        return None
 
     @staticmethod
     def register_for_event(event_id, student_id):
-        event = Event.query.get(event_id)
-        if not event:
-            raise ValueError(f"Event with ID {event_id} not found.")
+        """
+        Registers a student for an event in one short transaction: a
+        conditional UPDATE reserves a seat by bumping registered_count only
+        while it is below capacity, then an INSERT ... SELECT adds the row only
+        if the user is a student. The row-level UPDATE serializes concurrent
+        registrations for the same event on every backend. Duplicates are
+        rejected by the `_event_student_uc` constraint. The lookups below only
+        run to explain a rejected registration.
+        """
+        registration = EventService._new_registration(event_id, student_id)
+        try:
+            inserted = 0
+            if db.session.execute(EventService._reserve_seat(event_id)).rowcount:
+                inserted = db.session.execute(EventService._insert_registration(registration)).rowcount
+            if inserted:
+                db.session.commit()
+            else:
+                db.session.rollback()
+        except IntegrityError:
+            db.session.rollback()
+            raise
 
-        student = User.query.get(student_id)
-        if not student or student.role != UserRole.USER:
-            raise ValueError("User not found or is not a student.")
+        if inserted:
+            event_catalog.refresh([event_id])
+            return registration
+        raise EventService._rejection(event_id, student_id)
 
-        existing_reg = Registration.query.filter_by(event_id=event_id, student_id=student_id).first()
-        if existing_reg:
-            raise ValueError("Student is already registered for this event.")
-        
-        new_registration = Registration(event_id=event_id, student_id=student_id)
-        db.session.add(new_registration)
-        db.session.commit()
-        
-        return new_registration
+    @staticmethod
+    def register_batch(requests):
+        """
+        Registers a list of (event_id, student_id) pairs, in order, in one
+        transaction (one commit for the whole batch). Returns one result per
+        pair: the Registration, or the exception register_for_event would have
+        raised for it, so each caller sees exactly what the synchronous path
+        gives. Rows are checked before they are written, so one rejected pair
+        never aborts the others; if the transaction itself fails, it is rolled
+        back and the error raised, with nothing written.
+        """
+        results = []
+        try:
+            for event_id, student_id in requests:
+                registration = EventService._new_registration(event_id, student_id)
+                has_room = db.session.execute(
+                    select(Event.event_id).where(Event.event_id == event_id, EventService._has_room())
+                ).first() is not None
+                inserted = has_room and db.session.execute(
+                    EventService._insert_registration(registration, skip_duplicate=True)
+                ).rowcount
+                if inserted:
+                    if not db.session.execute(EventService._reserve_seat(event_id)).rowcount:
+                        # A writer outside this batch took the last seat in between; let the caller retry
+                        raise RuntimeError(f"Event {event_id} filled up during a batch registration.")
+                    results.append(registration)
+                else:
+                    results.append((event_id, student_id, has_room))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        event_catalog.refresh([result.event_id for result in results if isinstance(result, Registration)])
+
+        for i, result in enumerate(results):
+            if isinstance(result, tuple):
+                event_id, student_id, has_room = result
+                if has_room and Registration.query.filter_by(event_id=event_id, student_id=student_id).first():
+                    # The same error the synchronous path gets from the unique constraint
+                    results[i] = IntegrityError(
+                        "INSERT INTO registrations", {"event_id": event_id, "student_id": student_id},
+                        ValueError("Student is already registered for this event.")
+                    )
+                else:
+                    results[i] = EventService._rejection(event_id, student_id)
+        return results
+
+    @staticmethod
+    def _new_registration(event_id, student_id):
+        return Registration(
+            registration_id=str(uuid.uuid4()),
+            event_id=event_id,
+            student_id=student_id,
+            attended=False,
+            registered_at=datetime.now(UTC)
+        )
+
+    @staticmethod
+    def _has_room():
+        return or_(Event.capacity.is_(None), Event.registered_count < Event.capacity)
+
+    @staticmethod
+    def _reserve_seat(event_id):
+        return (
+            update(Event)
+            .where(Event.event_id == event_id)
+            .where(EventService._has_room())
+            .values(registered_count=Event.registered_count + 1, **EventService._bump_version())
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def _insert_registration(registration, skip_duplicate=False):
+        """INSERT ... SELECT adding `registration` only if its user is a student (and, optionally, not yet registered)."""
+        registrations = Registration.__table__
+        source = (
+            select(
+                literal(registration.registration_id),
+                literal(registration.event_id),
+                literal(registration.student_id),
+                false(),
+                literal(registration.registered_at, registrations.c.registered_at.type)
+            )
+            .where(exists().where(User.id == registration.student_id, User.role == UserRole.USER))
+        )
+        if skip_duplicate:
+            source = source.where(~exists().where(
+                registrations.c.event_id == registration.event_id,
+                registrations.c.student_id == registration.student_id
+            ))
+        return registrations.insert().from_select(
+            ['registration_id', 'event_id', 'student_id', 'attended', 'registered_at'], source
+        )
+
+    @staticmethod
+    def _rejection(event_id, student_id):
+        """The ValueError explaining why a registration was not made."""
+        if not db.session.get(Event, event_id):
+            return ValueError(f"Event with ID {event_id} not found.")
+        student = db.session.get(User, student_id)
+        if not student or student.role != UserRole.USER:
+            return ValueError("User not found or is not a student.")
+        if Registration.query.filter_by(event_id=event_id, student_id=student_id).first():
+            return ValueError("Student is already registered for this event.")
+        return ValueError("Event is full.")
     
     @staticmethod
-    def update_event(event_id, data):
+    def update_event(event_id, data, include_registrations=False):
         event = Event.query.get(event_id)
         if not event:
             raise ValueError("Event not found.")
@@ -92,17 +355,26 @@ class EventService:
         if 'title' in data:
             event.title = data['title']
         if 'type' in data:
-            try:
-                event.type = EventType[data['type'].upper().replace(" ", "_")]
-            except KeyError:
-                raise ValueError("Invalid event type.")
+            event.type = EventService.parse_event_type(data['type'])
         if 'event_date' in data:
-            try:
-                event.event_date = datetime.fromisoformat(data['event_date'].replace('Z', '+00:00'))
-            except (ValueError, TypeError):
-                raise ValueError("Invalid event_date format.")
+            event.event_date = EventService.parse_datetime(data['event_date'], 'event_date')
+        if 'capacity' in data:
+            event.capacity = EventService.parse_capacity(data['capacity'])
 
+        changed = db.session.is_modified(event)
+        if changed:
+            for key, value in EventService._bump_version().items():
+                setattr(event, key, value)
+            # Flushed first so the change row gets the bumped version
+            db.session.flush()
+            event_broadcaster.record('updated', event)
         db.session.commit()
+        if changed:
+            event_broadcaster.notify()
+            event_catalog.refresh([event_id])
+        if include_registrations:
+            # The commit expired the instance; reload it with registrations batched in
+            return EventService.get_event_by_id(event_id, include_registrations=True)
         return event
 
     @staticmethod
@@ -113,7 +385,11 @@ class EventService:
             raise ValueError("Event not found.")
         
         db.session.delete(event)
+        db.session.flush()
+        event_broadcaster.record('deleted', event)
         db.session.commit()
+        event_broadcaster.notify()
+        event_catalog.refresh([event_id])
         return True
 
     @staticmethod
@@ -123,7 +399,268 @@ class EventService:
         if not registration:
             raise ValueError("Registration not found.")
         
-        registration.attended = True
+        changed = not registration.attended
+        if changed:
+            EventService._set_attended(registration.event_id, [registration_id])
         db.session.commit()
+        if changed:
+            event_catalog.refresh([registration.event_id])
         return registration
-        
\ No newline at end of file
+
+    @staticmethod
+    def _set_attended(event_id, registration_ids):
+        """
+        Marks not-yet-attended registrations of one event as attended and adds
+        the number actually changed to the event's attended_count. Returns the
+        ids the UPDATE changed, so a registration checked in concurrently by
+        another request is not reported as marked here. Does not commit.
+        """
+        marked = set()
+        for start in range(0, len(registration_ids), EventService._IN_CHUNK):
+            marked.update(db.session.execute(
+                update(Registration)
+                .where(Registration.registration_id.in_(registration_ids[start:start + EventService._IN_CHUNK]))
+                .where(Registration.attended.is_(False))
+                .values(attended=True)
+                .returning(Registration.registration_id)
+                .execution_options(synchronize_session=False)
+            ).scalars())
+        if marked:
+            db.session.execute(
+                update(Event)
+                .where(Event.event_id == event_id)
+                .values(attended_count=Event.attended_count + len(marked), **EventService._bump_version())
+                .execution_options(synchronize_session=False)
+            )
+        return marked
+
+    @staticmethod
+    def remove_student_registrations(student_id):
+        """
+        Deletes every registration of a student, live and archived, and gives
+        their seats (and attendance) back on the affected events. Does not commit.
+        Returns the ids of the live events changed, to refresh after the commit.
+        """
+        changed = []
+        for event_model, registration_model in ((Event, Registration), (ArchivedEvent, ArchivedRegistration)):
+            per_event = db.session.execute(
+                select(
+                    registration_model.event_id,
+                    func.count(),
+                    func.sum(case((registration_model.attended.is_(True), 1), else_=0))
+                )
+                .where(registration_model.student_id == student_id)
+                .group_by(registration_model.event_id)
+            ).all()
+            for event_id, registered, attended in per_event:
+                if event_model is Event:
+                    changed.append(event_id)
+                db.session.execute(
+                    update(event_model)
+                    .where(event_model.event_id == event_id)
+                    .values(
+                        registered_count=event_model.registered_count - registered,
+                        attended_count=event_model.attended_count - attended,
+                        **EventService._bump_version(event_model)
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+            if per_event:
+                db.session.execute(
+                    delete(registration_model)
+                    .where(registration_model.student_id == student_id)
+                    .execution_options(synchronize_session=False)
+                )
+        return changed
+
+    @staticmethod
+    def get_event_stats(event_id, include_archived=False):
+        """Registration and attendance figures for one event, read from its counters."""
+        row = None
+        for model in EventService._models(include_archived):
+            row = db.session.execute(
+                select(model.event_id, model.capacity, model.registered_count, model.attended_count)
+                .where(model.event_id == event_id)
+            ).first()
+            if row:
+                break
+        if not row:
+            return None
+        return {
+            "event_id": row.event_id,
+            "capacity": row.capacity,
+            "registered_count": row.registered_count,
+            "attended_count": row.attended_count,
+            "seats_left": row.capacity - row.registered_count if row.capacity is not None else None,
+            "fill_rate": round(row.registered_count / row.capacity, 4) if row.capacity else None,
+            "attendance_rate": round(row.attended_count / row.registered_count, 4) if row.registered_count else None
+        }
+
+    @staticmethod
+    def repair_counters():
+        """
+        Recomputes registered_count and attended_count for every event from the
+        registrations table with a single GROUP BY, and rewrites only the
+        events whose counters drifted. Returns the number of events fixed.
+        """
+        actual = {
+            event_id: (registered, attended)
+            for event_id, registered, attended in db.session.execute(
+                select(
+                    Registration.event_id,
+                    func.count(),
+                    func.sum(case((Registration.attended.is_(True), 1), else_=0))
+                ).group_by(Registration.event_id)
+            )
+        }
+        fixes = []
+        for event_id, registered, attended in db.session.execute(
+            select(Event.event_id, Event.registered_count, Event.attended_count)
+        ):
+            expected = actual.get(event_id, (0, 0))
+            if (registered, attended) != expected:
+                fixes.append({
+                    "b_event_id": event_id,
+                    "registered_count": expected[0],
+                    "attended_count": expected[1]
+                })
+        if fixes:
+            events = Event.__table__
+            db.session.execute(
+                events.update()
+                .where(events.c.event_id == bindparam('b_event_id'))
+                .values(
+                    registered_count=bindparam('registered_count'),
+                    attended_count=bindparam('attended_count'),
+                    **EventService._bump_version()
+                ),
+                fixes
+            )
+        db.session.commit()
+        event_catalog.refresh([fix["b_event_id"] for fix in fixes])
+        Logger.info(f"Repaired registration counters for {len(fixes)} events")
+        return len(fixes)
+
+    EXPORT_CHUNK_SIZE = 1000
+
+    @staticmethod
+    def iter_registration_export_rows(event_id=None, college_id=None, include_archived=False):
+        """
+        Yields one tuple per registration (event id and title, registration id,
+        student id, name and email, the student's college, registered_at and
+        attended) for a single event or for every event hosted by a college,
+        followed by archived ones when `include_archived` is set.
+        Rows are pulled from a server-side cursor EXPORT_CHUNK_SIZE at a time
+        instead of being loaded into memory.
+        """
+        pairs = ((Event, Registration), (ArchivedEvent, ArchivedRegistration))
+        for event_model, registration_model in pairs[:2 if include_archived else 1]:
+            query = (
+                select(
+                    registration_model.event_id,
+                    event_model.title,
+                    registration_model.registration_id,
+                    registration_model.student_id,
+                    User.full_name,
+                    User.email,
+                    College.name,
+                    registration_model.registered_at,
+                    registration_model.attended
+                )
+                .join(event_model, registration_model.event_id == event_model.event_id)
+                .join(User, registration_model.student_id == User.id)
+                .outerjoin(College, User.college_id == College.college_id)
+            )
+            if event_id is not None:
+                query = query.where(registration_model.event_id == event_id)
+            if college_id is not None:
+                query = query.where(event_model.college_id == college_id)
+
+            result = db.session.execute(query.execution_options(yield_per=EventService.EXPORT_CHUNK_SIZE))
+            try:
+                for row in result:
+                    yield tuple(row)
+            finally:
+                result.close()
+
+    BULK_CHECK_IN_LIMIT = 1000
+    _IN_CHUNK = 500
+
+    @staticmethod
+    def mark_attendance_bulk(registration_ids=None, pairs=None):
+        """
+        Marks many registrations as attended with one set-based UPDATE per event
+        and a single commit. Registrations are identified either by id or by
+        (event_id, student_id) pairs. Returns one result per input item, in
+        order, with status 'ok', 'not_found' or 'already_attended'.
+        """
+        if (registration_ids is None) == (pairs is None):
+            raise ValueError("Provide either registration_ids or pairs.")
+
+        if registration_ids is not None:
+            if not isinstance(registration_ids, list):
+                raise ValueError("registration_ids must be a list.")
+            keys = [str(reg_id) for reg_id in registration_ids]
+        else:
+            if not isinstance(pairs, list):
+                raise ValueError("pairs must be a list.")
+            keys = []
+            for pair in pairs:
+                try:
+                    keys.append((str(pair['event_id']), int(pair['student_id'])))
+                except (KeyError, TypeError, ValueError):
+                    raise ValueError("Each pair must have an event_id and an integer student_id.")
+
+        if len(keys) > EventService.BULK_CHECK_IN_LIMIT:
+            raise ValueError(f"At most {EventService.BULK_CHECK_IN_LIMIT} check-ins per request.")
+
+        # Look up every referenced registration, a chunk of keys per SELECT
+        unique_keys = list(dict.fromkeys(keys))
+        found = {}
+        for start in range(0, len(unique_keys), EventService._IN_CHUNK):
+            chunk = unique_keys[start:start + EventService._IN_CHUNK]
+            query = db.session.query(
+                Registration.registration_id,
+                Registration.event_id,
+                Registration.student_id,
+                Registration.attended
+            )
+            if registration_ids is not None:
+                query = query.filter(Registration.registration_id.in_(chunk))
+            else:
+                query = query.filter(tuple_(Registration.event_id, Registration.student_id).in_(chunk))
+            for row in query:
+                key = row.registration_id if registration_ids is not None else (row.event_id, row.student_id)
+                found[key] = row
+
+        to_mark = {}
+        for key in unique_keys:
+            row = found.get(key)
+            if row is not None and not row.attended:
+                to_mark.setdefault(row.event_id, []).append(row.registration_id)
+        # One set-based UPDATE (plus a counter bump) per event in the batch. The
+        # statuses come from the rows each UPDATE changed, not from the SELECT above.
+        marked = set()
+        for event_id, event_registration_ids in to_mark.items():
+            marked |= EventService._set_attended(event_id, event_registration_ids)
+        db.session.commit()
+        event_catalog.refresh(list(to_mark))
+
+        results = []
+        for key in keys:
+            row = found.get(key)
+            if row is None:
+                status = 'not_found'
+            elif row.registration_id in marked:
+                status = 'ok'
+                # A repeated key in the same request was already counted
+                marked.discard(row.registration_id)
+            else:
+                status = 'already_attended'
+            result = {"status": status, "registration_id": row.registration_id if row else None}
+            if registration_ids is None:
+                result["event_id"], result["student_id"] = key
+            elif row is None:
+                result["registration_id"] = key
+            results.append(result)
+        return results
@@ -0,0 +1,268 @@
+import csv
+import io
+import json
+
+from sqlalchemy import insert, or_
+from sqlalchemy.exc import IntegrityError
+
+from src.extensions import db
+from src.Entity.User import User
+from src.Entity.Event import Event, generate_uuid
+from src.Service.CollegeResolver import college_resolver
+from src.Service.EventBroadcaster import event_broadcaster
+from src.Service.EventCatalog import event_catalog
+from src.Service.EventService import EventService
+from src.Service.UserService import UserService
+from src.Utils.Logger import Logger
+
+SUPPORTED_FORMATS = ('csv', 'ndjson')
+
+
+class ImportReport:
+    """Running totals for an import. Only the first MAX_ERRORS failures are kept."""
+
+    MAX_ERRORS = 1000
+
+    def __init__(self):
+        self.processed = 0
+        self.inserted = 0
+        self.failed = 0
+        self.errors = []
+
+    def fail(self, line, error):
+        self.failed += 1
+        if len(self.errors) < ImportReport.MAX_ERRORS:
+            self.errors.append({"line": line, "error": error})
+
+    def to_dict(self):
+        return {
+            "processed": self.processed,
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors)
+        }
+
+
+class ImportService:
+    """
+    Streaming bulk import of users and events from CSV or NDJSON.
+
+    Rows are read one at a time, validated, and inserted in batches with a
+    single multi-row INSERT and one commit per batch. Invalid rows and rows
+    that hit a uniqueness conflict are reported by line number without
+    aborting the rest of the import.
+    """
+
+    USER_BATCH_SIZE = 1000
+    EVENT_BATCH_SIZE = 1000
+
+    @staticmethod
+    def detect_format(filename=None, content_type=None, explicit=None):
+        """Pick the input format from an explicit value, the filename or the content type."""
+        if explicit:
+            fmt = explicit.lower()
+        elif filename and filename.lower().endswith('.csv'):
+            fmt = 'csv'
+        elif filename and filename.lower().endswith(('.ndjson', '.jsonl')):
+            fmt = 'ndjson'
+        elif content_type and 'csv' in content_type:
+            fmt = 'csv'
+        elif content_type and ('ndjson' in content_type or 'jsonl' in content_type):
+            fmt = 'ndjson'
+        else:
+            fmt = None
+        if fmt not in SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported import format. Must be one of: {list(SUPPORTED_FORMATS)}")
+        return fmt
+
+    @staticmethod
+    def iter_records(stream, fmt, report):
+        """
+        Yield (line_number, record_dict) from a binary or text stream without
+        reading it all into memory. Unparseable lines are recorded as failures.
+        """
+        if isinstance(stream, io.TextIOBase):
+            text = stream
+        else:
+            text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+        if fmt == 'csv':
+            reader = csv.DictReader(text)
+            for record in reader:
+                report.processed += 1
+                yield reader.line_num, record
+            return
+
+        for line_no, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            report.processed += 1
+            try:
+                record = json.loads(line)
+            except ValueError:
+                report.fail(line_no, "Invalid JSON")
+                continue
+            if not isinstance(record, dict):
+                report.fail(line_no, "Each line must be a JSON object")
+                continue
+            yield line_no, record
+
+    @staticmethod
+    def import_users(stream, fmt, batch_size=USER_BATCH_SIZE):
+        report = ImportReport()
+        batch = []
+        for line_no, record in ImportService.iter_records(stream, fmt, report):
+            try:
+                batch.append((line_no, ImportService._user_values(record)))
+            except ValueError as e:
+                report.fail(line_no, str(e))
+                continue
+            if len(batch) >= batch_size:
+                ImportService._insert_users(batch, report)
+                batch = []
+        if batch:
+            ImportService._insert_users(batch, report)
+        Logger.info(f"User import finished: {report.inserted} inserted, {report.failed} failed")
+        return report
+
+    @staticmethod
+    def import_events(stream, fmt, admin_id, batch_size=EVENT_BATCH_SIZE):
+        report = ImportReport()
+        batch = []
+        for line_no, record in ImportService.iter_records(stream, fmt, report):
+            try:
+                batch.append((line_no, ImportService._event_values(record, admin_id)))
+            except ValueError as e:
+                report.fail(line_no, str(e))
+                continue
+            if len(batch) >= batch_size:
+                ImportService._insert_events(batch, report)
+                batch = []
+        if batch:
+            ImportService._insert_events(batch, report)
+        Logger.info(f"Event import finished: {report.inserted} inserted, {report.failed} failed")
+        return report
+
+    # --- Row validation ---
+
+    @staticmethod
+    def _require(record, fields):
+        values = {}
+        for field in fields:
+            value = record.get(field)
+            if value is None or str(value).strip() == '':
+                raise ValueError(f"Missing required field: {field}")
+            values[field] = str(value).strip()
+        return values
+
+    @staticmethod
+    def _user_values(record):
+        values = ImportService._require(record, ['username', 'email', 'password', 'full_name'])
+        college_name = record.get('college_name')
+        return {
+            "username": values['username'],
+            "email": values['email'],
+            "full_name": values['full_name'],
+            "password_hash": User.hash_password(values['password']),
+            "role": UserService.parse_role(record.get('role')),
+            "college_name": str(college_name).strip() if college_name else None
+        }
+
+    @staticmethod
+    def _event_values(record, admin_id):
+        values = ImportService._require(record, ['title', 'type', 'event_date', 'college_name'])
+        return {
+            # Generated here so the import knows the ids it inserted
+            "event_id": generate_uuid(),
+            "title": values['title'],
+            "type": EventService.parse_event_type(values['type']),
+            "event_date": EventService.parse_datetime(values['event_date'], 'event_date'),
+            "college_name": values['college_name'],
+            "capacity": EventService.parse_capacity(record.get('capacity')),
+            "created_by": admin_id
+        }
+
+    # --- Batch insertion ---
+
+    @staticmethod
+    def _insert_users(batch, report):
+        usernames = [values['username'] for _, values in batch]
+        emails = [values['email'] for _, values in batch]
+        taken_usernames, taken_emails = set(), set()
+        for username, email in db.session.query(User.username, User.email).filter(
+            or_(User.username.in_(usernames), User.email.in_(emails))
+        ):
+            taken_usernames.add(username)
+            taken_emails.add(email)
+
+        rows = []
+        for line_no, values in batch:
+            if values['username'] in taken_usernames or values['email'] in taken_emails:
+                report.fail(line_no, "Username or email already exists")
+                continue
+            taken_usernames.add(values['username'])
+            taken_emails.add(values['email'])
+            rows.append((line_no, values))
+
+        ImportService._bulk_insert(User, rows, report, "Username or email already exists")
+
+    @staticmethod
+    def _insert_events(batch, report):
+        def record(rows):
+            event_broadcaster.record_many('created', [(row['event_id'], 1) for row in rows])
+
+        inserted = ImportService._bulk_insert(Event, batch, report, "Event conflicts with existing data", record)
+        if inserted:
+            event_broadcaster.notify()
+            event_catalog.refresh([row['event_id'] for row in inserted])
+
+    @staticmethod
+    def _with_college_ids(rows):
+        """Swap each row's college_name for its college_id."""
+        colleges = college_resolver.get_ids(row['college_name'] for row in rows)
+        resolved = []
+        for row in rows:
+            row = dict(row, college_id=colleges.get(row['college_name']))
+            del row['college_name']
+            resolved.append(row)
+        return resolved
+
+    @staticmethod
+    def _bulk_insert(model, rows, report, conflict_error, on_insert=None):
+        """
+        Insert `rows` with one executemany INSERT. If a concurrent writer causes
+        a uniqueness conflict, retry the batch row by row so only the
+        conflicting rows are reported as failed. `on_insert`, if given, is
+        called with the inserted rows before each commit. Returns the rows
+        that were inserted.
+
+        Colleges are resolved inside each attempt: a new college is created in
+        the same transaction as the rows that use it and rolls back with them.
+        """
+        if not rows:
+            return []
+        try:
+            values = [row for _, row in rows]
+            db.session.execute(insert(model), ImportService._with_college_ids(values))
+            if on_insert:
+                on_insert(values)
+            db.session.commit()
+            report.inserted += len(rows)
+            return values
+        except IntegrityError:
+            db.session.rollback()
+
+        inserted = []
+        for line_no, row in rows:
+            try:
+                db.session.execute(insert(model), ImportService._with_college_ids([row]))
+                if on_insert:
+                    on_insert([row])
+                db.session.commit()
+                report.inserted += 1
+                inserted.append(row)
+            except IntegrityError:
+                db.session.rollback()
+                report.fail(line_no, conflict_error)
+        return inserted
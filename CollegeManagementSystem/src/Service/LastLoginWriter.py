@@ -0,0 +1,108 @@
+import atexit
+import threading
+from datetime import datetime, timezone
+
+from sqlalchemy import bindparam, update
+
+from src.extensions import db
+from src.Entity.User import User
+from src.Utils.BackgroundThread import BackgroundThread
+from src.Utils.Logger import Logger
+
+
+class LastLoginWriter:
+    """
+    Write-behind buffer for User.last_login.
+
+    Logins only record (user id -> time) in memory; a background thread
+    writes the pending values with one executemany UPDATE every
+    LAST_LOGIN_FLUSH_INTERVAL seconds, or sooner once LAST_LOGIN_MAX_PENDING
+    users are waiting. A user who logs in twice before a flush is written
+    once, with the later time. Pending values are flushed on shutdown()
+    (registered with atexit), and put back if a flush fails, so a graceful
+    stop loses nothing. An interval of 0, or a writer not attached to an app,
+    writes each login straight through.
+    """
+
+    def __init__(self, interval=5.0, max_pending=5000):
+        self.interval = interval
+        self.max_pending = max_pending
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._writer = BackgroundThread(self._run, 'last-login-writer')
+        self._engine = None
+        self.flushed = 0
+        self.failed_flushes = 0
+
+    def init_app(self, app):
+        # Anything still pending belongs to the previous app's database
+        self.shutdown()
+        self.interval = app.config.get('LAST_LOGIN_FLUSH_INTERVAL', self.interval)
+        self.max_pending = app.config.get('LAST_LOGIN_MAX_PENDING', self.max_pending)
+        with app.app_context():
+            self._engine = db.engine
+
+    @property
+    def buffering(self):
+        return self._engine is not None and self.interval > 0
+
+    def record(self, user_id, when=None):
+        when = when or datetime.now(timezone.utc)
+        if not self.buffering:
+            db.session.execute(update(User).where(User.id == user_id).values(last_login=when))
+            db.session.commit()
+            return
+        with self._lock:
+            self._pending[user_id] = when
+            pending = len(self._pending)
+        self._writer.ensure(before_start=self._stop.clear)
+        if pending >= self.max_pending:
+            self._wake.set()
+
+    def pending(self):
+        return len(self._pending)
+
+    def flush(self):
+        """Write every pending last_login now. Returns the number of users written."""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if not batch or self._engine is None:
+            return 0
+        try:
+            with self._engine.begin() as conn:
+                conn.execute(
+                    update(User.__table__)
+                    .where(User.__table__.c.id == bindparam('b_id'))
+                    .values(last_login=bindparam('b_last_login')),
+                    [{"b_id": user_id, "b_last_login": when} for user_id, when in batch.items()]
+                )
+        except Exception as e:
+            # Keep the values for the next flush, unless a newer login replaced them meanwhile
+            with self._lock:
+                for user_id, when in batch.items():
+                    self._pending.setdefault(user_id, when)
+            self.failed_flushes += 1
+            Logger.error(f"Failed to flush last_login for {len(batch)} users", e)
+            return 0
+        self.flushed += len(batch)
+        return len(batch)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+    def shutdown(self):
+        """Stop the background thread and flush whatever is still pending."""
+        if self._writer.started_here():
+            self._stop.set()
+            self._wake.set()
+        self._writer.join()
+        self.flush()
+
+
+last_login_writer = LastLoginWriter()
+atexit.register(last_login_writer.shutdown)
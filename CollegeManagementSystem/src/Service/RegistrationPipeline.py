@@ -0,0 +1,161 @@
+import atexit
+import queue
+import threading
+import time
+
+from src.extensions import db
+from src.Service.EventService import EventService
+from src.Utils.BackgroundThread import BackgroundThread
+from src.Utils.Logger import Logger
+
+_STOP = object()
+
+
+class _PendingRegistration:
+    __slots__ = ('event_id', 'student_id', 'result', 'done', 'state')
+
+    # Guards `state`, so a request is either cancelled by its caller or taken by the writer, never both
+    _state_lock = threading.Lock()
+
+    def __init__(self, event_id, student_id):
+        self.event_id = event_id
+        self.student_id = student_id
+        self.result = None
+        self.done = threading.Event()
+        self.state = 'queued'
+
+    def claim(self):
+        """Called by the writer before processing. False if the caller already gave up."""
+        with self._state_lock:
+            if self.state == 'cancelled':
+                return False
+            self.state = 'claimed'
+            return True
+
+    def cancel(self):
+        """Called by a caller that timed out. False if the writer is already processing it."""
+        with self._state_lock:
+            if self.state == 'claimed':
+                return False
+            self.state = 'cancelled'
+            return True
+
+    def resolve(self, result):
+        self.result = result
+        self.done.set()
+
+
+class RegistrationPipeline:
+    """
+    Group commit for event registrations.
+
+    With REGISTRATION_GROUP_COMMIT on, register() puts the request on an
+    in-process queue and waits. A writer thread takes up to
+    REGISTRATION_BATCH_SIZE queued requests (or whatever arrives within
+    REGISTRATION_BATCH_WAIT_MS of the first one), registers them in arrival
+    order in one transaction through EventService.register_batch, and hands
+    each caller its own result, so a burst of registrations costs one commit
+    (one fsync) per batch instead of one per registration. Callers get the
+    same Registration or exception as from EventService.register_for_event,
+    which is also what register() runs when group commit is off, when the
+    queue is full, and, one request at a time, when a batch fails. A caller
+    still queued after `timeout` seconds gets a TimeoutError and its request is
+    dropped; one the writer has already taken waits for its result.
+    """
+
+    def __init__(self, batch_size=64, max_wait=0.002, queue_size=1000, timeout=30.0):
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.timeout = timeout
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._writer = BackgroundThread(self._run, 'registration-writer')
+        self._app = None
+        self.batches = 0
+        self.batched = 0
+        self.failed_batches = 0
+
+    def init_app(self, app):
+        self.shutdown()
+        self.batch_size = app.config.get('REGISTRATION_BATCH_SIZE', self.batch_size)
+        self.max_wait = app.config.get('REGISTRATION_BATCH_WAIT_MS', self.max_wait * 1000) / 1000
+        self._queue = queue.Queue(maxsize=app.config.get('REGISTRATION_QUEUE_SIZE', self._queue.maxsize))
+        self._app = app if app.config.get('REGISTRATION_GROUP_COMMIT', False) else None
+
+    @property
+    def enabled(self):
+        return self._app is not None
+
+    def register(self, event_id, student_id):
+        """Register a student for an event; see EventService.register_for_event for the results."""
+        if not self.enabled:
+            return EventService.register_for_event(event_id, student_id)
+        pending = _PendingRegistration(event_id, student_id)
+        self._writer.ensure()
+        try:
+            self._queue.put_nowait(pending)
+        except queue.Full:
+            return EventService.register_for_event(event_id, student_id)
+        if not pending.done.wait(self.timeout):
+            if pending.cancel():
+                raise TimeoutError(f"Registration for event {event_id} was not processed within {self.timeout}s.")
+            # Already being committed; its result is moments away
+            pending.done.wait()
+        if isinstance(pending.result, Exception):
+            raise pending.result
+        return pending.result
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def _run(self):
+        with self._app.app_context():
+            stopping = False
+            while not stopping:
+                first = self._queue.get()
+                if first is _STOP:
+                    break
+                batch = [first]
+                deadline = time.monotonic() + self.max_wait
+                while len(batch) < self.batch_size:
+                    try:
+                        pending = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                    except queue.Empty:
+                        break
+                    if pending is _STOP:
+                        stopping = True
+                        break
+                    batch.append(pending)
+                self._process(batch)
+
+    def _process(self, batch):
+        # Skip requests whose callers timed out; they were told it failed
+        batch = [pending for pending in batch if pending.claim()]
+        if not batch:
+            return
+        try:
+            results = EventService.register_batch([(pending.event_id, pending.student_id) for pending in batch])
+            self.batches += 1
+            self.batched += len(batch)
+        except Exception as e:
+            self.failed_batches += 1
+            Logger.error(f"Group commit of {len(batch)} registrations failed; registering them one at a time", e)
+            results = []
+            for pending in batch:
+                try:
+                    results.append(EventService.register_for_event(pending.event_id, pending.student_id))
+                except Exception as error:
+                    results.append(error)
+        finally:
+            db.session.remove()
+        for pending, result in zip(batch, results):
+            pending.resolve(result)
+
+    def shutdown(self):
+        """Finish every queued registration and stop the writer thread."""
+        if self._writer.running():
+            self._queue.put(_STOP)
+        self._writer.join()
+
+
+registration_pipeline = RegistrationPipeline()
+atexit.register(registration_pipeline.shutdown)
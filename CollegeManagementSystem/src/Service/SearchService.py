@@ -0,0 +1,206 @@
+import re
+
+from sqlalchemy import and_, or_, text
+from sqlalchemy.exc import OperationalError
+
+from src.extensions import db
+from src.Entity.Colleges import College
+from src.Entity.Event import Event, EventType
+from src.Service.EventService import EventService
+from src.Utils.Logger import Logger
+from src.Utils.Pagination import Pagination
+
+_TERM = re.compile(r'(\w+)(\*?)', re.UNICODE)
+
+# FTS5 index over event title, type and college name. Its rowid is the event's
+# search_key, which the insert trigger assigns (the events rowid is not stable:
+# events has no INTEGER PRIMARY KEY, so a VACUUM may renumber it). Triggers keep
+# the index in sync with every write to events or colleges (service calls, bulk
+# imports and cascades alike). Column weights for ranking: title matches count
+# most, then the college, then the type.
+FTS_TRIGGERS = ['events_fts_ai', 'events_fts_ad', 'events_fts_au', 'events_fts_college_au']
+FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5("
+    "event_id UNINDEXED, title, type, college_name, "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "INSERT INTO events_fts(events_fts, rank) VALUES('rank', 'bm25(0.0, 10.0, 2.0, 5.0)')",
+    "CREATE TRIGGER IF NOT EXISTS events_fts_ai AFTER INSERT ON events BEGIN "
+    "UPDATE events SET search_key = (SELECT COALESCE(MAX(search_key), 0) + 1 FROM events) "
+    "WHERE rowid = new.rowid AND search_key IS NULL; "
+    "INSERT INTO events_fts(rowid, event_id, title, type, college_name) "
+    "SELECT search_key, event_id, title, type, (SELECT name FROM colleges WHERE college_id = new.college_id) "
+    "FROM events WHERE rowid = new.rowid; END",
+    "CREATE TRIGGER IF NOT EXISTS events_fts_ad AFTER DELETE ON events BEGIN "
+    "DELETE FROM events_fts WHERE rowid = old.search_key; END",
+    "CREATE TRIGGER IF NOT EXISTS events_fts_au AFTER UPDATE OF title, type, college_id ON events BEGIN "
+    "UPDATE events_fts SET title = new.title, type = new.type, "
+    "college_name = (SELECT name FROM colleges WHERE college_id = new.college_id) "
+    "WHERE rowid = old.search_key; END",
+    "CREATE TRIGGER IF NOT EXISTS events_fts_college_au AFTER UPDATE OF name ON colleges BEGIN "
+    "UPDATE events_fts SET college_name = new.name "
+    "WHERE rowid IN (SELECT search_key FROM events WHERE college_id = new.college_id); END",
+]
+
+class SearchService:
+    """
+    Event search by title, type and college name.
+
+    On SQLite with FTS5 this is a ranked (bm25) full-text search. The last
+    word of the query, and any word ending in `*`, matches as a prefix, so
+    "python work" finds "Python Workshop" while the user is still typing.
+    Ranking has to score every match, so a query matching more than
+    RANK_LIMIT events (e.g. a single common word) is returned unranked, in
+    index order, which keeps it as cheap as a narrow one. Other engines, or
+    a SQLite build without FTS5, fall back to case-insensitive LIKE matching
+    ordered by date.
+    """
+
+    MAX_TERMS = 8
+    RANK_LIMIT = 2000
+    _fts_available = {}
+
+    @staticmethod
+    def create_index(conn):
+        """Create (or fill) the FTS5 index on a SQLite connection. Returns False if FTS5 is unavailable."""
+        if conn.dialect.name != 'sqlite':
+            return False
+        exists = conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'events_fts'")).first()
+        try:
+            for statement in FTS_DDL:
+                if exists and statement.startswith("INSERT"):
+                    continue
+                conn.execute(text(statement))
+        except OperationalError as e:
+            Logger.error("SQLite FTS5 is unavailable; event search will use LIKE", e)
+            return False
+        if not exists:
+            SearchService._fill_index(conn)
+        return True
+
+    @staticmethod
+    def recreate_index(conn):
+        """Drop the FTS5 index and its triggers and create them again from FTS_DDL."""
+        if conn.dialect.name != 'sqlite':
+            return False
+        for trigger in FTS_TRIGGERS:
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+        conn.execute(text("DROP TABLE IF EXISTS events_fts"))
+        return SearchService.create_index(conn)
+
+    @staticmethod
+    def rebuild_index():
+        """Rebuild the FTS5 index from the events table, e.g. if it was edited by hand."""
+        with db.engine.begin() as conn:
+            if not SearchService._has_fts(conn):
+                return 0
+            conn.execute(text("DELETE FROM events_fts"))
+            return SearchService._fill_index(conn)
+
+    @staticmethod
+    def _fill_index(conn):
+        # Events inserted before the triggers existed have no key yet; new keys go above every existing one
+        conn.execute(text(
+            "UPDATE events SET search_key = (SELECT COALESCE(MAX(search_key), 0) FROM events) + rowid "
+            "WHERE search_key IS NULL"
+        ))
+        return conn.execute(text(
+            "INSERT INTO events_fts(rowid, event_id, title, type, college_name) "
+            "SELECT e.search_key, e.event_id, e.title, e.type, c.name "
+            "FROM events e LEFT JOIN colleges c ON c.college_id = e.college_id"
+        )).rowcount
+
+    @staticmethod
+    def _has_fts(conn):
+        key = str(conn.engine.url)
+        if key not in SearchService._fts_available:
+            SearchService._fts_available[key] = conn.dialect.name == 'sqlite' and conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE name = 'events_fts'")
+            ).first() is not None
+        return SearchService._fts_available[key]
+
+    @staticmethod
+    def uses_fts():
+        """Whether searches use the FTS5 index (checked once per database)."""
+        return SearchService._has_fts(db.session.connection())
+
+    @staticmethod
+    def parse_terms(query):
+        """The query's words as (word, is_prefix) pairs."""
+        terms = _TERM.findall(query or '')[:SearchService.MAX_TERMS]
+        if not terms:
+            raise ValueError("Search query must contain at least one word.")
+        last = len(terms) - 1
+        return [(word, bool(star) or i == last) for i, (word, star) in enumerate(terms)]
+
+    @staticmethod
+    def search_events(query, limit=Pagination.DEFAULT_LIMIT, cursor=None):
+        """Returns one page of matching events, best match first, and the cursor for the next page."""
+        terms = SearchService.parse_terms(query)
+        if SearchService.uses_fts():
+            return SearchService._search_fts(terms, limit, cursor)
+        return SearchService._search_like(terms, limit, cursor)
+
+    @staticmethod
+    def _search_fts(terms, limit, cursor):
+        # Words are quoted, so FTS5 syntax in user input is inert
+        match = " ".join('"' + word + '"' + ('*' if prefix else '') for word, prefix in terms)
+        params = {"match": match, "limit": limit + 1}
+
+        # The cursor is [rank, rowid] for ranked results and [None, rowid] for unranked ones
+        after = Pagination.decode_cursor(cursor)
+        if after:
+            try:
+                last_rank = None if after[0] is None else float(after[0])
+                params["last_rowid"] = int(after[1])
+            except (IndexError, TypeError, ValueError):
+                raise ValueError("Invalid cursor.")
+            ranked = last_rank is not None
+            params["last_rank"] = last_rank
+        else:
+            matches = db.session.execute(
+                text("SELECT rowid FROM events_fts WHERE events_fts MATCH :match LIMIT :probe"),
+                {"match": match, "probe": SearchService.RANK_LIMIT + 1}
+            ).all()
+            ranked = len(matches) <= SearchService.RANK_LIMIT
+
+        if ranked:
+            after_clause = "AND (rank > :last_rank OR (rank = :last_rank AND rowid > :last_rowid)) " if after else ""
+            order = "ORDER BY rank, rowid"
+        else:
+            after_clause = "AND rowid > :last_rowid " if after else ""
+            order = "ORDER BY rowid"
+        hits = db.session.execute(text(
+            "SELECT rowid, event_id, " + ("rank" if ranked else "NULL AS rank") + " FROM events_fts "
+            "WHERE events_fts MATCH :match " + after_clause + order + " LIMIT :limit"
+        ), params).all()
+
+        next_cursor = None
+        if len(hits) > limit:
+            hits = hits[:limit]
+            next_cursor = Pagination.encode_cursor([hits[-1].rank, hits[-1].rowid])
+        events = {event.event_id: event for event in Event.query.filter(Event.event_id.in_([hit.event_id for hit in hits]))}
+        return [events[hit.event_id] for hit in hits if hit.event_id in events], next_cursor
+
+    @staticmethod
+    def _search_like(terms, limit, cursor):
+        def escape(term):
+            return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+        terms = [word for word, _ in terms]
+
+        conditions = [
+            or_(
+                Event.title.ilike(f"%{escape(term)}%", escape='\\'),
+                College.name.ilike(f"%{escape(term)}%", escape='\\'),
+                # Types are stored by enum name, e.g. TECH_TALK
+                Event.type.in_([event_type for event_type in EventType if term.lower() in event_type.value.lower()])
+            )
+            for term in terms
+        ]
+        query = Event.query.join(College, Event.college_id == College.college_id).filter(and_(*conditions))
+        events = EventService._page_query(query, None, cursor).limit(limit + 1).all()
+        next_cursor = None
+        if len(events) > limit:
+            events = events[:limit]
+            next_cursor = Pagination.encode_cursor([events[-1].event_date.isoformat(), events[-1].event_id])
+        return events, next_cursor
@@ -1,7 +1,12 @@
-from src import User, UserRole, db
-from src.Entity.Colleges import College
+from src.extensions import db
+from src.Entity.User import User, UserRole
+from src.Service.CollegeResolver import college_resolver
+from src.Service.EventCatalog import event_catalog
+from src.Service.EventService import EventService
+from src.Service.LastLoginWriter import last_login_writer
 from src.Utils.Logger import Logger
-from datetime import datetime, timezone
+from src.Utils.Pagination import Pagination
+from sqlalchemy import or_
 
 class UserService:
     @staticmethod
@@ -12,6 +17,35 @@ class UserService:
             Logger.error("Failed to fetch all users", e)
             raise
 
+    @staticmethod
+    def get_users_page(filters=None, limit=Pagination.DEFAULT_LIMIT, cursor=None):
+        """
+        Returns one page of users ordered by id and the cursor for the next
+        page (None on the last page). Filters are applied in SQL.
+        """
+        filters = filters or {}
+        query = User.query
+
+        if filters.get('role'):
+            query = query.filter(User.role == UserService.parse_role(filters['role']))
+        if filters.get('college_id'):
+            query = query.filter(User.college_id == filters['college_id'])
+
+        after = Pagination.decode_cursor(cursor)
+        if after:
+            try:
+                last_id = int(after[0])
+            except (IndexError, TypeError, ValueError):
+                raise ValueError("Invalid cursor.")
+            query = query.filter(User.id > last_id)
+
+        users = query.order_by(User.id.asc()).limit(limit + 1).all()
+        next_cursor = None
+        if len(users) > limit:
+            users = users[:limit]
+            next_cursor = Pagination.encode_cursor([users[-1].id])
+        return users, next_cursor
+
     @staticmethod
     def get_user_by_id(user_id):
         return User.query.get(user_id)
@@ -29,28 +63,14 @@ class UserService:
                 if field not in data:
                     raise ValueError(f"Missing required field: {field}")
             
+            role = UserService.parse_role(data.get('role'))
+
+            # Resolved last and in this transaction: a duplicate username or email rolls the new college back too
             college_id_to_assign = None
             college_name = data.get('college_name')
 
             if college_name:
-                college = College.query.filter_by(name=college_name).first()
-                
-                if college:
-                    college_id_to_assign = college.college_id
-                else:
-                    new_college = College(name=college_name)
-                    db.session.add(new_college)
-                    
-                    db.session.flush()
-                    college_id_to_assign = new_college.college_id
-                    Logger.info(f"Created new college '{college_name}' with ID {college_id_to_assign}")
-
-            role = UserRole.USER
-            if 'role' in data and data['role']:
-                try:
-                    role = UserRole(data['role'].upper())
-                except ValueError:
-                    raise ValueError("Invalid role provided. Must be USER or ADMIN.")
+                college_id_to_assign = college_resolver.get_id(college_name)
 
             user = User(
                 username=data['username'],
@@ -70,6 +90,16 @@ class UserService:
             db.session.rollback()
             raise
     
+    @staticmethod
+    def parse_role(value):
+        """Parse a role name, defaulting to USER when none is given."""
+        if not value:
+            return UserRole.USER
+        try:
+            return UserRole(value.upper())
+        except (ValueError, AttributeError):
+            raise ValueError("Invalid role provided. Must be USER or ADMIN.")
+
     @staticmethod
     def get_user_by_username(username):
         return User.query.filter_by(username=username).first()
@@ -78,20 +108,31 @@ class UserService:
     def get_user_by_email(email):
         return User.query.filter_by(email=email).first()
 
+    @staticmethod
+    def get_user_by_login(identifier):
+        """
+        Finds a user by username or email in one query. A username match wins
+        if the identifier is one user's username and another's email.
+        """
+        users = User.query.filter(or_(User.username == identifier, User.email == identifier)).limit(2).all()
+        for user in users:
+            if user.username == identifier:
+                return user
+        return users[0] if users else None
+
     @staticmethod
     def update_last_login(user_id):
-        user = User.query.get(user_id)
-        if user:
-            user.last_login = datetime.now(timezone.utc)
-            db.session.commit()
-            return user
-        return None
+        """Records a login; the write is batched by last_login_writer."""
+        last_login_writer.record(user_id)
 
     @staticmethod
     def delete_user(user_id):
         user = User.query.get(user_id)
         if user:
+            # Free the student's seats so event counters stay in sync
+            changed_events = EventService.remove_student_registrations(user_id)
             db.session.delete(user)
             db.session.commit()
+            event_catalog.refresh(changed_events)
             return True
         return False
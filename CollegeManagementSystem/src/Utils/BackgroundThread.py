@@ -0,0 +1,46 @@
+import os
+import threading
+
+
+class BackgroundThread:
+    """
+    A daemon thread running `target`, started on first use by ensure().
+
+    Threads do not survive a fork, so the thread belongs to the process that
+    started it: in a forked worker it is neither running nor joined, and the
+    worker's first ensure() starts its own.
+    """
+
+    def __init__(self, target, name):
+        self.target = target
+        self.name = name
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    def started_here(self):
+        """Whether this process started the thread (it may have finished since)."""
+        return self._thread is not None and self._pid == os.getpid()
+
+    def running(self):
+        return self.started_here() and self._thread.is_alive()
+
+    def ensure(self, before_start=None):
+        """Start the thread unless it is running in this process; `before_start` runs first, under the lock."""
+        if self.running():
+            return
+        with self._lock:
+            if self.running():
+                return
+            if before_start is not None:
+                before_start()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self.target, name=self.name, daemon=True)
+            self._thread.start()
+
+    def join(self):
+        """Wait for this process's thread to exit (tell it to stop first), then forget it."""
+        thread = self._thread
+        if thread is not None and self._pid == os.getpid():
+            thread.join()
+        self._thread = None
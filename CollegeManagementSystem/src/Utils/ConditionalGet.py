@@ -0,0 +1,53 @@
+import hashlib
+from datetime import UTC
+
+from flask import request
+from werkzeug.http import http_date
+
+
+class ConditionalGet:
+    """
+    Strong ETags, Last-Modified and 304 handling for GET endpoints.
+
+    Routes build their validators from event versions, so they can answer
+    If-None-Match / If-Modified-Since from a cheap version probe before any
+    row is loaded or serialized. If-None-Match takes precedence over
+    If-Modified-Since, as HTTP requires.
+    """
+
+    @staticmethod
+    def etag(*parts):
+        """A strong ETag derived from `parts` (any values with a stable repr)."""
+        return hashlib.sha1(repr(parts).encode()).hexdigest()[:32]
+
+    @staticmethod
+    def last_modified(values):
+        """The latest of `values` (datetimes, naive ones taken as UTC), truncated to whole seconds."""
+        values = [value if value.tzinfo else value.replace(tzinfo=UTC) for value in values if value]
+        return max(values).replace(microsecond=0) if values else None
+
+    @staticmethod
+    def is_conditional(last_modified=True):
+        """Whether the request sends a validator the route can check; pass False for routes without Last-Modified."""
+        return bool(request.if_none_match) or (last_modified and request.if_modified_since is not None)
+
+    @staticmethod
+    def is_fresh(etag, last_modified=None):
+        """Whether the client's cached copy is still current."""
+        if request.if_none_match:
+            return request.if_none_match.contains(etag)
+        if request.if_modified_since is not None and last_modified is not None:
+            return last_modified <= request.if_modified_since
+        return False
+
+    @staticmethod
+    def headers(etag, last_modified=None):
+        """Validator headers for a 200 or 304 response. Clients must revalidate before reusing."""
+        headers = {"ETag": f'"{etag}"', "Cache-Control": "private, no-cache"}
+        if last_modified is not None:
+            headers["Last-Modified"] = http_date(last_modified)
+        return headers
+
+    @staticmethod
+    def not_modified(etag, last_modified=None):
+        return "", 304, ConditionalGet.headers(etag, last_modified)
@@ -0,0 +1,100 @@
+import os
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+from src.extensions import db
+
+
+def _env_int(name, default):
+    value = os.getenv(name)
+    return int(value) if value not in (None, '') else default
+
+
+def _env_bool(name, default):
+    value = os.getenv(name)
+    if value in (None, ''):
+        return default
+    return value.lower() in ('1', 'true', 'yes', 'on')
+
+
+class Database:
+    """
+    Engine configuration for the app, driven by config and environment.
+
+    DATABASE_URL selects the backend (SQLite by default, or e.g.
+    postgresql+psycopg2://...). Pool settings apply to every backend; the
+    SQLITE_* settings are applied as PRAGMAs on each new SQLite connection.
+    """
+
+    @staticmethod
+    def config_from_env():
+        """Default database settings, each overridable by an environment variable."""
+        return {
+            'SQLALCHEMY_DATABASE_URI': os.getenv('DATABASE_URL', 'sqlite:///database.db'),
+            'DB_POOL_SIZE': _env_int('DB_POOL_SIZE', 10),
+            'DB_MAX_OVERFLOW': _env_int('DB_MAX_OVERFLOW', 20),
+            'DB_POOL_TIMEOUT': _env_int('DB_POOL_TIMEOUT', 30),
+            'DB_POOL_RECYCLE': _env_int('DB_POOL_RECYCLE', 1800),
+            'DB_POOL_PRE_PING': _env_bool('DB_POOL_PRE_PING', True),
+            'SQLITE_JOURNAL_MODE': os.getenv('SQLITE_JOURNAL_MODE', 'WAL'),
+            'SQLITE_SYNCHRONOUS': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL'),
+            'SQLITE_BUSY_TIMEOUT_MS': _env_int('SQLITE_BUSY_TIMEOUT_MS', 5000),
+            # Negative values are in KiB, so -20000 is roughly 20 MB of page cache
+            'SQLITE_CACHE_SIZE': _env_int('SQLITE_CACHE_SIZE', -20000),
+            'SQLITE_MMAP_SIZE': _env_int('SQLITE_MMAP_SIZE', 256 * 1024 * 1024),
+        }
+
+    @staticmethod
+    def is_sqlite(uri):
+        return make_url(uri).get_backend_name() == 'sqlite'
+
+    @staticmethod
+    def engine_options(config):
+        """Build SQLALCHEMY_ENGINE_OPTIONS from the DB_* settings."""
+        uri = config['SQLALCHEMY_DATABASE_URI']
+        options = {
+            'pool_pre_ping': config['DB_POOL_PRE_PING'],
+            'pool_recycle': config['DB_POOL_RECYCLE'],
+        }
+        url = make_url(uri)
+        in_memory = Database.is_sqlite(uri) and url.database in (None, '', ':memory:')
+        # In-memory SQLite uses a single shared connection, so pool sizing does not apply
+        if not in_memory:
+            options.update({
+                'pool_size': config['DB_POOL_SIZE'],
+                'max_overflow': config['DB_MAX_OVERFLOW'],
+                'pool_timeout': config['DB_POOL_TIMEOUT'],
+            })
+        if Database.is_sqlite(uri):
+            # Requests may hand connections between threads (e.g. streamed responses)
+            options['connect_args'] = {'check_same_thread': False}
+        return options
+
+    @staticmethod
+    def sqlite_pragmas(config):
+        return [
+            f"PRAGMA journal_mode={config['SQLITE_JOURNAL_MODE']}",
+            f"PRAGMA synchronous={config['SQLITE_SYNCHRONOUS']}",
+            f"PRAGMA busy_timeout={int(config['SQLITE_BUSY_TIMEOUT_MS'])}",
+            f"PRAGMA cache_size={int(config['SQLITE_CACHE_SIZE'])}",
+            f"PRAGMA mmap_size={int(config['SQLITE_MMAP_SIZE'])}",
+        ]
+
+    @staticmethod
+    def init_app(app):
+        """Attach the SQLite PRAGMAs to the app's engine. Call after db.init_app(app)."""
+        if not Database.is_sqlite(app.config['SQLALCHEMY_DATABASE_URI']):
+            return
+        pragmas = Database.sqlite_pragmas(app.config)
+
+        def apply_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                for pragma in pragmas:
+                    cursor.execute(pragma)
+            finally:
+                cursor.close()
+
+        with app.app_context():
+            event.listen(db.engine, 'connect', apply_pragmas)
@@ -0,0 +1,59 @@
+import json
+
+from flask import Response
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib encoder is used without it
+    orjson = None
+
+
+class _OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider encoding with orjson; values orjson does not know go through Flask's default()."""
+
+    def dumps(self, obj, **kwargs):
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=options).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+class Json:
+    """
+    JSON encoding to bytes with the fastest available backend (orjson when
+    installed, otherwise the stdlib), plus helpers for responses assembled from
+    pre-encoded fragments.
+    """
+
+    backend = 'orjson' if orjson is not None else 'json'
+
+    @staticmethod
+    def init_app(app):
+        """Make jsonify use orjson too, when it is installed."""
+        if orjson is not None:
+            app.json = _OrjsonProvider(app)
+
+    @staticmethod
+    def dumps(obj):
+        if orjson is not None:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode()
+
+    @staticmethod
+    def array(fragments):
+        """A JSON array from already-encoded element fragments."""
+        return b"[" + b",".join(fragments) + b"]"
+
+    @staticmethod
+    def envelope(data, **fields):
+        """The `{"success": true, "data": ...}` body as bytes, with `data` already encoded."""
+        head = Json.dumps({"success": True, **fields})
+        return head[:-1] + b',"data":' + data + b"}"
+
+    @staticmethod
+    def response(body):
+        return Response(body, mimetype='application/json')
@@ -1,22 +1,191 @@
+import atexit
+import json
 import logging
-from datetime import datetime
+import os
+import queue
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, UTC
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+
+from flask import g, has_request_context, request
+
+# Record attributes copied into each JSON line when present
+_CONTEXT_FIELDS = ('request_id', 'route', 'method', 'path', 'status', 'latency_ms')
+
+
+class _RequestContextFilter(logging.Filter):
+    """
+    Runs on the request thread: tags records with the current request's id and
+    route (the background writer has no request context) and samples INFO
+    records before they are queued.
+    """
+
+    def __init__(self, info_sample_rate=1.0):
+        super().__init__()
+        self.info_sample_rate = info_sample_rate
+        self.sampled_out = 0
+
+    def filter(self, record):
+        if record.levelno == logging.INFO and self.info_sample_rate < 1.0 and random.random() >= self.info_sample_rate:
+            self.sampled_out += 1
+            return False
+        if has_request_context() and not hasattr(record, 'request_id'):
+            record.request_id = g.get('request_id')
+            record.route = request.endpoint
+            record.method = request.method
+        return True
+
+
+class _BoundedQueueHandler(QueueHandler):
+    """Enqueues without blocking; records that do not fit are dropped and counted."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._drop_lock = threading.Lock()
+
+    def prepare(self, record):
+        # Formatting happens on the writer thread; the record never leaves the process
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._drop_lock:
+                self.dropped += 1
+
+
+class _JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "level": record.levelname,
+            "message": record.getMessage()
+        }
+        for field in _CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
 
 class Logger:
+    """
+    Application logging. Callers only enqueue records; a background thread
+    formats them as JSON lines and writes them to a daily-rotated file, so
+    disk I/O never happens on the request thread. Until setup() runs, records
+    fall through to the standard logging defaults.
+    """
+
+    _logger = logging.getLogger('cms')
+    _listener = None
+    _handler = None
+    _filter = None
+    _settings = {}
+
     @staticmethod
-    def setup():
-        logging.basicConfig(
-            filename=f'logs/cms_{datetime.now().strftime("%Y%m%d")}.log',
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s'
+    def setup(log_dir='logs', level=logging.INFO, queue_size=10000, info_sample_rate=1.0, backup_days=14,
+              file_name='cms.log'):
+        if Logger._listener is not None:
+            Logger.shutdown()
+        Logger._settings = {
+            "log_dir": log_dir, "level": level, "queue_size": queue_size,
+            "info_sample_rate": info_sample_rate, "backup_days": backup_days, "file_name": file_name
+        }
+
+        os.makedirs(log_dir, exist_ok=True)
+        file_handler = TimedRotatingFileHandler(
+            os.path.join(log_dir, file_name), when='midnight', backupCount=backup_days, utc=True, encoding='utf-8'
+        )
+        file_handler.setFormatter(_JsonFormatter())
+
+        Logger._handler = _BoundedQueueHandler(queue.Queue(maxsize=queue_size))
+        Logger._filter = _RequestContextFilter(info_sample_rate)
+        Logger._handler.addFilter(Logger._filter)
+        Logger._listener = QueueListener(Logger._handler.queue, file_handler)
+
+        Logger._logger.handlers = [Logger._handler]
+        Logger._logger.setLevel(level)
+        Logger._logger.propagate = False
+        Logger._listener.start()
+
+    @staticmethod
+    def init_app(app):
+        """Set up logging from the app config and log every request with its latency."""
+        Logger.setup(
+            log_dir=app.config.get('LOG_DIR', 'logs'),
+            level=app.config.get('LOG_LEVEL', 'INFO'),
+            queue_size=app.config.get('LOG_QUEUE_SIZE', 10000),
+            info_sample_rate=app.config.get('LOG_INFO_SAMPLE_RATE', 1.0),
+            backup_days=app.config.get('LOG_BACKUP_DAYS', 14)
         )
+        log_requests = app.config.get('LOG_REQUESTS', True)
+
+        @app.before_request
+        def _start_request_log():
+            g.request_id = request.headers.get('X-Request-ID') or uuid.uuid4().hex
+            g.request_started = time.perf_counter()
+
+        @app.after_request
+        def _finish_request_log(response):
+            response.headers['X-Request-ID'] = g.get('request_id', '')
+            if log_requests and 'request_started' in g:
+                Logger._logger.info("request", extra={
+                    "path": request.path,
+                    "status": response.status_code,
+                    "latency_ms": round((time.perf_counter() - g.request_started) * 1000, 3)
+                })
+            return response
+
+    @staticmethod
+    def shutdown():
+        """Stop the writer thread after it has flushed every queued record."""
+        if Logger._listener is None:
+            return
+        Logger._listener.stop()
+        for handler in Logger._listener.handlers:
+            handler.close()
+        Logger._logger.handlers = []
+        Logger._listener = None
+
+    @staticmethod
+    def after_fork(file_name):
+        """
+        Restart logging in a forked child process, writing to its own file:
+        the writer thread does not survive a fork, and several processes
+        rotating one file would lose lines.
+        """
+        if Logger._listener is None:
+            return
+        for handler in Logger._listener.handlers:
+            handler.close()
+        Logger._listener = None
+        Logger.setup(**{**Logger._settings, "file_name": file_name})
+
+    @staticmethod
+    def stats():
+        return {
+            "queued": Logger._handler.queue.qsize() if Logger._handler else 0,
+            "dropped": Logger._handler.dropped if Logger._handler else 0,
+            "sampled_out": Logger._filter.sampled_out if Logger._filter else 0
+        }
 
     @staticmethod
     def info(message):
-        logging.info(message)
+        Logger._logger.info(message)
 
     @staticmethod
     def error(message, exc=None):
         if exc:
-            logging.error(f"{message}: {str(exc)}")
+            Logger._logger.error(f"{message}: {str(exc)}")
         else:
-            logging.error(message)
+            Logger._logger.error(message)
+
+
+atexit.register(Logger.shutdown)
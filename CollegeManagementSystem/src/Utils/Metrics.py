@@ -0,0 +1,162 @@
+import threading
+import time
+from bisect import bisect_left
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+from src.extensions import db
+
+# Upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Shard:
+    """Metrics written by one thread. Only its owner thread ever writes to it."""
+    __slots__ = ('requests', 'db')
+
+    def __init__(self):
+        # (endpoint, method, status) -> [bucket counts..., +Inf count, sum of seconds]
+        self.requests = {}
+        # endpoint -> [statements, seconds]
+        self.db = {}
+
+
+class Metrics:
+    """
+    Per-endpoint request latency histograms and SQL statement counters.
+
+    Each thread records into its own shard, so the request path takes no
+    lock; the shard list is only locked when a thread records for the first
+    time and when /metrics merges the shards. Shards of finished threads are
+    folded into a retired total on each scrape.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []
+        self._retired = _Shard()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """Hook request timing into the app and SQL counting into its engine."""
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        with app.app_context():
+            event.listen(db.engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(db.engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    # --- Recording (request threads) ---
+
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def _start_request(self):
+        g.metrics_started = time.perf_counter()
+        g.db_statements = 0
+        g.db_seconds = 0.0
+
+    def _finish_request(self, response):
+        if 'metrics_started' not in g:
+            return response
+        elapsed = time.perf_counter() - g.metrics_started
+        endpoint = request.endpoint or 'unmatched'
+        shard = self._shard()
+
+        key = (endpoint, request.method, str(response.status_code))
+        series = shard.requests.get(key)
+        if series is None:
+            series = shard.requests[key] = [0] * (len(LATENCY_BUCKETS) + 2)
+        series[bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+        series[-1] += elapsed
+
+        db_series = shard.db.get(endpoint)
+        if db_series is None:
+            db_series = shard.db[endpoint] = [0, 0.0]
+        db_series[0] += g.db_statements
+        db_series[1] += g.db_seconds
+        return response
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._metrics_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, '_metrics_started', None)
+        if started is None or not has_request_context() or 'db_statements' not in g:
+            return
+        g.db_statements += 1
+        g.db_seconds += time.perf_counter() - started
+
+    # --- Reporting ---
+
+    @staticmethod
+    def _merge(target, shard):
+        for key, series in list(shard.requests.items()):
+            total = target.requests.setdefault(key, [0] * len(series))
+            for i, value in enumerate(series):
+                total[i] += value
+        for key, series in list(shard.db.items()):
+            total = target.db.setdefault(key, [0, 0.0])
+            total[0] += series[0]
+            total[1] += series[1]
+
+    def snapshot(self):
+        """Merge every shard into one _Shard, retiring shards of finished threads."""
+        merged = _Shard()
+        with self._lock:
+            live = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    live.append((thread, shard))
+                else:
+                    Metrics._merge(self._retired, shard)
+            self._shards = live
+            Metrics._merge(merged, self._retired)
+            for _, shard in live:
+                Metrics._merge(merged, shard)
+        return merged
+
+    def render(self, extra=None):
+        """
+        Prometheus text exposition of every metric. `extra` is a list of
+        (name, type, help, value) tuples for process-wide gauges and counters.
+        """
+        merged = self.snapshot()
+        lines = [
+            "# HELP cms_http_request_duration_seconds Request latency by endpoint, method and status.",
+            "# TYPE cms_http_request_duration_seconds histogram"
+        ]
+        for (endpoint, method, status), series in sorted(merged.requests.items()):
+            labels = f'endpoint="{endpoint}",method="{method}",status="{status}"'
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, series):
+                cumulative += count
+                lines.append(f'cms_http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            cumulative += series[len(LATENCY_BUCKETS)]
+            lines.append(f'cms_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {cumulative}')
+            lines.append(f'cms_http_request_duration_seconds_sum{{{labels}}} {series[-1]:.6f}')
+            lines.append(f'cms_http_request_duration_seconds_count{{{labels}}} {cumulative}')
+
+        lines += [
+            "# HELP cms_db_statements_total SQL statements executed while serving each endpoint.",
+            "# TYPE cms_db_statements_total counter"
+        ]
+        lines += [f'cms_db_statements_total{{endpoint="{endpoint}"}} {series[0]}' for endpoint, series in sorted(merged.db.items())]
+        lines += [
+            "# HELP cms_db_duration_seconds_total Time spent executing SQL while serving each endpoint.",
+            "# TYPE cms_db_duration_seconds_total counter"
+        ]
+        lines += [f'cms_db_duration_seconds_total{{endpoint="{endpoint}"}} {series[1]:.6f}' for endpoint, series in sorted(merged.db.items())]
+
+        for name, metric_type, help_text, value in extra or ():
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}", f"{name} {value}"]
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
@@ -0,0 +1,51 @@
+import base64
+import binascii
+import json
+
+
+class Pagination:
+    """Helpers for keyset (cursor based) pagination of list endpoints."""
+
+    DEFAULT_LIMIT = 50
+    MAX_LIMIT = 200
+
+    @staticmethod
+    def parse_limit(raw_limit):
+        """Parse the `limit` query argument, clamped to MAX_LIMIT."""
+        if raw_limit in (None, ''):
+            return Pagination.DEFAULT_LIMIT
+        try:
+            limit = int(raw_limit)
+        except (TypeError, ValueError):
+            raise ValueError("Invalid limit. Must be a positive integer.")
+        if limit < 1:
+            raise ValueError("Invalid limit. Must be a positive integer.")
+        return min(limit, Pagination.MAX_LIMIT)
+
+    @staticmethod
+    def encode_cursor(values):
+        """Encode the sort key of the last row of a page as an opaque string."""
+        raw = json.dumps(values, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """Decode a cursor produced by encode_cursor. Returns None for no cursor."""
+        if not cursor:
+            return None
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        except (binascii.Error, ValueError, UnicodeDecodeError):
+            raise ValueError("Invalid cursor.")
+        if not isinstance(values, list):
+            raise ValueError("Invalid cursor.")
+        return values
+
+    @staticmethod
+    def to_dict(next_cursor, limit):
+        return {
+            "next_cursor": next_cursor,
+            "has_more": next_cursor is not None,
+            "limit": limit
+        }
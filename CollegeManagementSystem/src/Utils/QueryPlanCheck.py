@@ -0,0 +1,252 @@
+import io
+import os
+import re
+import shutil
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta, UTC
+
+from flask import Flask
+from sqlalchemy import event
+
+from src.extensions import db
+from src.Utils.Database import Database
+
+_FULL_SCAN = re.compile(r'^SCAN (?!CONSTANT ROW)(\S+)(?: AS (\S+))?$')
+# The conditions of each WHERE clause, up to the ORDER BY / GROUP BY / LIMIT that follows
+_WHERE_CLAUSE = re.compile(r'\bWHERE\b(.*?)(?=\bORDER BY\b|\bGROUP BY\b|\bLIMIT\b|$)', re.S)
+_EXPLAINABLE = ('SELECT', 'UPDATE', 'DELETE', 'INSERT INTO registrations (registration_id')
+
+
+class QueryPlanCheck:
+    """
+    Query-plan regression check for the service layer.
+
+    Builds a scratch SQLite database through the migration runner, drives
+    every service query through a scenario, captures the SQL each one emits
+    and runs EXPLAIN QUERY PLAN on it. Any plan step that scans a whole
+    table without an index is reported, unless the scenario reads the whole
+    table on purpose (e.g. repairing counters). A scan that walks the table
+    in ORDER BY order under a LIMIT (no temp b-tree sort) reads only one page
+    of rows and is accepted, unless the statement filters that table with a
+    WHERE condition: then the LIMIT no longer bounds the rows read.
+    """
+
+    def __init__(self):
+        self.statements = []
+        self._label = None
+        self._allow_full_scan = False
+
+    @contextmanager
+    def scenario(self, label, allow_full_scan=False):
+        self._label, self._allow_full_scan = label, allow_full_scan
+        try:
+            yield
+        finally:
+            self._label, self._allow_full_scan = None, False
+
+    def _capture(self, conn, cursor, statement, parameters, context, executemany):
+        if self._label is None or not statement.lstrip().upper().startswith(_EXPLAINABLE):
+            return
+        if executemany:
+            parameters = parameters[0] if parameters else ()
+        self.statements.append((self._label, self._allow_full_scan, statement, parameters))
+
+    def run(self):
+        """Run every scenario and return a list of (label, statement, plan detail) failures."""
+        workdir = tempfile.mkdtemp(prefix='cms_plan_check_')
+        app = Flask(__name__)
+        app.config.update(Database.config_from_env())
+        app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(workdir, 'plans.db')}"
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = Database.engine_options(app.config)
+        # Write last_login straight through so its UPDATE is captured too
+        app.config['LAST_LOGIN_FLUSH_INTERVAL'] = 0
+        db.init_app(app)
+        Database.init_app(app)
+
+        from src.Service.CollegeResolver import college_resolver
+        from src.Service.LastLoginWriter import last_login_writer
+        last_login_writer.init_app(app)
+        try:
+            with app.app_context():
+                college_resolver.clear()
+                from src.Migrations.MigrationRunner import MigrationRunner
+                MigrationRunner.upgrade()
+                event.listen(db.engine, 'before_cursor_execute', self._capture)
+                try:
+                    self._run_scenarios()
+                finally:
+                    event.remove(db.engine, 'before_cursor_execute', self._capture)
+                failures = self._explain_all()
+                db.session.remove()
+                db.engine.dispose()
+        finally:
+            college_resolver.clear()
+            shutil.rmtree(workdir, ignore_errors=True)
+        return failures
+
+    def _explain_all(self):
+        failures = []
+        with db.engine.connect() as conn:
+            for label, allow_full_scan, statement, parameters in self.statements:
+                details = [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+                if allow_full_scan:
+                    continue
+                failures.extend(
+                    (label, statement, detail) for detail in details
+                    if _FULL_SCAN.match(detail) and not QueryPlanCheck._is_bounded_ordered_scan(statement, detail, details)
+                )
+        return failures
+
+    @staticmethod
+    def _is_bounded_ordered_scan(statement, detail, details):
+        """True when the full scan in `detail` stops after one LIMIT's worth of rows."""
+        if ' LIMIT ' not in statement or any('TEMP B-TREE' in step for step in details):
+            return False
+        match = _FULL_SCAN.match(detail)
+        table = match.group(2) or match.group(1)
+        for conditions in _WHERE_CLAUSE.findall(statement):
+            # Unqualified columns could belong to the scanned table, so they count as a filter on it
+            if f'{table}.' in conditions or '.' not in conditions:
+                return False
+        return True
+
+    def _run_scenarios(self):
+        from src.Service.EventService import EventService
+        from src.Service.ImportService import ImportService
+        from src.Service.UserService import UserService
+        from src.Service.CollegeResolver import college_resolver
+        from src.Service.EventBroadcaster import event_broadcaster
+        from src.Service.EventCatalog import event_catalog
+
+        # Reads every college on purpose; done up front so later scenarios only see cache hits
+        with self.scenario('CollegeResolver.warm', allow_full_scan=True):
+            college_resolver.warm()
+
+        with self.scenario('UserService.create_user'):
+            admin = UserService.create_user({
+                'username': 'plan_admin', 'email': 'plan_admin@example.com', 'password': 'x',
+                'full_name': 'Plan Admin', 'role': 'ADMIN'
+            })
+            students = [
+                UserService.create_user({
+                    'username': f'plan_student_{i}', 'email': f'plan_student_{i}@example.com',
+                    'password': 'x', 'full_name': f'Student {i}', 'college_name': 'Plan College'
+                })
+                for i in range(3)
+            ]
+            admin_id, student_ids = admin.id, [student.id for student in students]
+
+        with self.scenario('EventService.create_event'):
+            start = datetime.now(UTC) + timedelta(days=30)
+            event_ids = [
+                EventService.create_event({
+                    'title': f'Plan Event {i}', 'type': 'Workshop', 'college_name': 'Plan College',
+                    'event_date': (start + timedelta(days=i)).isoformat(), 'capacity': 10
+                }, admin_id).event_id
+                for i in range(3)
+            ]
+            college_id = college_resolver.get_id('Plan College')
+
+        with self.scenario('EventService.register_for_event'):
+            registration_ids = [EventService.register_for_event(event_ids[0], sid).registration_id for sid in student_ids]
+            EventService.register_for_event(event_ids[1], student_ids[0])
+
+        with self.scenario('EventService.register_batch'):
+            # A new registration, a duplicate and an unknown event
+            EventService.register_batch([
+                (event_ids[2], student_ids[1]), (event_ids[2], student_ids[1]), ('missing', student_ids[1])
+            ])
+
+        with self.scenario('EventService.mark_attendance'):
+            EventService.mark_attendance(registration_ids[0])
+
+        with self.scenario('EventService.mark_attendance_bulk'):
+            EventService.mark_attendance_bulk(registration_ids=registration_ids[:2])
+            EventService.mark_attendance_bulk(pairs=[{'event_id': event_ids[0], 'student_id': student_ids[2]}])
+
+        with self.scenario('EventService.get_events_page'):
+            _, cursor = EventService.get_events_page(limit=1)
+            EventService.get_events_page(limit=1, cursor=cursor)
+            EventService.get_events_page({'type': 'workshop'}, limit=1, cursor=cursor)
+            EventService.get_events_page({'college_id': college_id}, limit=1, cursor=cursor)
+            EventService.get_events_page({'date_from': start.isoformat(), 'date_to': (start + timedelta(days=1)).isoformat()})
+            EventService.get_events_page(limit=2, include_registrations=True)
+            EventService.get_events_page_versions({'college_id': college_id}, limit=1, cursor=cursor)
+
+        with self.scenario('EventService.get_event_by_id'):
+            EventService.get_event_by_id(event_ids[0])
+            EventService.get_event_by_id(event_ids[0], include_registrations=True)
+            EventService.get_event_stats(event_ids[0])
+            EventService.get_event_version(event_ids[0])
+
+        from src.Service.SearchService import SearchService
+        # Looks the index up in sqlite_master once per database
+        with self.scenario('SearchService.uses_fts', allow_full_scan=True):
+            SearchService.uses_fts()
+
+        with self.scenario('SearchService.search_events'):
+            _, cursor = SearchService.search_events('plan work', limit=1)
+            SearchService.search_events('plan work', limit=1, cursor=cursor)
+
+        with self.scenario('EventService.update_event'):
+            EventService.update_event(event_ids[0], {'title': 'Plan Event 0 (updated)'}, include_registrations=True)
+
+        with self.scenario('EventService.iter_registration_export_rows'):
+            list(EventService.iter_registration_export_rows(event_id=event_ids[0]))
+            list(EventService.iter_registration_export_rows(college_id=college_id))
+
+        with self.scenario('UserService.lookups'):
+            UserService.get_user_by_id(student_ids[0])
+            UserService.get_user_by_username('plan_student_0')
+            UserService.get_user_by_email('plan_student_0@example.com')
+            UserService.get_user_by_login('plan_student_0@example.com')
+            UserService.update_last_login(student_ids[0])
+            _, cursor = UserService.get_users_page(limit=1)
+            UserService.get_users_page(limit=1, cursor=cursor)
+            UserService.get_users_page({'role': 'user'}, limit=1, cursor=cursor)
+            UserService.get_users_page({'college_id': college_id}, limit=1, cursor=cursor)
+
+        with self.scenario('ImportService'):
+            users_csv = "username,email,password,full_name,college_name\nplan_import,plan_import@example.com,x,Imported,Plan College\n"
+            ImportService.import_users(io.BytesIO(users_csv.encode()), 'csv')
+            events_csv = "title,type,event_date,college_name\nImported,Seminar,2031-01-01,Other College\n"
+            ImportService.import_events(io.BytesIO(events_csv.encode()), 'csv', admin_id)
+
+        with self.scenario('ArchiveService.archive_events'):
+            from src.Service.ArchiveService import ArchiveService
+            ArchiveService.archive_events(start + timedelta(days=1), batch_size=1)
+
+        with self.scenario('EventService include_archived reads'):
+            EventService.get_events_page({'college_id': college_id}, limit=1, include_archived=True)
+            EventService.get_events_page(limit=2, include_registrations=True, include_archived=True)
+            EventService.get_events_page_versions(limit=2, include_archived=True)
+            EventService.get_event_by_id(event_ids[0], include_registrations=True, include_archived=True)
+            EventService.get_event_version(event_ids[0], include_archived=True)
+            EventService.get_event_stats(event_ids[0], include_archived=True)
+            list(EventService.iter_registration_export_rows(event_id=event_ids[0], include_archived=True))
+            list(EventService.iter_registration_export_rows(college_id=college_id, include_archived=True))
+
+        with self.scenario('UserService.delete_user'):
+            UserService.delete_user(student_ids[1])
+
+        with self.scenario('EventService.delete_event'):
+            EventService.delete_event(event_ids[1])
+
+        with self.scenario('EventBroadcaster'):
+            event_broadcaster._replay(0)
+            event_broadcaster._fetch(0, 10)
+
+        # A full load reads every row on purpose
+        with self.scenario('EventCatalog.reload', allow_full_scan=True):
+            event_catalog.reload()
+
+        with self.scenario('EventCatalog'):
+            event_catalog._load_rows(event_ids)
+            event_catalog._sync()
+        # Not left holding the scratch database's events
+        event_catalog._snapshot = None
+
+        # Reads every row on purpose
+        with self.scenario('EventService.repair_counters', allow_full_scan=True):
+            EventService.repair_counters()
@@ -0,0 +1,153 @@
+import functools
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+
+class _TimingLoader:
+    """Wraps a module's loader to time its execution, nested imports included."""
+
+    def __init__(self, loader, timer):
+        self.loader = loader
+        self.timer = timer
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        self.timer._enter()
+        try:
+            self.loader.exec_module(module)
+        finally:
+            self.timer._exit(module.__name__)
+            # Hand the module its real loader back
+            module.__loader__ = self.loader
+            if module.__spec__ is not None:
+                module.__spec__.loader = self.loader
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+
+class _TimingFinder:
+    """Meta path finder that finds modules through the other finders, then times their loading."""
+
+    def __init__(self, timer):
+        self.timer = timer
+
+    def find_spec(self, name, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                    spec.loader = _TimingLoader(spec.loader, self.timer)
+                return spec
+        return None
+
+
+class StartupTimer:
+    """
+    Startup time report: how long each startup phase took (imports,
+    create_app, database initialization) and, with STARTUP_PROFILE=1, how
+    long each module took to import (self time, excluding the modules it
+    imported, and total).
+
+    Module timing only sees modules imported after this module, so app.py
+    imports it first.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._last_mark = self.started
+        self.phases = {}
+        self.imports = {}  # module -> (self seconds, total seconds)
+        self._stack = []
+        self._finder = None
+
+    @property
+    def profiling(self):
+        return self._finder is not None
+
+    def profile_imports(self):
+        if self._finder is None:
+            self._finder = _TimingFinder(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def stop_profiling(self):
+        if self._finder is not None:
+            sys.meta_path.remove(self._finder)
+            self._finder = None
+
+    def _enter(self):
+        # [start, seconds spent importing children]
+        self._stack.append([time.perf_counter(), 0.0])
+
+    def _exit(self, name):
+        start, children = self._stack.pop()
+        total = time.perf_counter() - start
+        self.imports[name] = (total - children, total)
+        if self._stack:
+            self._stack[-1][1] += total
+
+    def mark(self, name):
+        """Record the time since the previous mark (or since startup) as phase `name`."""
+        now = time.perf_counter()
+        self.phases[name] = now - self._last_mark
+        self._last_mark = now
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - start
+            self._last_mark = time.perf_counter()
+
+    def timed(self, name):
+        """Decorator recording each call of the function as phase `name`."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.phase(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def report(self, top=20):
+        slowest = sorted(self.imports.items(), key=lambda item: item[1][0], reverse=True)[:top]
+        return {
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 1),
+            "phases_ms": {name: round(seconds * 1000, 1) for name, seconds in self.phases.items()},
+            "imports": [
+                {"module": name, "self_ms": round(own * 1000, 1), "total_ms": round(total * 1000, 1)}
+                for name, (own, total) in slowest
+            ]
+        }
+
+    def format(self, top=20):
+        report = self.report(top)
+        lines = [f"Startup: {report['total_ms']} ms"]
+        lines += [f"  {name:<24} {ms:>9.1f} ms" for name, ms in report['phases_ms'].items()]
+        if report['imports']:
+            lines.append(f"  {'slowest imports':<48} {'self':>9} {'total':>9}")
+            lines += [
+                f"  {entry['module']:<48} {entry['self_ms']:>6.1f} ms {entry['total_ms']:>6.1f} ms"
+                for entry in report['imports']
+            ]
+        return "\n".join(lines)
+
+    def log(self):
+        # Imported here: this module loads before anything else, so it can time those imports
+        from src.Utils.Logger import Logger
+        report = self.report(top=0)
+        phases = ", ".join(f"{name} {ms} ms" for name, ms in report['phases_ms'].items())
+        Logger.info(f"Startup took {report['total_ms']} ms ({phases})")
+
+
+startup_timer = StartupTimer()
+if os.getenv('STARTUP_PROFILE', '').lower() in ('1', 'true', 'yes'):
+    startup_timer.profile_imports()
@@ -1,14 +1,41 @@
-from .Entity.User import User, UserRole
-from .extensions import db
-from .Service.UserService import UserService
-from .Service.EventService import EventService
-
-from .Serializers.UserSerializer import UserSerializer
-from .Serializers.EventSerializer import EventSerializer
-from .Serializers.RegisterationSerializer import RegistrationSerializer
-from .Auth.AuthHandler import (
-    generate_access_token,
-    generate_refresh_token,
-    jwt_required,
-    admin_required
-)
\ No newline at end of file
+"""
+Shortcuts to the package's main classes, e.g. `from src import db, User`.
+
+Submodules are only imported when one of these names is first used, so
+importing `src` (or any one submodule) loads nothing else, and the order in
+which modules import each other no longer matters. Code inside the package
+imports from the defining module directly.
+"""
+import importlib
+
+_EXPORTS = {
+    'db': 'src.extensions',
+    'User': 'src.Entity.User',
+    'UserRole': 'src.Entity.User',
+    'UserService': 'src.Service.UserService',
+    'EventService': 'src.Service.EventService',
+    'ImportService': 'src.Service.ImportService',
+    'UserSerializer': 'src.Serializers.UserSerializer',
+    'EventSerializer': 'src.Serializers.EventSerializer',
+    'RegistrationSerializer': 'src.Serializers.RegisterationSerializer',
+    'generate_access_token': 'src.Auth.AuthHandler',
+    'generate_refresh_token': 'src.Auth.AuthHandler',
+    'jwt_required': 'src.Auth.AuthHandler',
+    'admin_required': 'src.Auth.AuthHandler',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'src' has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    # Cache it, so later lookups skip this function
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,61 @@
+import pytest
+
+from conftest import login
+from src.Auth.Admission import RoutePolicy, _RouteLimiter, admission
+from src.Auth.UserCache import auth_user_cache
+from src.Service.UserService import UserService
+
+
+@pytest.fixture
+def limits(app):
+    """Replace the admission policies for one test."""
+    def apply(**policies):
+        app.config['ADMISSION_LIMITS'] = policies
+        admission.init_app(app)
+    yield apply
+    admission.init_app(app)
+
+
+def test_failed_logins_do_not_lock_the_user_out_from_other_addresses(app, limits):
+    limits(login=RoutePolicy(user_rate=0.01, user_burst=3))
+    attacker = app.test_client()
+    attacker.environ_base['REMOTE_ADDR'] = '203.0.113.7'
+    statuses = [
+        attacker.post('/users/login', json={'username': 'admin', 'password': 'wrong'}).status_code
+        for _ in range(4)
+    ]
+    assert statuses == [401, 401, 401, 429]
+
+    owner = app.test_client()
+    owner.environ_base['REMOTE_ADDR'] = '198.51.100.2'
+    assert login(owner, 'admin', 'admin123').status_code == 200
+
+
+def test_register_burst_is_refused_before_the_user_lookup(app, limits, monkeypatch):
+    client = app.test_client()
+    login(client, 'admin', 'admin123')
+    limits(register=RoutePolicy(rate=0.01, burst=1))
+    # Every authenticated request looks the user up in the database
+    monkeypatch.setattr(auth_user_cache, 'max_size', 0)
+    lookups = []
+    real_lookup = UserService.get_user_by_id
+    monkeypatch.setattr(UserService, 'get_user_by_id',
+                        staticmethod(lambda user_id: lookups.append(user_id) or real_lookup(user_id)))
+
+    # The first request uses the route's only token; it gets past admission and looks the user up
+    client.post('/events/missing/register')
+    assert len(lookups) == 1
+
+    response = client.post('/events/missing/register')
+    assert response.status_code == 503
+    assert 'Retry-After' in response.headers
+    assert len(lookups) == 1
+
+
+def test_concurrency_refusal_gives_the_rate_tokens_back():
+    limiter = _RouteLimiter(RoutePolicy(concurrency=1, rate=0.01, burst=2, user_rate=0.01, user_burst=2), 100)
+    assert limiter.acquire('alice') is None
+    assert limiter.acquire('alice') == (503, 1)
+    limiter.release()
+    # Still has its second token, globally and for alice
+    assert limiter.acquire('alice') is None
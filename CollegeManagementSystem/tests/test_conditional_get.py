@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta, UTC
+
+
+def _create_events(client, count):
+    start = datetime.now(UTC) + timedelta(days=7)
+    event_ids = []
+    for i in range(count):
+        response = client.post('/events', json={
+            'title': f'Event {i}', 'type': 'Workshop', 'college_name': 'Test College',
+            'event_date': (start + timedelta(days=i)).isoformat()
+        })
+        event_ids.append(response.get_json()['data']['event_id'])
+    return event_ids
+
+
+def test_list_page_revalidates_with_etag(admin_client):
+    _create_events(admin_client, 3)
+    response = admin_client.get('/events?limit=2')
+    etag = response.headers['ETag']
+    assert 'Last-Modified' not in response.headers
+
+    response = admin_client.get('/events?limit=2', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.headers['ETag'] == etag
+
+
+def test_list_page_changes_when_an_event_is_deleted(admin_client):
+    event_ids = _create_events(admin_client, 3)
+    response = admin_client.get('/events?limit=2')
+    etag = response.headers['ETag']
+
+    # The third event moves onto the page, and no event on it has a newer updated_at
+    assert admin_client.delete(f'/events/{event_ids[0]}').status_code == 200
+    response = admin_client.get('/events?limit=2', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert [event['event_id'] for event in response.get_json()['data']] == event_ids[1:]
+
+    if_modified_since = datetime.now(UTC) + timedelta(minutes=1)
+    response = admin_client.get('/events?limit=2', headers={
+        'If-Modified-Since': if_modified_since.strftime('%a, %d %b %Y %H:%M:%S GMT')
+    })
+    assert response.status_code == 200
+
+
+def test_event_detail_honours_if_modified_since(admin_client):
+    event_id = _create_events(admin_client, 1)[0]
+    response = admin_client.get(f'/events/{event_id}')
+    last_modified = response.headers['Last-Modified']
+
+    response = admin_client.get(f'/events/{event_id}', headers={'If-Modified-Since': last_modified})
+    assert response.status_code == 304
@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta, UTC
+
+from sqlalchemy import text
+
+from conftest import login
+from app import initialize_database
+from src import User, UserRole
+from src.extensions import db
+from src.Migrations.MigrationRunner import MigrationRunner
+from src.Utils.Database import Database
+
+
+def test_create_app_uses_database_url(app, database_url):
+    assert app.config['SQLALCHEMY_DATABASE_URI'] == database_url
+    with app.app_context():
+        assert db.engine.url.render_as_string(hide_password=False) == database_url
+        if Database.is_sqlite(database_url):
+            with db.engine.connect() as conn:
+                assert conn.execute(text("PRAGMA journal_mode")).scalar() == 'wal'
+                assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+
+
+def test_initialize_database_creates_schema_and_admin(app):
+    with app.app_context():
+        assert MigrationRunner.is_current()
+        with db.engine.connect() as conn:
+            assert MigrationRunner.current_version(conn) == MigrationRunner.latest_version()
+        admin = User.query.filter_by(username='admin').one()
+        assert admin.role == UserRole.ADMIN
+
+
+def test_initialize_database_again_is_a_no_op(app, capsys):
+    initialize_database(app)
+    assert "Database schema is up to date." in capsys.readouterr().out
+    with app.app_context():
+        assert User.query.filter_by(username='admin').count() == 1
+
+
+def test_login(client):
+    response = login(client, 'admin', 'admin123')
+    assert response.status_code == 200
+    assert response.get_json()['data']['user']['username'] == 'admin'
+    assert client.get_cookie('access_token') is not None
+    assert client.get('/users/profile').status_code == 200
+
+
+def test_login_rejects_wrong_password(client):
+    response = client.post('/users/login', json={'username': 'admin', 'password': 'wrong'})
+    assert response.status_code == 401
+    assert client.get_cookie('access_token') is None
+
+
+def test_event_list(admin_client):
+    start = datetime.now(UTC) + timedelta(days=7)
+    created = []
+    for i in range(3):
+        response = admin_client.post('/events', json={
+            'title': f'Event {i}', 'type': 'Workshop', 'college_name': 'Test College',
+            'event_date': (start + timedelta(days=i)).isoformat()
+        })
+        assert response.status_code == 201
+        created.append(response.get_json()['data']['event_id'])
+
+    response = admin_client.get('/events?limit=2')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert [event['event_id'] for event in body['data']] == created[:2]
+
+    response = admin_client.get(f"/events?limit=2&cursor={body['pagination']['next_cursor']}")
+    assert [event['event_id'] for event in response.get_json()['data']] == created[2:]
+
+
+def test_rejected_event_creates_no_college(admin_client, app):
+    response = admin_client.post('/events', json={
+        'title': 'Bad Event', 'type': 'Party', 'college_name': 'Orphan College',
+        'event_date': (datetime.now(UTC) + timedelta(days=7)).isoformat()
+    })
+    assert response.status_code == 400
+
+    response = admin_client.post('/users', json={
+        'username': 'admin', 'email': 'other@example.com', 'password': 'x',
+        'full_name': 'Duplicate', 'college_name': 'Orphan College'
+    })
+    assert response.status_code == 409
+
+    with app.app_context():
+        assert db.session.execute(text("SELECT COUNT(*) FROM colleges WHERE name = 'Orphan College'")).scalar() == 0
@@ -0,0 +1,27 @@
+import pytest
+
+from src.Service.EventCatalog import event_catalog
+
+
+@pytest.fixture
+def catalog(app):
+    """Turn the event catalog on, with a sync thread too slow to matter within a test."""
+    app.config.update(EVENT_CATALOG=True, EVENT_CATALOG_SYNC_INTERVAL=3600, EVENT_CATALOG_RELOAD_INTERVAL=3600)
+    event_catalog.init_app(app)
+    with app.app_context():
+        event_catalog.warm()
+    yield event_catalog
+    app.config['EVENT_CATALOG'] = False
+    event_catalog.init_app(app)
+
+
+def test_imported_events_are_listed_at_once(admin_client, app, catalog):
+    response = admin_client.post('/events/import', content_type='text/csv', data=(
+        "title,type,event_date,college_name\n"
+        "Imported Fest,Fest,2099-01-01,Test College\n"
+    ))
+    assert response.status_code == 200
+
+    assert [event['title'] for event in admin_client.get('/events').get_json()['data']] == ['Imported Fest']
+    with app.app_context():
+        assert catalog.verify() == []
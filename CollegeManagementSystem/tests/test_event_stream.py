@@ -0,0 +1,57 @@
+from datetime import datetime, UTC
+
+import pytest
+from sqlalchemy import select
+
+from src.extensions import db
+from src.Entity.Event import Event
+from src.Entity.EventChange import EventChange
+from src.Service.ArchiveService import ArchiveService
+from src.Service.EventBroadcaster import event_broadcaster
+
+
+@pytest.mark.parametrize('threads, reserved, max_clients, expected', [
+    (4, None, 100, 2),
+    (5, None, 100, 2),
+    (1, None, 100, 0),
+    (8, 2, 100, 6),
+    (8, 2, 3, 3),
+])
+def test_streams_leave_request_threads_free(app, threads, reserved, max_clients, expected):
+    event_broadcaster.reserved_threads = reserved
+    event_broadcaster.max_clients = max_clients
+    assert event_broadcaster.reserve_threads(threads) == expected
+
+
+def test_stream_over_the_cap_gets_503(admin_client):
+    event_broadcaster.max_clients = 0
+    response = admin_client.get('/events/stream')
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '5'
+
+
+def test_stream_sends_headers_before_the_first_change(admin_client):
+    response = admin_client.get('/events/stream', buffered=False)
+    try:
+        assert response.status_code == 200
+        assert response.mimetype == 'text/event-stream'
+        assert next(response.response) == b": keep-alive\n\n"
+    finally:
+        response.close()
+
+
+def test_imports_and_archiving_record_changes(admin_client, app):
+    response = admin_client.post('/events/import', content_type='text/csv', data=(
+        "title,type,event_date,college_name\n"
+        "Old Fest,Fest,2020-01-01,Test College\n"
+        "New Fest,Fest,2099-01-01,Test College\n"
+    ))
+    assert response.status_code == 200
+
+    with app.app_context():
+        imported = dict(db.session.execute(select(Event.title, Event.event_id)).all())
+        ArchiveService.archive_events(datetime(2021, 1, 1, tzinfo=UTC))
+        changes = db.session.execute(select(EventChange.kind, EventChange.event_id).order_by(EventChange.id)).all()
+    assert [tuple(change) for change in changes] == [
+        ('created', imported['Old Fest']), ('created', imported['New Fest']), ('deleted', imported['Old Fest'])
+    ]
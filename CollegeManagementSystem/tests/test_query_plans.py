@@ -0,0 +1,38 @@
+import sqlite3
+
+import pytest
+
+from src.Utils.QueryPlanCheck import QueryPlanCheck
+
+
+def test_service_queries_do_not_scan_whole_tables():
+    check = QueryPlanCheck()
+    failures = check.run()
+    assert check.statements
+    assert not failures, "\n".join(f"[{label}] {detail}: {' '.join(statement.split())}"
+                                   for label, statement, detail in failures)
+
+
+@pytest.fixture
+def plan():
+    conn = sqlite3.connect(':memory:')
+    conn.execute("CREATE TABLE events (event_id TEXT PRIMARY KEY, title TEXT, event_date TEXT)")
+    conn.execute("CREATE INDEX ix_events_event_date_event_id ON events (event_date, event_id)")
+    yield lambda statement: [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {statement}", ())]
+    conn.close()
+
+
+@pytest.mark.parametrize('statement, bounded', [
+    # Walks the table in primary key order and stops after one page
+    ("SELECT events.event_id FROM events ORDER BY events.rowid LIMIT 10", True),
+    # A LIMIT does not bound a scan that filters the scanned table
+    ("SELECT events.event_id FROM events WHERE events.title = 'x' LIMIT 1", False),
+    ("SELECT event_id FROM events WHERE title = 'x' LIMIT 1", False),
+    # Sorting needs every row first
+    ("SELECT events.event_id FROM events ORDER BY events.title LIMIT 10", False),
+])
+def test_bounded_ordered_scan(plan, statement, bounded):
+    details = plan(statement)
+    scans = [detail for detail in details if detail.startswith('SCAN events')]
+    assert scans == ['SCAN events']
+    assert QueryPlanCheck._is_bounded_ordered_scan(statement, scans[0], details) is bounded
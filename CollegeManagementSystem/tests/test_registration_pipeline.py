@@ -0,0 +1,16 @@
+from src.Service.RegistrationPipeline import RegistrationPipeline, _PendingRegistration
+
+
+def test_timed_out_registration_is_not_committed(app, monkeypatch):
+    committed = []
+    monkeypatch.setattr('src.Service.EventService.EventService.register_batch',
+                        lambda requests: committed.extend(requests) or [None] * len(requests))
+    cancelled, queued = _PendingRegistration('e1', 1), _PendingRegistration('e1', 2)
+    assert cancelled.cancel()
+
+    with app.app_context():
+        RegistrationPipeline()._process([cancelled, queued])
+    assert committed == [('e1', 2)]
+    assert not cancelled.done.is_set() and queued.done.is_set()
+    # Too late to cancel once the writer has it
+    assert not queued.cancel()
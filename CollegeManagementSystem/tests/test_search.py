@@ -0,0 +1,36 @@
+from datetime import datetime, timedelta, UTC
+
+import pytest
+from sqlalchemy import text
+
+from src.extensions import db
+
+
+def _search(client, query):
+    response = client.get(f'/events/search?q={query}')
+    assert response.status_code == 200
+    return [event['title'] for event in response.get_json()['data']]
+
+
+def test_search_index_survives_renumbered_rowids(admin_client, app, database_url):
+    if not database_url.startswith('sqlite'):
+        pytest.skip("The FTS5 search index is SQLite only")
+    start = datetime.now(UTC) + timedelta(days=7)
+    event_ids = []
+    for i, title in enumerate(['Alpha Workshop', 'Beta Workshop', 'Gamma Workshop']):
+        response = admin_client.post('/events', json={
+            'title': title, 'type': 'Workshop', 'college_name': 'Test College',
+            'event_date': (start + timedelta(days=i)).isoformat()
+        })
+        event_ids.append(response.get_json()['data']['event_id'])
+    assert admin_client.delete(f'/events/{event_ids[0]}').status_code == 200
+
+    # What a VACUUM is allowed to do to a table without an INTEGER PRIMARY KEY
+    with app.app_context():
+        db.session.execute(text("UPDATE events SET rowid = rowid + 100"))
+        db.session.commit()
+
+    assert admin_client.put(f'/events/{event_ids[2]}', json={'title': 'Delta Seminar'}).status_code == 200
+    assert _search(admin_client, 'delta') == ['Delta Seminar']
+    assert _search(admin_client, 'gamma') == []
+    assert _search(admin_client, 'beta') == ['Beta Workshop']